@@ -0,0 +1,55 @@
+"""Events per second of SimpleObserver dispatch modes.
+
+Every tester of the resources pool owns an observer with three subscriptions:
+CHANGED, CONNECTED and DISCONNECTED, see ResourcesPool.add.
+
+    python benchmarks/observer_emit.py --testers 20 --events 200000
+"""
+import argparse
+import asyncio
+import itertools
+import time
+
+from chimera_core.core.resources.resource import const
+from chimera_core.core.utils.observer import SimpleObserver
+
+
+EVENTS = (const.CHANGED, const.CONNECTED, const.DISCONNECTED)
+
+
+async def run(ordered: bool, testers: int, events: int) -> float:
+    done = asyncio.Event()
+    handled = 0
+
+    async def publish_message(dataset, event: str) -> None:
+        nonlocal handled
+        handled += 1
+        if handled == events:
+            done.set()
+
+    observers = [SimpleObserver(pass_event=True, ordered=ordered) for _ in range(testers)]
+    for observer in observers:
+        for evt in EVENTS:
+            observer.subscribe(evt, publish_message)
+
+    begin = time.perf_counter()
+    for _, observer, evt in zip(range(events), itertools.cycle(observers), itertools.cycle(EVENTS)):
+        observer.emit(evt, None)
+    await done.wait()
+    elapsed = time.perf_counter() - begin
+    await asyncio.gather(*(observer.close() for observer in observers))
+    return events / elapsed
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--testers", type=int, default=10)
+    parser.add_argument("--events", type=int, default=100_000)
+    args = parser.parse_args()
+    for ordered in (False, True):
+        rate = await run(ordered, args.testers, args.events)
+        print(f"{'ordered' if ordered else 'task per callback':>18}: {rate:12,.0f} events/s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -5,10 +5,13 @@ from loguru import logger
 from xoa_driver.v2.testers import L23Tester
 from xoa_driver.v2.modules import ModuleChimera
 
+from chimera_core.core.manager.planner import ReservationPlanner
 from chimera_core.core.manager.tester import TesterManager
 
 
 from .core.messenger.handler import OutMessagesHandler
+from .core.messenger.journal import MessagesJournal
+from .core.statistics.collector import StatisticsCollector
 from .core.resources.controller import ResourcesController
 from .core.resources.storage import PrecisionStorage
 from .core.resources.types import Credentials, TesterInfoModel, TesterID
@@ -17,6 +20,7 @@ from . import exception
 
 if TYPE_CHECKING:
     from .types.dataset import EMsgType
+    from .core.messenger.metrics import MessengerMetricsModel
 
 
 T = TypeVar("T", bound="MainController")
@@ -25,15 +29,30 @@ T = TypeVar("T", bound="MainController")
 class MainController:
     """MainController - A main class of XOA Chimera Core framework."""
 
-    __slots__ = ("__publisher", "__resources", "suites_library", "__testers", "__is_started")
+    __slots__ = ("__publisher", "__resources", "suites_library", "__testers", "__is_started", "__metrics_interval", "__journal", "__statistics", "__reservations")
 
-    def __init__(self, *, storage_path: Optional[str] = None) -> None:
+    def __init__(
+        self,
+        *,
+        storage_path: Optional[str] = None,
+        metrics_interval: Optional[float] = None,
+        journal_path: Optional[str] = None,
+    ) -> None:
         self.__is_started = False
+        self.__metrics_interval = metrics_interval
         __storage_path = os.path.join(os.getcwd(), "store") if not storage_path else storage_path
         self.__publisher = OutMessagesHandler()
+        self.__journal = MessagesJournal(
+            self.__publisher,
+            journal_path,
+            const.PIPE_RESOURCES,
+            const.PIPE_STATISTICS,
+        ) if journal_path else None
         resources_pipe = self.__publisher.get_pipe(const.PIPE_RESOURCES)
+        self.__statistics = StatisticsCollector(self.__publisher.get_pipe(const.PIPE_STATISTICS))
         storage = PrecisionStorage(str(__storage_path))
         self.__resources = ResourcesController(resources_pipe, storage)
+        self.__reservations = ReservationPlanner(resources_pipe)
         self.__testers: Dict[str, L23Tester] = {}
 
     def listen_changes(self, *names: str, _filter: Optional[Set["EMsgType"]] = None):
@@ -45,10 +64,52 @@ class MainController:
 
     async def __setup(self: T) -> T:
         if not self.__is_started:
+            if self.__journal:
+                await self.__journal.start()
             await self.__resources.start()
+            if self.__metrics_interval:
+                self.__publisher.start_metrics_reporting(self.__metrics_interval)
             self.__is_started = True
         return self
 
+    async def close(self) -> None:
+        """Stop the background tasks of the controller and write the remaining messages of the journal.
+
+        :raises OSError: the remaining messages couldn't be written to the journal
+        """
+        if not self.__is_started:
+            return None
+        await self.__publisher.stop_metrics_reporting()
+        self.__is_started = False
+        if self.__journal:
+            await self.__journal.stop()
+
+    @property
+    def statistics(self) -> "StatisticsCollector":
+        """Statistics collector publishing the port and flow counters on the STATISTICS pipe.
+
+        :return: statistics collector
+        :rtype: StatisticsCollector
+        """
+        return self.__statistics
+
+    @property
+    def reservations(self) -> "ReservationPlanner":
+        """Reservation planner publishing its progress on the RESOURCES pipe.
+
+        :return: reservation planner
+        :rtype: ReservationPlanner
+        """
+        return self.__reservations
+
+    def get_messenger_metrics(self) -> "MessengerMetricsModel":
+        """Queue depth, delivery lag and throughput of the messenger pipes.
+
+        :return: metrics of every available pipe
+        :rtype: MessengerMetricsModel
+        """
+        return self.__publisher.get_metrics()
+
     async def list_testers(self) -> List[TesterInfoModel]:
         """List the added testers.
 
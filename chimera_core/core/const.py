@@ -5,4 +5,8 @@ Identifier of Resources Subservice for messages IO
 PIPE_STATISTICS = "STATISTICS"
 """
 Identifier of Test-Suite Execution Subservice  for messages IO
-"""
\ No newline at end of file
+"""
+PIPE_MESSENGER = "MESSENGER"
+"""
+Identifier of Messenger self-monitoring for messages IO
+"""
@@ -15,6 +15,7 @@ if TYPE_CHECKING:
     import asyncio
     # from xoa_driver.v2 import testers
     from functools import partialmethod
+    from chimera_core.core.messenger.metrics import PipeMetricsModel, MessengerMetricsModel
     # from valhalla_core.core.test_suites.datasets import PluginData
 
 
@@ -49,6 +50,7 @@ class TMesagesPipe(Protocol):
     def transmit(self, msg: Any, *, msg_type: EMsgType = EMsgType.DATA) -> None: ...
     def get_facade(self) -> PipeFacade: ...
     def get_state_facade(self) -> PipeStateFacade: ...
+    def get_metrics(self) -> "PipeMetricsModel": ...
     transmit_warn: "partialmethod"
     transmit_err: "partialmethod"
 
@@ -56,6 +58,7 @@ class TMessagesHandler(Protocol):
     def get_pipe(self, name: str) -> "TMesagesPipe": ...
     async def disable_pipe(self, name: str) -> None: ...
     def avaliable_pipes(self) -> Tuple[str, ...]: ...
+    def get_metrics(self) -> "MessengerMetricsModel": ...
     async def changes(self, *names: str) -> AsyncGenerator["Message", None]: ...
 
 
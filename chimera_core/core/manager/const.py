@@ -1 +1,5 @@
-INTERVEL_CHECK_RESERVE_RESOURCE = 0.01
+RESERVATION_TIMEOUT = 10.0
+"""Seconds to wait for a reservation change notified by the tester."""
+
+RESERVATION_HISTORY = 256
+"""Durations of the latest reservation waits kept for every resource."""
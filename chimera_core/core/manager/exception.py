@@ -1,4 +1,4 @@
-from typing import Iterable
+from typing import Any, Iterable, Sequence
 
 
 class InvalidChimeraResourceError(ValueError):
@@ -9,4 +9,44 @@ class InvalidChimeraResourceError(ValueError):
 class InvalidDistributionError(ValueError):
     def __init__(self, distributions: Iterable[str]) -> None:
         self.msg = f"Only co-working with: [{','.join(distributions)}]."
-        super().__init__(self.msg)
\ No newline at end of file
+        super().__init__(self.msg)
+
+
+class ReservationTimeoutError(TimeoutError):
+    def __init__(self, status: str, timeout: float) -> None:
+        self.msg = f"Reservation not {status} within {timeout}s."
+        super().__init__(self.msg)
+
+
+class ResourcesReservedByOthersError(RuntimeError):
+    def __init__(self, resources: Iterable[str]) -> None:
+        self.msg = f"Reserved by others: [{','.join(resources)}]."
+        super().__init__(self.msg)
+
+
+class InvalidSnapshotError(ValueError):
+    def __init__(self, reason: str) -> None:
+        self.msg = f"Invalid port snapshot: {reason}."
+        super().__init__(self.msg)
+
+
+class FanOutError(RuntimeError):
+    def __init__(self, failed: Iterable[str], not_restored: Iterable[str], results: Sequence[Any]) -> None:
+        self.results = results
+        """Results of all the targets"""
+        self.failed = list(failed)
+        """Targets whose configuration failed"""
+        self.not_restored = list(not_restored)
+        """Targets whose configuration before the fan-out could not be restored"""
+        self.msg = f"Failed: [{','.join(self.failed)}]."
+        if self.not_restored:
+            self.msg += f" Rollback failed, the configuration is left changed: [{','.join(self.not_restored)}]."
+        else:
+            self.msg += " All the targets rolled back."
+        super().__init__(self.msg)
+
+
+class StandbyPoolClosedError(RuntimeError):
+    def __init__(self) -> None:
+        self.msg = "Standby pool is closed."
+        super().__init__(self.msg)
@@ -0,0 +1,196 @@
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from loguru import logger
+
+from .__dataset import PortConfig
+from .exception import FanOutError
+from .port import PortManager
+from .snapshot import PortSnapshot
+from .transaction import ReservationTransaction
+
+if TYPE_CHECKING:
+    from chimera_core.core.generic_types import TMesagesPipe
+    from .tester import TesterManager
+
+
+T = TypeVar("T")
+
+FanOutTarget = Tuple["TesterManager", int, int]
+"""Tester, module index and port index of a port"""
+
+FanOutConfig = Union[PortConfig, PortSnapshot, Callable[[PortManager], Awaitable[Any]]]
+"""A port configuration, a snapshot to restore, or a coroutine function configuring a port, like one impairment"""
+
+
+@dataclass
+class FanOutResult:
+    tester: "TesterManager"
+    module_id: int
+    port_id: int
+    port: PortManager
+    waited: float = 0.0
+    """Seconds waited for the concurrency limit of the tester"""
+    duration: float = 0.0
+    """Seconds taken to configure the port"""
+    error: Optional[BaseException] = None
+    rolled_back: bool = False
+    """The port was restored to its configuration before the fan-out"""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __str__(self) -> str:
+        return f"{self.tester.resource_instance.info.host} {self.module_id}/{self.port_id}"
+
+
+class PortFanOut:
+    """Apply one configuration to many Chimera ports concurrently, at most ``max_per_tester`` ports of a tester at a time.
+
+    With ``all_or_nothing`` the ports are reserved together and their configuration read before any is changed,
+    when one port fails all the ports are restored and ``FanOutError`` raised, naming the ports that could not be restored.
+    Otherwise every port is configured on its own and the errors are returned in the results.
+    The progress in percent of the configured ports is published on the pipe.
+
+    .. code-block:: python
+
+        fan_out = PortFanOut([(tester, 0, p) for p in range(32)], max_per_tester=8)
+        results = await fan_out.apply(snapshot, all_or_nothing=True)
+    """
+
+    __slots__ = ("targets", "max_per_tester", "reserve", "__pipe", "__ports", "__limits")
+
+    def __init__(
+        self,
+        targets: Sequence[FanOutTarget],
+        *,
+        max_per_tester: int = 4,
+        reserve: bool = True,
+        pipe: Optional["TMesagesPipe"] = None,
+    ) -> None:
+        self.targets = tuple(targets)
+        self.max_per_tester = max_per_tester
+        self.reserve = reserve
+        """Reserve the ports before configuring them"""
+        self.__pipe = pipe
+        self.__ports: Optional[List[PortManager]] = None
+        self.__limits: Dict[int, asyncio.Semaphore] = {}
+
+    async def ports(self) -> List[PortManager]:
+        """Managers of the target ports, in the order of the targets."""
+        if self.__ports is None:
+            self.__ports = list(await asyncio.gather(*(
+                tester.use_port(module_id, port_id, reserve=False) for tester, module_id, port_id in self.targets
+            )))
+        return self.__ports
+
+    async def __limited(self, tester: "TesterManager", action: Callable[[], Awaitable[T]]) -> T:
+        key = id(tester.resource_instance)
+        if (limit := self.__limits.get(key)) is None:
+            limit = self.__limits[key] = asyncio.Semaphore(self.max_per_tester)
+        async with limit:
+            return await action()
+
+    async def __configure(self, result: FanOutResult, config: FanOutConfig, only_changed: bool, reserve: bool) -> None:
+        queued_at = time.perf_counter()
+
+        async def configure() -> None:
+            started_at = time.perf_counter()
+            result.waited = started_at - queued_at
+            try:
+                if reserve:
+                    await result.port.reserve()
+                if isinstance(config, PortSnapshot):
+                    await result.port.restore(config, only_changed)
+                elif isinstance(config, PortConfig):
+                    await result.port.config.set(config, only_changed)
+                else:
+                    await config(result.port)
+            finally:
+                result.duration = time.perf_counter() - started_at
+
+        try:
+            await self.__limited(result.tester, configure)
+        except Exception as e:
+            result.error = e
+
+    def __progress(self) -> Callable[[], None]:
+        total, done = len(self.targets), 0
+        facade = self.__pipe.get_facade() if self.__pipe else None
+
+        def step() -> None:
+            nonlocal done
+            done += 1
+            if facade:
+                facade.send_progress(done * 100 // total)
+
+        return step
+
+    async def __configure_all(self, results: List[FanOutResult], config: FanOutConfig, only_changed: bool, reserve: bool) -> None:
+        progress = self.__progress()
+
+        async def configure(result: FanOutResult) -> None:
+            await self.__configure(result, config, only_changed, reserve)
+            progress()
+
+        await asyncio.gather(*(configure(result) for result in results))
+
+    async def apply(self, config: FanOutConfig, *, all_or_nothing: bool = False, only_changed: bool = False) -> List[FanOutResult]:
+        """Configure all the target ports.
+
+        :param config: the configuration of every port
+        :type config: FanOutConfig
+        :param all_or_nothing: restore all the ports when one fails, defaults to False
+        :type all_or_nothing: bool, optional
+        :param only_changed: skip the values last read or written in the session, defaults to False
+        :type only_changed: bool, optional
+        :raises FanOutError: a port failed with all_or_nothing, the ports were restored unless listed by ``not_restored``
+        :return: the result of every target, in the order of the targets
+        :rtype: List[FanOutResult]
+        """
+        ports = await self.ports()
+        results = [FanOutResult(tester, module_id, port_id, port) for (tester, module_id, port_id), port in zip(self.targets, ports)]
+        if not all_or_nothing:
+            await self.__configure_all(results, config, only_changed, self.reserve)
+            return results
+
+        transaction = ReservationTransaction(*ports)
+        if self.reserve:
+            await transaction.acquire()
+        try:
+            snapshots: List[PortSnapshot] = await asyncio.gather(*(
+                self.__limited(result.tester, result.port.snapshot) for result in results
+            ))
+        except Exception:
+            await transaction.release()
+            raise
+        await self.__configure_all(results, config, only_changed, False)
+        if not (failed := [str(result) for result in results if not result.ok]):
+            return results
+
+        async def rollback(result: FanOutResult, snapshot: PortSnapshot) -> None:
+            try:
+                await self.__limited(result.tester, lambda: result.port.restore(snapshot))
+            except Exception as e:
+                logger.error(f"Fan-out rollback of {result} failed: {e}")
+                return None
+            result.rolled_back = True
+
+        await asyncio.gather(*(rollback(result, snapshot) for result, snapshot in zip(results, snapshots)))
+        await transaction.release()
+        raise FanOutError(failed, [str(result) for result in results if not result.rolled_back], results)
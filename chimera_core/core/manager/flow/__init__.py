@@ -9,6 +9,7 @@ from .impairments.misordering import ImpairmentMisordering
 from .impairments.policer import ImpairmentPolicer
 from .impairments.shaper import ImpairmentShaper
 from .shadow_filter import ShadowFilterManager
+from chimera_core.core.utils.applied import apply_changed
 
 
 if TYPE_CHECKING:
@@ -104,13 +105,17 @@ class FlowManager:
             comment=comment
         )
 
-    async def set(self, config: FlowConfig) -> None:
+    async def set(self, config: FlowConfig, only_changed: bool = False) -> int:
         """Set the flow configuration
 
         :param config: flow configuration
         :type config: FlowConfig
+        :param only_changed: send only the commands differing from the last ones read or written, defaults to False
+        :type only_changed: bool, optional
+        :return: number of commands skipped
+        :rtype: int
         """
-        await self.__flow.comment.set(comment=config.comment)
+        return await apply_changed([self.__flow.comment.set(comment=config.comment)], not only_changed)
 
     @property
     def statistics(self) -> "PerImpairmentFlowStats":
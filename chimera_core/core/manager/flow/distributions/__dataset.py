@@ -19,7 +19,6 @@ if TYPE_CHECKING:
 
 
 
-INTERVEL_CHECK_RESERVE_RESOURCE = 0.01
 TPLD_FILTERS_LENGTH = 16
 
 TImpairmentGeneral = TypeVar(
@@ -11,6 +11,8 @@ from xoa_driver.v2.misc import (
 )
 from xoa_driver.v2.misc import Token
 
+from chimera_core.core.utils.applied import apply_changed
+from chimera_core.core.utils.command_plan import CommandPlan, compile_plan
 from .__dataset import (
     TImpairmentGeneral,
     BatchReadDistributionConfigFromServer,
@@ -52,16 +54,58 @@ class ImpairmentManagerBase(Generic[TImpairmentGeneral]):
         """
         config = config or self.config
         assert config, "Config not exists"
-        await asyncio.gather(*config._start(self.impairment) if state else config._stop(self.impairment))
+        # Always sent, starting or stopping must act even if the state read or written last is the requested one
+        await apply_changed(config._start(self.impairment) if state else config._stop(self.impairment), True, self.impairment)
 
-    async def set(self, config: ImpairmentConfigBase) -> None:
+    async def set(self, config: ImpairmentConfigBase, only_changed: bool = False) -> int:
         """Set the impairment
 
         :param config: the impairment configuration
         :type config: ImpairmentConfigBase
+        :param only_changed: send only the commands differing from the last ones read or written, defaults to False
+        :type only_changed: bool, optional
+        :return: number of commands skipped
+        :rtype: int
         """
         self.config = config
-        await asyncio.gather(*config._apply(self.impairment))
+        return await apply_changed(config._apply(self.impairment), not only_changed, self.impairment)
+
+    @staticmethod
+    def compile(config: ImpairmentConfigBase) -> CommandPlan:
+        """Compile the configuration into a plan, to be applied to the same impairment of any flow by ``apply_plan``
+
+        :param config: the impairment configuration
+        :type config: ImpairmentConfigBase
+        :return: the commands ``set`` sends for the configuration
+        :rtype: CommandPlan
+        """
+        return compile_plan(config._apply)
+
+    async def apply_plan(self, plan: CommandPlan, only_changed: bool = False) -> int:
+        """Set the impairment to a compiled configuration.
+
+        Unlike ``set`` the configuration used by ``start`` and ``stop`` is left as it is.
+
+        :param plan: the compiled configuration
+        :type plan: CommandPlan
+        :param only_changed: send only the commands differing from the last ones read or written, defaults to False
+        :type only_changed: bool, optional
+        :return: number of commands skipped
+        :rtype: int
+        """
+        return await apply_changed(plan.bind(self.impairment).tokens(), not only_changed, self.impairment)
+
+    async def restore(self, config: Any, only_changed: bool = False) -> int:
+        """Set the impairment to a configuration read by ``get``, including whether it is started.
+
+        :param config: the impairment configuration
+        :type config: Any
+        :param only_changed: send only the commands differing from the last ones read or written, defaults to False
+        :type only_changed: bool, optional
+        :return: number of commands skipped
+        :rtype: int
+        """
+        return await self.set(config, only_changed)
 
 
 TImpairmentWithDistribution = TypeVar(
@@ -112,4 +156,21 @@ class ImpairmentManagerGeneral(ImpairmentManagerBase[TImpairmentWithDistribution
             allow_set_distribution_class_name=self.allow_set_distribution_class_name,
         )
         config.load_value_from_server_response(DistributionResponseValidator(**response_mapping))
-        return config
\ No newline at end of file
+        return config
+
+    async def restore(self, config: TConfig, only_changed: bool = False) -> int:  # type: ignore[override]
+        """Set the impairment to a configuration read by ``get``, the distribution first, then the state.
+
+        An impairment never configured has no distribution, only its state is written.
+
+        :param config: the impairment configuration
+        :type config: TConfig
+        :param only_changed: send only the commands differing from the last ones read or written, defaults to False
+        :type only_changed: bool, optional
+        :return: number of commands skipped
+        :rtype: int
+        """
+        self.config = config
+        tokens = list(config._apply(self.impairment)) if config.get_current_distribution() else []
+        tokens.append(self.impairment.enable.set(config.enable))
+        return await apply_changed(tokens, not only_changed, self.impairment)
@@ -269,8 +269,8 @@ class ImpairmentConfigPolicer(OnOffMixin, PolicerModeMixin):
     Committed Burst Size (CBS) in frames.
     """
 
-    async def _apply(self, impairment: CPolicerImpairment) -> None:
-        impairment.config.set(
+    def _apply(self, impairment: CPolicerImpairment) -> GeneratorToken:
+        yield impairment.config.set(
             on_off=self.on_off,
             mode=self.mode,
             cir=self.cir,
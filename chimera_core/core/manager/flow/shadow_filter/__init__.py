@@ -6,6 +6,7 @@ from xoa_driver.v2.misc import (
     ModeBasic,
 )
 
+from chimera_core.core.utils.applied import applied_commands
 from .basic_mode import ShadowFilterBasic
 from .extended_mode import ShadowFilterExtended
 
@@ -14,11 +15,16 @@ class ShadowFilterManager:
     def __init__(self, filter: "FilterDefinitionShadow"):
         self.filter = filter
 
+    def __forget(self) -> None:
+        # The shadow registers changed, the values written to them can't be skipped any more
+        applied_commands.forget_resource(self.filter.cancel.set())
+
     async def clear(self) -> None:
         """
         Reset shadow filter configuration to its default values.
         """
         await self.filter.initiating.set()
+        self.__forget()
 
     async def use_basic_mode(self) -> "ShadowFilterBasic":
         """In Basic mode, the flow filters are composed of multiple sub-filters, which match against different protocol layers.
@@ -29,6 +35,7 @@ class ShadowFilterManager:
         """
         mode = await self.filter.get_mode()
         await self.filter.use_basic_mode()
+        self.__forget()
         mode = await self.filter.get_mode()
         assert isinstance(mode, ModeBasic), "Not basic mode"
         return ShadowFilterBasic(self.filter, mode)
@@ -41,6 +48,7 @@ class ShadowFilterManager:
         :rtype: ShadowFilterExtended
         """
         await self.filter.use_extended_mode()
+        self.__forget()
         mode = await self.filter.get_mode()
         assert isinstance(mode, ModeExtendedS), "Not extended mode"
         return ShadowFilterExtended(self.filter, mode)
@@ -53,6 +61,14 @@ class ShadowFilterManager:
         }[type(hli_mode)]
         return mode(self.filter, hli_mode)
 
+    async def get_enable(self) -> enums.OnOff:
+        """Whether the filter is enabled
+
+        :return: state of the filter
+        :rtype: enums.OnOff
+        """
+        return (await self.filter.enable.get()).state
+
     async def enable(self) -> None:
         """
         Enables the filter
@@ -74,7 +90,9 @@ class ShadowFilterManager:
     async def cancel(self) -> None:
         """Cancel changes made to the shadow filter and restore the configuration from the working filter."""
         await self.filter.cancel.set()
+        self.__forget()
 
     async def init(self) -> None:
         """Initialize the filter"""
-        await self.filter.initiating.set()
\ No newline at end of file
+        await self.filter.initiating.set()
+        self.__forget()
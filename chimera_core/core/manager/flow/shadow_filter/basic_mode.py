@@ -1,11 +1,12 @@
 import asyncio
 from itertools import chain
 
-from xoa_driver import utils
 from xoa_driver.v2.misc import FilterDefinitionShadow, ModeBasic
 
 from chimera_core.types import enums
 from chimera_core.core.manager.__dataset import GeneratorToken
+from chimera_core.core.utils.applied import apply_changed
+from chimera_core.core.utils.command_plan import CommandPlan, compile_plan
 from .__dataset import (
     TPLD_FILTERS_LENGTH,
     create_protocol_config_common,
@@ -306,8 +307,11 @@ class ShadowFilterBasic:
 
     def set_layer_xena(self, config: ShadowFilterConfigBasic) -> GeneratorToken:
         yield self.basic_mode.tpld.settings.set(action=config.layer_xena.tpld.match_action)
-        for i, tpld_filter in enumerate(self.basic_mode.tpld.test_payload_filters_config):
-            yield tpld_filter.set(use=config.layer_xena.tpld._configs[i].use, id=config.layer_xena.tpld._configs[i].tpld_id)
+        for i in range(TPLD_FILTERS_LENGTH):
+            yield self.basic_mode.tpld.test_payload_filters_config[i].set(
+                use=config.layer_xena.tpld._configs[i].use,
+                id=config.layer_xena.tpld._configs[i].tpld_id,
+            )
 
     def set_layer_any(self, config: ShadowFilterConfigBasic) -> GeneratorToken:
         if not config.layer_any.any_field.is_off:
@@ -318,20 +322,47 @@ class ShadowFilterBasic:
                 mask=config.layer_any.any_field.mask,
             )
 
-    async def set(self, config: ShadowFilterConfigBasic) -> None:
+    async def set(self, config: ShadowFilterConfigBasic, only_changed: bool = False) -> int:
         """Set the configuration of the shadow filter that is in basic mode
 
         :param config: the configuration of the shadow filter that is in basic mode
         :type config: ShadowFilterConfigBasic
+        :param only_changed: send only the commands differing from the last ones read or written, defaults to False
+        :type only_changed: bool, optional
+        :return: number of commands skipped
+        :rtype: int
         """
-        await utils.apply(
-            *chain(
-                self.set_layer_2(config),
-                self.set_layer_2_plus(config),
-                self.set_layer_3(config),
-                self.set_layer_4(config),
-                self.set_layer_xena(config),
-                self.set_layer_any(config),
-            ),
-            return_exceptions=False,
-        )
\ No newline at end of file
+        return await apply_changed(self._apply(config), not only_changed)
+
+    def _apply(self, config: ShadowFilterConfigBasic) -> GeneratorToken:
+        yield from chain(
+            self.set_layer_2(config),
+            self.set_layer_2_plus(config),
+            self.set_layer_3(config),
+            self.set_layer_4(config),
+            self.set_layer_xena(config),
+            self.set_layer_any(config),
+        )
+
+    @classmethod
+    def compile(cls, config: ShadowFilterConfigBasic) -> CommandPlan:
+        """Compile the configuration into a plan, to be applied to any shadow filter by ``apply_plan``
+
+        :param config: the configuration of the shadow filter that is in basic mode
+        :type config: ShadowFilterConfigBasic
+        :return: the commands of the configuration
+        :rtype: CommandPlan
+        """
+        return compile_plan(lambda shadow_filter, basic_mode: cls(shadow_filter, basic_mode)._apply(config), roots=2)
+
+    async def apply_plan(self, plan: CommandPlan, only_changed: bool = False) -> int:
+        """Set the configuration compiled by ``compile``
+
+        :param plan: the compiled configuration
+        :type plan: CommandPlan
+        :param only_changed: send only the commands differing from the last ones read or written, defaults to False
+        :type only_changed: bool, optional
+        :return: number of commands skipped
+        :rtype: int
+        """
+        return await apply_changed(plan.bind(self.shadow_filter, self.basic_mode).tokens(), not only_changed)
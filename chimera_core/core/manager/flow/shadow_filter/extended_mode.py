@@ -1,4 +1,5 @@
 import asyncio
+from itertools import chain
 
 from xoa_driver  import utils
 from xoa_driver.v2.misc import (
@@ -7,6 +8,7 @@ from xoa_driver.v2.misc import (
     ProtocolSegment as HLIProtocolSegment,
 )
 
+from chimera_core.core.utils.applied import applied_commands, apply_changed
 from .__dataset import (
     ProtocolSegement,
     ShadowFilterConfigExtended,
@@ -33,9 +35,12 @@ class ShadowFilterExtended:
         )
 
     async def set_single_protocol_segment_content(self, protocol_segment_hli: HLIProtocolSegment, value: str, mask: str) -> None:
-        await utils.apply(
-            protocol_segment_hli.value.set(Hex(value)),
-            protocol_segment_hli.mask.set(Hex(mask)),
+        await apply_changed(
+            (
+                protocol_segment_hli.value.set(Hex(value)),
+                protocol_segment_hli.mask.set(Hex(mask)),
+            ),
+            force=True,
         )
 
     async def get(self) -> ShadowFilterConfigExtended:
@@ -50,19 +55,32 @@ class ShadowFilterExtended:
         ))
         return ShadowFilterConfigExtended(protocol_segments=tuple(segments))
 
-    async def set(self, config: ShadowFilterConfigExtended) -> None:
+    async def set(self, config: ShadowFilterConfigExtended, only_changed: bool = False) -> int:
         """Set the configuration of the shadow filter that is in extended mode
 
+        With ``only_changed`` the protocol segments are only changed when they differ, then only the changed values and masks are sent.
+
         :param config: the configuration of the shadow filter that is in extended mode
         :type config: ShadowFilterConfigExtended
+        :param only_changed: send only the commands differing from the last ones read or written, defaults to False
+        :type only_changed: bool, optional
+        :return: number of commands skipped
+        :rtype: int
         """
-        await self.extended_mode.use_segments(*(proto.protocol_type for proto in config.protocol_segments[1:]))
+        segment_types = tuple(proto.protocol_type for proto in config.protocol_segments[1:])
         protocol_types = await self.extended_mode.get_protocol_segments()
-        await asyncio.gather(*(
-            self.set_single_protocol_segment_content(
-                protocol_segment_hli=proto,
-                value=config.protocol_segments[idx].value,
-                mask=config.protocol_segments[idx].mask,
-            )
+        if not only_changed or tuple(proto.segment_type for proto in protocol_types[1:]) != segment_types:
+            await self.extended_mode.use_segments(*segment_types)
+            # The values and masks written to the previous segments are not in effect any more
+            applied_commands.forget_resource(self.shadow_filter.cancel.set())
+            protocol_types = await self.extended_mode.get_protocol_segments()
+        return await apply_changed(
+            chain.from_iterable(
+                (
+                    proto.value.set(Hex(config.protocol_segments[idx].value)),
+                    proto.mask.set(Hex(config.protocol_segments[idx].mask)),
+                )
                 for idx, proto in enumerate(protocol_types)
-        ))
\ No newline at end of file
+            ),
+            not only_changed,
+        )
@@ -1,18 +1,43 @@
 import asyncio
-from typing import TYPE_CHECKING, Generator
+from typing import TYPE_CHECKING, Generator, List, Optional
 
 from chimera_core.core.manager.__base import ReserveMixin
+from chimera_core.core.utils.applied import applied_commands, apply_changed
+from chimera_core.core.utils.read_cache import get_read_cache
 from .__dataset import ModuleConfig
 
 if TYPE_CHECKING:
     from xoa_driver.v2.modules import ModuleChimera
+    from xoa_driver.v2.misc import Token
+
+
+MODULE_CHANGE_EVENTS = (
+    "on_timing_clock_local_adjust_change",
+    "on_adv_timing_clock_tx_source_change",
+    "on_adv_timing_clock_tx_status_change",
+    "on_latency_mode_change",
+    "on_cfp_type_change",
+    "on_cfp_config_change",
+    "on_reservation_change",
+)
+"""Change events of the driver invalidating the cached module configuration, the comment has none so only the writes of the configurator invalidate it"""
 
 
 class ModuleConfigurator:
     def __init__(self, module: "ModuleChimera") -> None:
         self.module = module
 
-    async def get(self) -> ModuleConfig:
+    async def get(self, max_age: Optional[float] = None) -> ModuleConfig:
+        """Get module configuration
+
+        :param max_age: seconds a configuration read before may be old, defaults to None to always read it
+        :type max_age: Optional[float], optional
+        :return: Module configuration
+        :rtype: ModuleConfig
+        """
+        return await get_read_cache(self.module, MODULE_CHANGE_EVENTS).get(self.__read, max_age)
+
+    async def __read(self) -> ModuleConfig:
         comment, clock_ppb, tx_clock_source, tx_clock_status, latency_mode, \
             cfp_type, cfp_config, bypass_mode = await asyncio.gather(*(
                 self.module.comment.get(),
@@ -25,7 +50,7 @@ class ModuleConfigurator:
                 self.module.bypass_mode.get(),
             ))
 
-        return ModuleConfig(
+        config = ModuleConfig(
             comment=comment.comment,
             clock_ppb=clock_ppb.ppb,
             tx_clock_source=tx_clock_source.tx_clock,
@@ -36,17 +61,36 @@ class ModuleConfigurator:
             port_speed=cfp_config.portspeed_list,
             bypass_mode=bypass_mode.on_off,
         )
+        applied_commands.store(self.__commands(config))
+        return config
 
-    async def set(self, config: ModuleConfig) -> None:
-        coroutines = (
+    def __commands(self, config: ModuleConfig) -> List["Token"]:
+        return [
             self.module.comment.set(config.comment),
             self.module.clock_ppb.set(config.clock_ppb),
             self.module.tx_clock.source.set(config.tx_clock_source),
             self.module.latency_mode.set(config.latency_mode),
             self.module.cfp.config.set(config.port_speed),
             self.module.bypass_mode.set(config.bypass_mode),
-        )
-        await asyncio.gather(*coroutines)
+        ]
+
+    async def set(self, config: ModuleConfig, only_changed: bool = False) -> int:
+        """Set module configuration
+
+        With ``only_changed`` the fields equal to the last configuration read or written in the session are skipped,
+        only use it for modules reserved by you and not changed by other means.
+
+        :param config: Module configuration
+        :type config: ModuleConfig
+        :param only_changed: send only the commands differing from the last ones read or written, defaults to False
+        :type only_changed: bool, optional
+        :return: number of commands skipped
+        :rtype: int
+        """
+        try:
+            return await apply_changed(self.__commands(config), not only_changed)
+        finally:
+            get_read_cache(self.module, MODULE_CHANGE_EVENTS).invalidate()
 
 
 class ModuleManager(ReserveMixin):
@@ -0,0 +1,258 @@
+import asyncio
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
+
+from xoa_driver.enums import ReservedStatus
+from xoa_driver.v2.testers import L23Tester
+from xoa_driver.v2.modules import ModuleChimera
+
+from chimera_core.core.utils.tokens import apply_by_connection
+from .const import RESERVATION_TIMEOUT
+from .exception import ResourcesReservedByOthersError
+from .reservation import (
+    TypeResouces,
+    ReservationCacheMetricsModel,
+    describe_resource,
+    get_watcher,
+    relinquish,
+    reservation_cache,
+)
+
+if TYPE_CHECKING:
+    from chimera_core.core.generic_types import TMesagesPipe
+
+
+RELINQUISH = "relinquish"
+RELEASE = "release"
+RESERVE = "reserve"
+
+
+def _children(resource: TypeResouces) -> Tuple[TypeResouces, ...]:
+    if isinstance(resource, L23Tester):
+        return tuple(module for module in resource.modules if isinstance(module, ModuleChimera))
+    if isinstance(resource, ModuleChimera):
+        return tuple(resource.ports)
+    return ()
+
+
+def _tree(resource: TypeResouces, with_sub_resources: bool) -> Iterator[TypeResouces]:
+    yield resource
+    if with_sub_resources:
+        for child in _children(resource):
+            yield from _tree(child, with_sub_resources)
+
+
+class ReservationStep:
+    __slots__ = ("resource", "command")
+
+    def __init__(self, resource: TypeResouces, command: str) -> None:
+        self.resource = resource
+        self.command = command
+
+
+class ReservationPlan:
+    """Reservation commands grouped by levels, the steps of a level run concurrently and the levels one after the other."""
+
+    __slots__ = ("levels",)
+
+    def __init__(self) -> None:
+        self.levels: List[List[ReservationStep]] = []
+
+    def add(self, level: int, resource: TypeResouces, command: str) -> None:
+        while len(self.levels) <= level:
+            self.levels.append([])
+        self.levels[level].append(ReservationStep(resource, command))
+
+    @property
+    def commands_count(self) -> int:
+        return sum(len(steps) for steps in self.levels)
+
+    @property
+    def relinquished(self) -> List[TypeResouces]:
+        """Resources reserved by others the plan takes."""
+        return [step.resource for steps in self.levels for step in steps if step.command == RELINQUISH]
+
+
+class ReservationPlanner:
+    """Free, reserve and release a tester, module or port with its sub resources in as few commands as possible.
+
+    The reservation statuses of the whole tree are read in one burst per tester,
+    then only the resources not already in the wanted status get a command.
+    The progress in percent of the sent commands is published on the pipe.
+    ``free``, ``reserve`` and ``release`` first plan from the statuses the driver keeps up to date from the tester
+    notifications, and send nothing at all when those already are the requested ones.
+    """
+
+    __slots__ = ("timeout", "__pipe")
+
+    def __init__(self, pipe: Optional["TMesagesPipe"] = None, *, timeout: float = RESERVATION_TIMEOUT) -> None:
+        self.timeout = timeout
+        self.__pipe = pipe
+
+    async def read(self, resources: List[TypeResouces]) -> Dict[int, ReservedStatus]:
+        """Reservation statuses of resources, keyed by their ``id``.
+
+        :param resources: the resources
+        :type resources: List[TypeResouces]
+        :return: the statuses
+        :rtype: Dict[int, ReservedStatus]
+        """
+        responses = await apply_by_connection([resource.reservation.get() for resource in resources])
+        return {
+            id(resource): ReservedStatus(response.status if hasattr(response, "status") else response.operation)
+            for resource, response in zip(resources, responses)
+        }
+
+    async def plan_free(self, resource: TypeResouces, should_free_sub_resources: bool = False) -> ReservationPlan:
+        """Relinquish the resources reserved by others, the sub resources of one reserved by you are left as they are.
+
+        :param resource: the resource
+        :type resource: TypeResouces
+        :param should_free_sub_resources: specifies if its sub resources are also to be freed, defaults to False
+        :type should_free_sub_resources: bool, optional
+        :return: the plan
+        :rtype: ReservationPlan
+        """
+        statuses = await self.read(list(_tree(resource, should_free_sub_resources)))
+        return self.__build_free(resource, statuses, should_free_sub_resources)
+
+    def __build_free(self, resource: TypeResouces, statuses: Dict[int, ReservedStatus], with_sub_resources: bool) -> ReservationPlan:
+        plan = ReservationPlan()
+        self.__add_free(plan, 0, resource, statuses, with_sub_resources)
+        return plan
+
+    def __add_free(
+        self,
+        plan: ReservationPlan,
+        level: int,
+        resource: TypeResouces,
+        statuses: Dict[int, ReservedStatus],
+        with_sub_resources: bool,
+    ) -> None:
+        status = statuses[id(resource)]
+        if status == ReservedStatus.RESERVED_BY_YOU:
+            return None
+        if status == ReservedStatus.RESERVED_BY_OTHER:
+            plan.add(level, resource, RELINQUISH)
+        if with_sub_resources:
+            for child in _children(resource):
+                self.__add_free(plan, level + 1, child, statuses, with_sub_resources)
+
+    async def plan_reserve(self, resource: TypeResouces, relinquish_others: bool = True) -> ReservationPlan:
+        """Free a resource and, for a tester or module, its sub resources, then reserve it.
+
+        :param resource: the resource
+        :type resource: TypeResouces
+        :param relinquish_others: take the resources reserved by others, otherwise fail, defaults to True
+        :type relinquish_others: bool, optional
+        :raises ResourcesReservedByOthersError: the resource or its sub resources are reserved by others and relinquish_others is False
+        :return: the plan
+        :rtype: ReservationPlan
+        """
+        return self.__build_reserve(resource, await self.read(list(_tree(resource, True))), relinquish_others)
+
+    def __build_reserve(self, resource: TypeResouces, statuses: Dict[int, ReservedStatus], relinquish_others: bool) -> ReservationPlan:
+        plan = self.__build_free(resource, statuses, True)
+        if not relinquish_others and (reserved := plan.relinquished):
+            raise ResourcesReservedByOthersError([describe_resource(item) for item in reserved])
+        if statuses[id(resource)] != ReservedStatus.RESERVED_BY_YOU:
+            plan.add(len(plan.levels), resource, RESERVE)
+        return plan
+
+    async def plan_release(self, resource: TypeResouces, should_release_sub_resources: bool = False) -> ReservationPlan:
+        """Release the resources reserved by you, the ports first.
+
+        :param resource: the resource
+        :type resource: TypeResouces
+        :param should_release_sub_resources: specifies if its sub resources are also to be released, defaults to False
+        :type should_release_sub_resources: bool, optional
+        :return: the plan
+        :rtype: ReservationPlan
+        """
+        statuses = await self.read(list(_tree(resource, should_release_sub_resources)))
+        return self.__build_release(resource, statuses, should_release_sub_resources)
+
+    def __build_release(self, resource: TypeResouces, statuses: Dict[int, ReservedStatus], with_sub_resources: bool) -> ReservationPlan:
+        plan = ReservationPlan()
+        resources = list(_tree(resource, with_sub_resources))
+        depths = {id(resource): 0}
+        for parent in resources:
+            for child in _children(parent):
+                depths[id(child)] = depths[id(parent)] + 1
+        deepest = max(depths.values())
+        for item in resources:
+            if statuses[id(item)] == ReservedStatus.RESERVED_BY_YOU:
+                plan.add(deepest - depths[id(item)], item, RELEASE)
+        plan.levels = [steps for steps in plan.levels if steps]
+        return plan
+
+    async def __run(self, step: ReservationStep) -> None:
+        if step.command == RELINQUISH:
+            await relinquish(step.resource, self.timeout)
+            return None
+        watcher = get_watcher(step.resource)
+        if step.command == RESERVE:
+            await step.resource.reservation.set_reserve()
+            await watcher.wait_for(ReservedStatus.RESERVED_BY_YOU, self.timeout)
+        else:
+            await step.resource.reservation.set_release()
+            await watcher.wait_for(ReservedStatus.RELEASED, self.timeout)
+
+    async def execute(self, plan: ReservationPlan) -> None:
+        """Run the levels of a plan one after the other, the steps of a level concurrently.
+
+        :param plan: the plan
+        :type plan: ReservationPlan
+        :raises ReservationTimeoutError: a reservation did not change in time
+        """
+        total, done = plan.commands_count, 0
+        facade = self.__pipe.get_facade() if self.__pipe else None
+
+        async def run(step: ReservationStep) -> None:
+            nonlocal done
+            await self.__run(step)
+            done += 1
+            if facade:
+                facade.send_progress(done * 100 // total)
+
+        for steps in plan.levels:
+            await asyncio.gather(*(run(step) for step in steps))
+
+    @property
+    def cache_metrics(self) -> ReservationCacheMetricsModel:
+        """Operations spared and not spared by the reservation statuses cache of the session."""
+        return reservation_cache.to_model()
+
+    def __cached(self, resource: TypeResouces, with_sub_resources: bool) -> Dict[int, ReservedStatus]:
+        return {id(item): reservation_cache.status(item) for item in _tree(resource, with_sub_resources)}
+
+    def __spared(self, plan: ReservationPlan) -> bool:
+        """Whether the cached statuses already are the requested ones."""
+        return reservation_cache.count(not plan.commands_count)
+
+    async def free(self, resource: TypeResouces, should_free_sub_resources: bool = False) -> None:
+        cached = self.__cached(resource, should_free_sub_resources)
+        if self.__spared(self.__build_free(resource, cached, should_free_sub_resources)):
+            return None
+        await self.execute(await self.plan_free(resource, should_free_sub_resources))
+
+    def reserved_by_others(self, resource: TypeResouces) -> List[TypeResouces]:
+        """Resources reserving a resource would take from others, from the cached statuses."""
+        return self.__build_free(resource, self.__cached(resource, True), True).relinquished
+
+    async def reserve(self, resource: TypeResouces, relinquish_others: bool = True) -> None:
+        if self.__spared(self.__build_reserve(resource, self.__cached(resource, True), relinquish_others)):
+            return None
+        await self.execute(await self.plan_reserve(resource, relinquish_others))
+
+    async def release(self, resource: TypeResouces, should_release_sub_resources: bool = False) -> None:
+        cached = self.__cached(resource, should_release_sub_resources)
+        if self.__spared(self.__build_release(resource, cached, should_release_sub_resources)):
+            return None
+        await self.execute(await self.plan_release(resource, should_release_sub_resources))
@@ -1,10 +1,12 @@
 import asyncio
+from itertools import chain
 from loguru import logger
-from typing import Dict, Generator, List, TYPE_CHECKING
+from typing import Dict, Generator, Iterable, List, Optional, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from xoa_driver.v2.ports import PortChimera
     from xoa_driver.v2.misc import (
+        Token,
         StatisticsTotals,
         CustomDistributions as HLICustomDistributions,
         CustomDistribution as HLICustomDistribution,
@@ -12,23 +14,53 @@ if TYPE_CHECKING:
 
 from xoa_driver import utils
 from xoa_driver.enums import OnOff
+from xoa_driver.internals.commands import PEC_INDICES
 
 
+from chimera_core.core.utils.applied import applied_commands, apply_changed
+from chimera_core.core.utils.command_plan import CommandPlan, compile_plan
+from chimera_core.core.utils.read_cache import get_read_cache
 from chimera_core.core.manager.__dataset import PortConfig, PortConfigLinkFlap, PortConfigPulseError, CustomDistribution
 from chimera_core.core.manager.__base import ReserveMixin
+from chimera_core.core.manager.exception import InvalidSnapshotError
 from chimera_core.core.manager.flow import FlowManager, FlowManagerContainer
+from chimera_core.core.manager.flow.shadow_filter.__dataset import ShadowFilterConfigBasic
+from chimera_core.core.manager.snapshot import IMPAIRMENTS, FlowSnapshot, PortSnapshot
+
+
+PORT_CHANGE_EVENTS = ("on_emulate_change", "on_reservation_change")
+"""Change events of the driver invalidating the cached port configuration"""
+
+
+async def _create_custom_distributions(port: "PortChimera", indices: Iterable[int]) -> None:
+    """Make the custom distributions of a port exactly the ones of the indices, creating the missing ones empty.
+
+    The driver only adds a custom distribution at the first free index, a snapshot has to recreate its own indices.
+    No public command does, so ``PEC_INDICES`` is built on the connection the driver keeps private to the port.
+    """
+    await PEC_INDICES(port._conn, port.kind.module_id, port.kind.port_id).set(sorted(indices))
 
 
 class PortConfigurator:
     def __init__(self, port: "PortChimera") -> None:
         self.port = port
 
-    async def get(self) -> PortConfig:
+    def forget(self) -> None:
+        """Forget the values written to and read from the port, for example after it was changed by other means."""
+        applied_commands.forget_resource(self.port.comment.set(""))
+        get_read_cache(self.port, PORT_CHANGE_EVENTS).invalidate()
+
+    async def get(self, max_age: Optional[float] = None) -> PortConfig:
         """Get port configuration
 
+        :param max_age: seconds a configuration read before may be old, defaults to None to always read it
+        :type max_age: Optional[float], optional
         :return: Port configuration
         :rtype: PortConfig
         """
+        return await get_read_cache(self.port, PORT_CHANGE_EVENTS).get(self.__read, max_age)
+
+    async def __read(self) -> PortConfig:
         comment, enable_tx, enable_link_flap, link_flap_params, enable_pulse_error, pulse_error_params, \
             emulate, tpld_mode, fcs_error_mode = await asyncio.gather(*(
                 self.port.comment.get(),
@@ -64,15 +96,11 @@ class PortConfigurator:
             tpld_mode=tpld_mode.mode,
             fcs_error_mode=fcs_error_mode.on_off,
         )
+        applied_commands.store(self.__commands(config))
         return config
 
-    async def set(self, config: PortConfig) -> None:
-        """Set port configuration
-
-        :param config: Port configuration
-        :type config: PortConfig
-        """
-        await utils.apply(
+    def __commands(self, config: PortConfig) -> List["Token"]:
+        return [
             self.port.comment.set(config.comment),
             self.port.pcs_pma.link_flap.enable.set(config.link_flap.enable),
             self.port.pcs_pma.link_flap.params.set(
@@ -91,7 +119,51 @@ class PortConfigurator:
             self.port.emulate.set(config.enable_impairment),
             self.port.emulation.tpld_mode.set(config.tpld_mode),
             self.port.emulation.drop_fcs_errors.set(config.fcs_error_mode),
-        )
+        ]
+
+    async def set(self, config: PortConfig, only_changed: bool = False) -> int:
+        """Set port configuration
+
+        With ``only_changed`` the fields equal to the last configuration read or written in the session are skipped,
+        only use it for ports reserved by you and not changed by other means.
+
+        :param config: Port configuration
+        :type config: PortConfig
+        :param only_changed: send only the commands differing from the last ones read or written, defaults to False
+        :type only_changed: bool, optional
+        :return: number of commands skipped
+        :rtype: int
+        """
+        try:
+            return await apply_changed(self.__commands(config), not only_changed)
+        finally:
+            get_read_cache(self.port, PORT_CHANGE_EVENTS).invalidate()
+
+    @staticmethod
+    def compile(config: PortConfig) -> CommandPlan:
+        """Compile the configuration into a plan, to be applied to any port by ``apply_plan``
+
+        :param config: Port configuration
+        :type config: PortConfig
+        :return: the commands of the configuration
+        :rtype: CommandPlan
+        """
+        return compile_plan(lambda port: PortConfigurator(port).__commands(config))
+
+    async def apply_plan(self, plan: CommandPlan, only_changed: bool = False) -> int:
+        """Set a compiled port configuration, see ``set``.
+
+        :param plan: the compiled configuration
+        :type plan: CommandPlan
+        :param only_changed: send only the commands differing from the last ones read or written, defaults to False
+        :type only_changed: bool, optional
+        :return: number of commands skipped
+        :rtype: int
+        """
+        try:
+            return await apply_changed(plan.bind(self.port).tokens(), not only_changed)
+        finally:
+            get_read_cache(self.port, PORT_CHANGE_EVENTS).invalidate()
 
     @property
     def statistics(self) -> "StatisticsTotals":
@@ -104,10 +176,10 @@ class PortConfigurator:
 
 
 class CustomDistributionsManager:
-    def __init__(self, hli_custom_distributions: HLICustomDistributions) -> None:
+    def __init__(self, hli_custom_distributions: "HLICustomDistributions") -> None:
         self.hli_custom_distributions = hli_custom_distributions
 
-    async def __read_single_custom_distribution(self, cs: HLICustomDistribution) -> CustomDistribution:
+    async def __read_single_custom_distribution(self, cs: "HLICustomDistribution") -> CustomDistribution:
         definition, comment, distribution_type = await utils.apply(
             cs.definition.get(),
             cs.comment.get(),
@@ -125,20 +197,42 @@ class CustomDistributionsManager:
 
     async def get(self) -> Dict[int, CustomDistribution]:
         await self.hli_custom_distributions.server_sync()
-        all_custom_distribution = {
-            idx: await self.__read_single_custom_distribution(cd_hli) for idx, cd_hli in self.hli_custom_distributions.items()
-        }
-        return all_custom_distribution
+        indices = list(self.hli_custom_distributions.keys())
+        distributions = await asyncio.gather(*(
+            self.__read_single_custom_distribution(self.hli_custom_distributions[idx]) for idx in indices
+        ))
+        return dict(zip(indices, distributions))
+
+    def __commands(self, index: int, cd: CustomDistribution) -> List["Token"]:
+        hli_cd = self.hli_custom_distributions[index]
+        return [
+            hli_cd.comment.set(cd.comment),
+            hli_cd.definition.set(
+                linear=cd.linear,
+                symmetric=cd.symmetric,
+                entry_count=cd.entry_count,
+                data_x=cd.data_x,
+            ),
+        ]
 
     async def set_single_distribution(self, index: int, cd: CustomDistribution) -> None:
         await self.hli_custom_distributions.server_sync()
-        hli_cd = self.hli_custom_distributions[index]
-        await hli_cd.comment.set(cd.comment)
-        await hli_cd.definition.set(
-            linear=cd.linear,
-            symmetric=cd.symmetric,
-            entry_count=cd.entry_count,
-            data_x=cd.data_x,
+        await apply_changed(self.__commands(index, cd), force=True)
+
+    async def set_all(self, distributions: Iterable[CustomDistribution], only_changed: bool = False) -> int:
+        """Set existing custom distributions in one burst.
+
+        :param distributions: the custom distributions, identified by their index
+        :type distributions: Iterable[CustomDistribution]
+        :param only_changed: send only the commands differing from the last ones read or written, defaults to False
+        :type only_changed: bool, optional
+        :return: number of commands skipped
+        :rtype: int
+        """
+        await self.hli_custom_distributions.server_sync()
+        return await apply_changed(
+            chain.from_iterable(self.__commands(cd.custom_distribution_index, cd) for cd in distributions),
+            not only_changed,
         )
 
     async def add(self, linear: bool, entry_count: int, data_x: List[int], comment: str) -> CustomDistribution:
@@ -149,6 +243,8 @@ class CustomDistributionsManager:
             comment=comment,
         )
         cd = await self.__read_single_custom_distribution(cd)
+        # The index may have held a deleted distribution, its values written before are not in effect
+        applied_commands.forget(self.__commands(cd.custom_distribution_index, cd))
         return cd
 
 
@@ -176,4 +272,74 @@ class PortManager(ReserveMixin):
     async def reset(self) -> None:
         """Reset the port
         """
-        await self.resource_instance.reset.set()
\ No newline at end of file
+        await self.resource_instance.reset.set()
+        self.config.forget()
+
+    async def __snapshot_flow(self, flow_index: int, flow: FlowManager) -> FlowSnapshot:
+        config, *impairments = await asyncio.gather(
+            flow.get(),
+            *(getattr(flow, name).get() for name in IMPAIRMENTS),
+        )
+        snapshot = FlowSnapshot(config, *impairments)
+        if flow_index > 0:
+            mode, snapshot.filter_enable = await asyncio.gather(flow.shadow_filter.get_mode(), flow.shadow_filter.get_enable())
+            snapshot.filter = await mode.get()
+        return snapshot
+
+    async def snapshot(self) -> PortSnapshot:
+        """Read the whole configuration of the port, every read of the port and its flows is sent concurrently.
+
+        :return: the port configuration, custom distributions, and the configuration, shadow filter and impairments of every flow
+        :rtype: PortSnapshot
+        """
+        config, custom_distributions, *flows = await asyncio.gather(
+            self.config.get(),
+            self.custom_distributions.get(),
+            *(self.__snapshot_flow(idx, flow) for idx, flow in enumerate(self.flows.flows)),
+        )
+        return PortSnapshot(config=config, custom_distributions=custom_distributions, flows=flows)
+
+    async def __restore_custom_distributions(self, distributions: Dict[int, CustomDistribution], only_changed: bool) -> None:
+        hli_custom_distributions = self.resource_instance.custom_distributions
+        await hli_custom_distributions.server_sync()
+        existing = set(hli_custom_distributions.keys())
+        if existing != set(distributions):
+            # The indices deleted or created hold other distributions than the ones last written
+            only_changed = False
+        await asyncio.gather(*(hli_custom_distributions.remove(index) for index in existing - set(distributions)))
+        if set(distributions) - existing:
+            await _create_custom_distributions(self.resource_instance, distributions)
+        await self.custom_distributions.set_all(distributions.values(), only_changed)
+
+    async def __restore_flow(self, flow: FlowManager, snapshot: FlowSnapshot, only_changed: bool) -> None:
+        if snapshot.filter is not None:
+            if isinstance(snapshot.filter, ShadowFilterConfigBasic):
+                await (await flow.shadow_filter.use_basic_mode()).set(snapshot.filter, only_changed)
+            else:
+                await (await flow.shadow_filter.use_extended_mode()).set(snapshot.filter, only_changed)
+            await utils.apply(flow.shadow_filter.filter.enable.set(snapshot.filter_enable), flow.shadow_filter.filter.apply.set())
+        # Corruption above layer 2 needs a filter including the layer, the impairments follow the filter
+        await asyncio.gather(
+            flow.set(snapshot.config, only_changed),
+            *(getattr(flow, name).restore(getattr(snapshot, name), only_changed) for name in IMPAIRMENTS),
+        )
+
+    async def restore(self, snapshot: PortSnapshot, only_changed: bool = False) -> None:
+        """Set the port to a snapshot, the dependencies first.
+
+        The port configuration is written first, then the custom distributions referenced by the impairments,
+        then all the flows concurrently, each one its shadow filter, applied to the working filter, before its impairments.
+        Each step sends its commands as bursts.
+
+        :param snapshot: the snapshot read by ``snapshot``, or rebuilt by ``PortSnapshot.from_dict``
+        :type snapshot: PortSnapshot
+        :param only_changed: skip the values last read or written in the session, defaults to False since the port may have been changed by other means
+        :type only_changed: bool, optional
+        """
+        if len(snapshot.flows) != len(self.flows.flows):
+            raise InvalidSnapshotError(f"{len(snapshot.flows)} flows for a port of {len(self.flows.flows)}")
+        await self.config.set(snapshot.config, only_changed)
+        await self.__restore_custom_distributions(snapshot.custom_distributions, only_changed)
+        await asyncio.gather(*(
+            self.__restore_flow(flow, flow_snapshot, only_changed) for flow, flow_snapshot in zip(self.flows.flows, snapshot.flows)
+        ))
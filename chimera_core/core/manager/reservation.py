@@ -0,0 +1,176 @@
+import asyncio
+import time
+import weakref
+from collections import deque
+from typing import (
+    Deque,
+    Optional,
+    Union,
+)
+
+from loguru import logger
+from pydantic import BaseModel
+from xoa_driver.enums import ReservedStatus
+from xoa_driver.v2.testers import L23Tester
+from xoa_driver.v2.modules import ModuleChimera
+from xoa_driver.v2.ports import PortChimera
+
+from .const import RESERVATION_HISTORY, RESERVATION_TIMEOUT
+from .exception import ReservationTimeoutError
+
+
+TypeResouces = Union[L23Tester, ModuleChimera, PortChimera]
+
+
+class ReservationWatcher:
+    """Wake the waiters of a resource on the reservation changes notified by the tester.
+
+    The driver updates ``resource.info.reservation`` from the same notifications before the watcher is called,
+    so the waiters read the status without sending any command.
+    The watcher is held by the subscription of the resource and only refers back to it weakly.
+    """
+
+    __slots__ = ("__resource", "version", "durations", "__changed")
+
+    def __init__(self, resource: TypeResouces) -> None:
+        self.__resource = weakref.ref(resource)
+        self.version = 0
+        """Number of reservation changes notified since the watcher was created"""
+        self.durations: Deque[float] = deque(maxlen=RESERVATION_HISTORY)
+        """Seconds taken by the latest waits"""
+        self.__changed = asyncio.Condition()
+        resource.on_reservation_change(self.__on_change)
+
+    async def __on_change(self, *_) -> None:
+        self.version += 1
+        async with self.__changed:
+            self.__changed.notify_all()
+
+    @property
+    def resource(self) -> TypeResouces:
+        resource = self.__resource()
+        assert resource is not None, "The watched resource no longer exists"
+        return resource
+
+    @property
+    def status(self) -> ReservedStatus:
+        return ReservedStatus(self.resource.info.reservation)
+
+    async def wait_changed(self, version: int, timeout: Optional[float]) -> None:
+        """Wait for a change notified after ``version``, read before sending the command expected to cause it.
+
+        :param version: the version read before the command
+        :type version: int
+        :param timeout: seconds to wait, None to wait forever
+        :type timeout: Optional[float]
+        :raises asyncio.TimeoutError: no change notified in time
+        """
+        async with self.__changed:
+            await asyncio.wait_for(self.__changed.wait_for(lambda: self.version > version), timeout)
+
+    async def wait_for(self, status: ReservedStatus, timeout: Optional[float]) -> float:
+        """Wait until the resource reaches a reservation status.
+
+        :param status: the expected status
+        :type status: ReservedStatus
+        :param timeout: seconds to wait, None to wait forever
+        :type timeout: Optional[float]
+        :raises ReservationTimeoutError: the status was not reached in time
+        :return: seconds waited
+        :rtype: float
+        """
+        start = time.monotonic()
+        try:
+            async with self.__changed:
+                await asyncio.wait_for(self.__changed.wait_for(lambda: self.status == status), timeout)
+        except asyncio.TimeoutError:
+            raise ReservationTimeoutError(status.name.lower(), timeout or 0.0) from None
+        return self.record(time.monotonic() - start)
+
+    def record(self, duration: float) -> float:
+        self.durations.append(duration)
+        logger.debug(f"Reservation of {type(self.resource).__name__} changed after {duration:.3f}s")
+        return duration
+
+
+_watchers: "weakref.WeakKeyDictionary[TypeResouces, ReservationWatcher]" = weakref.WeakKeyDictionary()
+"""Watchers of the resources, dropped with their resources as the driver offers no way to unsubscribe"""
+
+
+def get_watcher(resource: TypeResouces) -> ReservationWatcher:
+    """The reservation watcher of a resource, subscribed to its notifications on first use."""
+    if (watcher := _watchers.get(resource)) is None:
+        watcher = _watchers[resource] = ReservationWatcher(resource)
+    return watcher
+
+
+class ReservationCacheMetricsModel(BaseModel):
+    hits: int
+    misses: int
+
+
+class ReservationCache:
+    """Reservation statuses kept by the driver from the tester notifications, with the counts of the operations they spared.
+
+    An operation is a hit when the cached statuses already are the requested ones and no command is sent,
+    a miss when the statuses are read again from the tester.
+    """
+
+    __slots__ = ("hits", "misses")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+
+    def status(self, resource: TypeResouces) -> ReservedStatus:
+        return get_watcher(resource).status
+
+    def count(self, hit: bool) -> bool:
+        if hit:
+            self.hits += 1
+        else:
+            self.misses += 1
+        return hit
+
+    def to_model(self) -> ReservationCacheMetricsModel:
+        return ReservationCacheMetricsModel(hits=self.hits, misses=self.misses)
+
+
+reservation_cache = ReservationCache()
+"""Cache of the session, shared by all the reservation planners"""
+
+
+def describe_resource(resource: TypeResouces) -> str:
+    """Name of a resource in the messages, ``<host>``, ``<module>`` or ``<module>/<port>``."""
+    if isinstance(resource, PortChimera):
+        return f"port {resource.kind.module_id}/{resource.kind.port_id}"
+    if isinstance(resource, ModuleChimera):
+        return f"module {resource.module_id}"
+    return f"tester {resource.info.host}"
+
+
+async def relinquish(resource: TypeResouces, timeout: float = RESERVATION_TIMEOUT) -> float:
+    """Take a resource reserved by others, it is left released.
+
+    The relinquish is sent again only when the tester notifies the resource is still reserved by others.
+
+    :param resource: the resource
+    :type resource: TypeResouces
+    :param timeout: seconds to wait for the resource to be released, defaults to RESERVATION_TIMEOUT
+    :type timeout: float, optional
+    :raises ReservationTimeoutError: the resource was not released in time
+    :return: seconds waited
+    :rtype: float
+    """
+    watcher = get_watcher(resource)
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    deadline = start + timeout
+    while watcher.status != ReservedStatus.RELEASED:
+        version = watcher.version
+        await resource.reservation.set_relinquish()
+        try:
+            await watcher.wait_changed(version, max(deadline - loop.time(), 0.0))
+        except asyncio.TimeoutError:
+            raise ReservationTimeoutError("relinquished", timeout) from None
+    return watcher.record(loop.time() - start)
@@ -0,0 +1,164 @@
+import ipaddress
+import importlib
+import json
+from dataclasses import dataclass, field, fields, is_dataclass
+from enum import Enum
+from typing import Any, Dict, List, Optional, Union
+
+from chimera_core.types import enums
+from .__dataset import PortConfig, CustomDistribution
+from .exception import InvalidSnapshotError
+from .flow.__dataset import FlowConfig
+from .flow.impairments.__dataset import (
+    ImpairmentConfigGeneral,
+    ImpairmentConfigCorruption,
+    ImpairmentConfigMisordering,
+    ImpairmentConfigPolicer,
+    ImpairmentConfigShaper,
+)
+from .flow.shadow_filter.__dataset import ShadowFilterConfigBasic, ShadowFilterConfigExtended
+
+
+SNAPSHOT_VERSION = 1
+"""Version of the serialized snapshot, increased by incompatible changes of the configuration classes"""
+
+SERIALIZABLE_PACKAGES = ("chimera_core.", "xoa_driver.")
+"""Packages the classes of a serialized snapshot may be imported from"""
+
+IMPAIRMENTS = ("drop", "misordering", "latency_jitter", "duplication", "corruption", "policer", "shaper")
+"""Impairments of a flow, in the order they are restored"""
+
+
+@dataclass
+class FlowSnapshot:
+    config: FlowConfig
+    drop: ImpairmentConfigGeneral
+    misordering: ImpairmentConfigMisordering
+    latency_jitter: ImpairmentConfigGeneral
+    duplication: ImpairmentConfigGeneral
+    corruption: ImpairmentConfigCorruption
+    policer: ImpairmentConfigPolicer
+    shaper: ImpairmentConfigShaper
+    filter: Optional[Union[ShadowFilterConfigBasic, ShadowFilterConfigExtended]] = None
+    """Shadow filter configuration, None for the default flow which has no filter"""
+    filter_enable: enums.OnOff = enums.OnOff.OFF
+
+
+@dataclass
+class PortSnapshot:
+    """The whole configuration of a Chimera port, see ``PortManager.snapshot`` and ``PortManager.restore``.
+
+    ``to_dict`` and ``to_json`` serialize it, the configuration classes are recorded by name to be rebuilt as they were.
+    """
+
+    config: PortConfig
+    custom_distributions: Dict[int, CustomDistribution] = field(default_factory=dict)
+    flows: List[FlowSnapshot] = field(default_factory=list)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"version": SNAPSHOT_VERSION, "snapshot": encode(self)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PortSnapshot":
+        if data.get("version") != SNAPSHOT_VERSION:
+            raise InvalidSnapshotError(f"version {data.get('version')} is not {SNAPSHOT_VERSION}")
+        snapshot = decode(data.get("snapshot"))
+        if not isinstance(snapshot, cls):
+            raise InvalidSnapshotError(f"not a {cls.__name__}")
+        return snapshot
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, data: str) -> "PortSnapshot":
+        return cls.from_dict(json.loads(data))
+
+
+def _class_path(cls: type) -> str:
+    return f"{cls.__module__}:{cls.__qualname__}"
+
+
+def _load_class(path: str) -> type:
+    module_name, _, qualname = path.partition(":")
+    if not module_name.startswith(SERIALIZABLE_PACKAGES):
+        raise InvalidSnapshotError(f"class {path} is not part of the configuration")
+    try:
+        cls: Any = importlib.import_module(module_name)
+        for name in qualname.split("."):
+            cls = getattr(cls, name)
+    except (ImportError, AttributeError):
+        raise InvalidSnapshotError(f"class {path} does not exist")
+    return cls
+
+
+def encode(value: Any) -> Any:
+    """Convert a configuration to JSON compatible values.
+
+    Dataclasses, enums, IP addresses, tuples and dictionaries with keys other than strings
+    are tagged with their type to be rebuilt by ``decode``.
+
+    :param value: the configuration
+    :type value: Any
+    :raises TypeError: the configuration holds a value of another type
+    :return: the JSON compatible value
+    :rtype: Any
+    """
+    if isinstance(value, Enum):
+        return {"__type__": "enum", "class": _class_path(type(value)), "value": value.value}
+    if is_dataclass(value) and not isinstance(value, type):
+        # Fields with init=False, like the schedule of a distribution, may not be set yet
+        return {
+            "__type__": "dataclass",
+            "class": _class_path(type(value)),
+            "fields": {f.name: encode(getattr(value, f.name)) for f in fields(value) if hasattr(value, f.name)},
+        }
+    if isinstance(value, (ipaddress.IPv4Address, ipaddress.IPv6Address)):
+        return {"__type__": "ip", "value": str(value)}
+    if isinstance(value, tuple):
+        return {"__type__": "tuple", "items": [encode(item) for item in value]}
+    if isinstance(value, list):
+        return [encode(item) for item in value]
+    if isinstance(value, dict):
+        return {"__type__": "dict", "items": [[encode(k), encode(v)] for k, v in value.items()]}
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise TypeError(f"Can't serialize {type(value).__name__} of a configuration.")
+
+
+def decode(value: Any) -> Any:
+    """Rebuild a configuration converted by ``encode``.
+
+    Dataclasses are rebuilt without calling their ``__init__``, so the fields are exactly the ones encoded.
+
+    :param value: the JSON compatible value
+    :type value: Any
+    :raises InvalidSnapshotError: the value was not converted by ``encode``
+    :return: the configuration
+    :rtype: Any
+    """
+    if isinstance(value, list):
+        return [decode(item) for item in value]
+    if not isinstance(value, dict):
+        return value
+    kind = value.get("__type__")
+    if kind == "dataclass":
+        cls = _load_class(value["class"])
+        if not is_dataclass(cls):
+            raise InvalidSnapshotError(f"class {value['class']} is not a dataclass")
+        obj = cls.__new__(cls)
+        for name, item in value["fields"].items():
+            object.__setattr__(obj, name, decode(item))
+        return obj
+    if kind == "enum":
+        cls = _load_class(value["class"])
+        if not issubclass(cls, Enum):
+            raise InvalidSnapshotError(f"class {value['class']} is not an enum")
+        return cls(value["value"])
+    if kind == "ip":
+        return ipaddress.ip_address(value["value"])
+    if kind == "tuple":
+        return tuple(decode(item) for item in value["items"])
+    if kind == "dict":
+        return {decode(k): decode(v) for k, v in value["items"]}
+    raise InvalidSnapshotError(f"unknown value type {kind}")
@@ -0,0 +1,202 @@
+import asyncio
+import contextlib
+import itertools
+import time
+from typing import (
+    TYPE_CHECKING,
+    AsyncIterator,
+    Dict,
+    Iterable,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from loguru import logger
+
+from .__dataset import PortConfig
+from .exception import StandbyPoolClosedError
+from .port import PortManager
+from .transaction import ReservationTransaction
+
+if TYPE_CHECKING:
+    from chimera_core.core.generic_types import TMesagesPipe
+    from .tester import TesterManager
+
+
+class PortLease:
+    """A port handed out by a standby pool, returned to it by ``release``."""
+
+    __slots__ = ("id", "port", "acquired_at", "__pool")
+
+    def __init__(self, pool: "StandbyPortPool", id: int, port: PortManager) -> None:
+        self.id = id
+        self.port = port
+        self.acquired_at = time.time()
+        self.__pool = pool
+
+    @property
+    def released(self) -> bool:
+        return not self.__pool.is_leased(self)
+
+    def release(self) -> None:
+        """Return the port to the pool, which restores its baseline in the background."""
+        self.__pool.release(self)
+
+
+class StandbyPortPool:
+    """Chimera ports kept reserved and parked in a baseline configuration, handed out with leases.
+
+    A returned port is reset, set to the baseline configuration, and becomes available again in the background,
+    so the next test case gets a ready port without waiting for the reservation and the configuration.
+    A port failing to restore is dropped from the pool and the error published on the pipe.
+
+    .. code-block:: python
+
+        pool = await StandbyPortPool.create(tester, [(0, 0), (0, 1)], baseline=PortConfig())
+        async with pool.lease() as port:
+            ...
+        await pool.close()
+    """
+
+    __slots__ = ("baseline", "__ports", "__pipe", "__transaction", "__ready", "__leases", "__restoring", "__ids", "__closed")
+
+    def __init__(self, ports: Sequence[PortManager], baseline: Optional[PortConfig] = None, *, pipe: Optional["TMesagesPipe"] = None) -> None:
+        self.baseline = baseline
+        """Configuration of the parked ports, None to only reset them"""
+        self.__ports = tuple(ports)
+        self.__pipe = pipe
+        self.__transaction = ReservationTransaction(*self.__ports)
+        self.__ready: "asyncio.Queue[PortManager]" = asyncio.Queue()
+        self.__leases: Dict[int, PortLease] = {}
+        self.__restoring: Set["asyncio.Task[None]"] = set()
+        self.__ids = itertools.count()
+        self.__closed = asyncio.Event()
+
+    @classmethod
+    async def create(
+        cls,
+        tester: "TesterManager",
+        ports: Iterable[Tuple[int, int]],
+        baseline: Optional[PortConfig] = None,
+        *,
+        pipe: Optional["TMesagesPipe"] = None,
+    ) -> "StandbyPortPool":
+        """Reserve the ports of a tester and park them in the baseline configuration.
+
+        :param tester: the tester manager
+        :type tester: TesterManager
+        :param ports: module and port indices of the ports
+        :type ports: Iterable[Tuple[int, int]]
+        :param baseline: configuration of the parked ports, defaults to None to only reset them
+        :type baseline: Optional[PortConfig], optional
+        :param pipe: pipe to publish the restore errors on, defaults to None
+        :type pipe: Optional[TMesagesPipe], optional
+        :return: the started pool
+        :rtype: StandbyPortPool
+        """
+        managers = await asyncio.gather(*(tester.use_port(module_id, port_id, reserve=False) for module_id, port_id in ports))
+        pool = cls(managers, baseline, pipe=pipe)
+        await pool.start()
+        return pool
+
+    @property
+    def available(self) -> int:
+        return self.__ready.qsize()
+
+    @property
+    def leased(self) -> int:
+        return len(self.__leases)
+
+    def is_leased(self, lease: PortLease) -> bool:
+        return self.__leases.get(lease.id) is lease
+
+    async def __restore(self, port: PortManager) -> None:
+        await port.reset()
+        if self.baseline is not None:
+            await port.config.set(self.baseline)
+
+    async def start(self) -> None:
+        """Reserve all the ports, or none of them, and park them in the baseline configuration."""
+        await self.__transaction.acquire()
+        await asyncio.gather(*(self.__restore(port) for port in self.__ports))
+        for port in self.__ports:
+            self.__ready.put_nowait(port)
+
+    def __give_back(self, ready: "asyncio.Future[PortManager]") -> None:
+        """Stop waiting for a port, the port already taken off the queue is parked again."""
+        if not ready.done():
+            ready.cancel()
+        elif not ready.cancelled() and ready.exception() is None:
+            self.__ready.put_nowait(ready.result())
+
+    async def acquire(self, timeout: Optional[float] = None) -> PortLease:
+        """Lease a parked port, waiting for one to be returned when none is available.
+
+        :param timeout: seconds to wait, defaults to None to wait forever
+        :type timeout: Optional[float], optional
+        :raises asyncio.TimeoutError: no port was available in time
+        :raises StandbyPoolClosedError: the pool is closed, also while waiting
+        :return: the lease of the port
+        :rtype: PortLease
+        """
+        if self.__closed.is_set():
+            raise StandbyPoolClosedError()
+        ready = asyncio.ensure_future(self.__ready.get())
+        closed = asyncio.ensure_future(self.__closed.wait())
+        try:
+            await asyncio.wait((ready, closed), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        except BaseException:
+            self.__give_back(ready)
+            raise
+        finally:
+            closed.cancel()
+        if self.__closed.is_set() or not ready.done():
+            self.__give_back(ready)
+            raise StandbyPoolClosedError() if self.__closed.is_set() else asyncio.TimeoutError()
+        port = ready.result()
+        lease = PortLease(self, next(self.__ids), port)
+        self.__leases[lease.id] = lease
+        return lease
+
+    @contextlib.asynccontextmanager
+    async def lease(self, timeout: Optional[float] = None) -> AsyncIterator[PortManager]:
+        """Lease a parked port for the duration of the block."""
+        lease = await self.acquire(timeout)
+        try:
+            yield lease.port
+        finally:
+            lease.release()
+
+    def release(self, lease: PortLease) -> None:
+        """Return a leased port, it becomes available once restored to the baseline, nothing is done once the pool is closed."""
+        if self.__closed.is_set():
+            self.__leases.pop(lease.id, None)
+            return None
+        if not self.is_leased(lease):
+            raise ValueError(f"Lease {lease.id} is not held.")
+        del self.__leases[lease.id]
+        task = asyncio.create_task(self.__park(lease.port), name=f"StandbyPortPool[{lease.id}]")
+        self.__restoring.add(task)
+        task.add_done_callback(self.__restoring.discard)
+
+    async def __park(self, port: PortManager) -> None:
+        try:
+            await self.__restore(port)
+        except Exception as e:
+            logger.error(f"Standby port dropped, restore failed: {e}")
+            if self.__pipe:
+                self.__pipe.get_facade().send_error(e)
+            return None
+        self.__ready.put_nowait(port)
+
+    async def close(self) -> None:
+        """Wait for the returned ports to be restored, then release all the ports of the pool, also the leased ones.
+
+        The waiting ``acquire`` calls raise ``StandbyPoolClosedError``.
+        """
+        self.__closed.set()
+        if self.__restoring:
+            await asyncio.gather(*self.__restoring, return_exceptions=True)
+        await self.__transaction.release()
@@ -0,0 +1,127 @@
+import asyncio
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+)
+
+from xoa_driver.enums import ReservedStatus
+from xoa_driver.v2.testers import L23Tester
+from xoa_driver.v2.modules import ModuleChimera
+
+from .__base import ReserveMixin
+from .const import RESERVATION_TIMEOUT
+from .exception import ResourcesReservedByOthersError
+from .planner import ReservationPlanner
+from .reservation import TypeResouces, describe_resource, get_watcher
+
+
+def _level(manager: ReserveMixin) -> int:
+    """Testers are reserved before their modules and modules before their ports."""
+    if isinstance(manager.resource_instance, L23Tester):
+        return 0
+    if isinstance(manager.resource_instance, ModuleChimera):
+        return 1
+    return 2
+
+
+class ReservationTransaction:
+    """Reserve a set of testers, modules and ports all together, or none of them.
+
+    The resources of a level are reserved concurrently, testers first, then modules, then ports.
+    When one of them can't be reserved the ones taken by the transaction are released and the error raised,
+    the resources already reserved by you before are left as they are.
+    Reserving a tester or module frees its ports as ``ReserveMixin.reserve`` does,
+    unless relinquish_others is False, then the ones reserved by others fail the transaction.
+
+    .. code-block:: python
+
+        async with ReservationTransaction(port_a, port_b, port_c):
+            ...
+    """
+
+    __slots__ = ("managers", "relinquish_others", "timeout", "__taken")
+
+    def __init__(self, *managers: ReserveMixin, relinquish_others: bool = False, timeout: float = RESERVATION_TIMEOUT) -> None:
+        self.managers: Sequence[ReserveMixin] = managers
+        self.relinquish_others = relinquish_others
+        """Take the resources reserved by others, otherwise fail without reserving any"""
+        self.timeout = timeout
+        self.__taken: List[ReserveMixin] = []
+
+    async def __aenter__(self) -> "ReservationTransaction":
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *_: Any) -> None:
+        await self.release()
+
+    @property
+    def taken(self) -> Sequence[ReserveMixin]:
+        """Managers of the resources reserved by the transaction."""
+        return tuple(self.__taken)
+
+    def __planner(self) -> ReservationPlanner:
+        return ReservationPlanner(timeout=self.timeout)
+
+    async def __reserve(self, manager: ReserveMixin) -> None:
+        resource = manager.resource_instance
+        watcher = get_watcher(resource)
+        if watcher.status == ReservedStatus.RESERVED_BY_YOU:
+            return None
+        # Recorded first, a reservation which timed out may still be granted and must be rolled back
+        self.__taken.append(manager)
+        await self.__planner().reserve(resource, self.relinquish_others)
+        await watcher.wait_for(ReservedStatus.RESERVED_BY_YOU, self.timeout)
+
+    async def acquire(self) -> None:
+        """Reserve all the resources, or none of them.
+
+        :raises ResourcesReservedByOthersError: some resources or their sub resources are reserved by others and relinquish_others is False
+        :raises ReservationTimeoutError: a reservation did not change in time
+        """
+        if not self.relinquish_others:
+            planner = self.__planner()
+            reserved = [
+                describe_resource(resource)
+                for manager in self.managers
+                for resource in planner.reserved_by_others(manager.resource_instance)
+            ]
+            if reserved:
+                raise ResourcesReservedByOthersError(reserved)
+
+        levels: Dict[int, List[ReserveMixin]] = {}
+        for manager in self.managers:
+            levels.setdefault(_level(manager), []).append(manager)
+        for level in sorted(levels):
+            results = await asyncio.gather(*(self.__reserve(manager) for manager in levels[level]), return_exceptions=True)
+            if error := next((result for result in results if isinstance(result, BaseException)), None):
+                # The cached statuses may not show a reservation granted after its timeout yet
+                await self.__release(read=True)
+                raise error
+
+    async def __release(self, read: bool) -> None:
+        taken, self.__taken = self.__taken, []
+        planner = self.__planner()
+
+        async def release(resource: TypeResouces) -> None:
+            if read:
+                await planner.execute(await planner.plan_release(resource))
+            else:
+                await planner.release(resource)
+
+        levels: Dict[int, List[ReserveMixin]] = {}
+        for manager in taken:
+            levels.setdefault(_level(manager), []).append(manager)
+        error: Optional[BaseException] = None
+        for level in sorted(levels, reverse=True):
+            results = await asyncio.gather(*(release(manager.resource_instance) for manager in levels[level]), return_exceptions=True)
+            error = error or next((result for result in results if isinstance(result, BaseException)), None)
+        if error:
+            raise error
+
+    async def release(self) -> None:
+        """Release the resources reserved by the transaction, ports first."""
+        await self.__release(read=False)
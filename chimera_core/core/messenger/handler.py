@@ -1,4 +1,5 @@
 import asyncio
+import time
 import uuid
 import contextlib
 from typing import (
@@ -12,7 +13,9 @@ from typing import (
 from loguru import logger
 
 from chimera_core.core.utils import observer
+from chimera_core.core import const
 from .pipe import MesagesPipe
+from .metrics import MessengerMetricsModel
 from . import misc
 
 
@@ -25,12 +28,13 @@ async def _get_from_queue(queue: "asyncio.Queue[Optional[misc.Message]]") -> Asy
             queue.task_done()
 
 class OutMessagesHandler:
-    __slots__ = ("__pipes", "__senders", "__observer", )
+    __slots__ = ("__pipes", "__senders", "__observer", "__reporter", )
 
     def __init__(self) -> None:
         self.__pipes: Dict[str, MesagesPipe] = dict()
         self.__observer = observer.SimpleObserver()
         self.__observer.subscribe(misc.DISABLED, self.__on_pipe_disabled)
+        self.__reporter: Optional["asyncio.Task"] = None
 
     def get_pipe(self, name: str) -> "MesagesPipe":
         if name in self.__pipes:
@@ -52,10 +56,39 @@ class OutMessagesHandler:
     async def __on_pipe_disabled(self, name: str) -> None:
         del self.__pipes[name]
 
+    def get_metrics(self) -> MessengerMetricsModel:
+        """Queue depth, delivery lag and throughput of every available pipe."""
+        return MessengerMetricsModel(
+            timestamp=time.time(),
+            pipes=[pipe.get_metrics() for pipe in self.__pipes.values()],
+        )
+
+    async def __report_metrics(self, pipe: "MesagesPipe", interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            pipe.transmit(self.get_metrics(), msg_type=misc.EMsgType.STATISTICS)
+
+    def start_metrics_reporting(self, interval: float = 1.0) -> None:
+        """Periodically publish the messenger metrics as STATISTICS messages of the MESSENGER pipe."""
+        if self.__reporter:
+            return None
+        self.__reporter = asyncio.create_task(
+            self.__report_metrics(self.get_pipe(const.PIPE_MESSENGER), interval),
+            name="OutMessagesHandler[metrics]"
+        )
+
+    async def stop_metrics_reporting(self) -> None:
+        if not self.__reporter:
+            return None
+        self.__reporter.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self.__reporter
+        self.__reporter = None
+
     @contextlib.asynccontextmanager
     async def __user_stream(self, queue: "asyncio.Queue[Optional[misc.Message]]", *names: str) -> AsyncGenerator[None, None]:
         key = str(uuid.uuid4())
-        pipes = (self.__pipes[name] for name in names)
+        pipes = [self.__pipes[name] for name in names]
         await asyncio.gather(*[pipe._add_stream(key, queue) for pipe in pipes])
         try:
             yield
@@ -70,6 +103,8 @@ class OutMessagesHandler:
             async for msg in _get_from_queue(msg_queue):
                 logger.debug(msg)
                 if msg is None: break
+                if pipe := self.__pipes.get(msg.pipe_name):
+                    pipe._on_delivered(msg)
                 if _filter and msg.type not in _filter:
                     continue
                 yield msg
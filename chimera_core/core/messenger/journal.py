@@ -0,0 +1,283 @@
+import asyncio
+import bisect
+import contextlib
+import dataclasses
+import json
+import os
+import struct
+from enum import Enum
+from functools import partial
+from typing import (
+    Any,
+    BinaryIO,
+    Generator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from loguru import logger
+from pydantic import BaseModel
+
+from chimera_core.core.generic_types import TMessagesHandler
+from . import misc
+
+
+__all__ = ("MessagesJournal", "JournalReader")
+
+RECORD_HEADER = struct.Struct("<dI")
+"""Record header: message timestamp, length of the encoded message."""
+
+INDEX_ENTRY = struct.Struct("<dQ")
+"""Sparse index entry: timestamp of the first message of a batch, offset of the batch in the segment."""
+
+SEGMENT_EXT = ".log"
+INDEX_EXT = ".idx"
+
+
+def _encode_default(obj: Any) -> Any:
+    if isinstance(obj, BaseModel):
+        return obj.model_dump() if hasattr(obj, "model_dump") else obj.dict()
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (set, frozenset, tuple)):
+        return list(obj)
+    return str(obj)
+
+
+def _encode(msg: misc.Message) -> bytes:
+    return json.dumps(
+        {
+            "pipe_name": msg.pipe_name,
+            "destenation": msg.destenation,
+            "type": msg.type.value,
+            "timestamp": msg.timestamp,
+            "payload": msg.payload,
+        },
+        default=_encode_default,
+    ).encode("utf-8")
+
+
+def _decode(data: bytes) -> misc.Message:
+    return misc.Message(**json.loads(data))
+
+
+def _segment_ids(path: str) -> List[int]:
+    return sorted(
+        int(name[:-len(SEGMENT_EXT)])
+        for name in os.listdir(path)
+        if name.endswith(SEGMENT_EXT) and name[:-len(SEGMENT_EXT)].isdigit()
+    )
+
+
+def _segment_path(path: str, segment_id: int, ext: str) -> str:
+    return os.path.join(path, f"{segment_id:08d}{ext}")
+
+
+class _SegmentWriter:
+    """Blocking part of the journal, always called from the executor."""
+
+    __slots__ = ("path", "segment_size", "max_segments", "__segment_id", "__log", "__idx", "__size")
+
+    def __init__(self, path: str, segment_size: int, max_segments: int) -> None:
+        self.path = path
+        self.segment_size = segment_size
+        self.max_segments = max_segments
+        self.__segment_id = 0
+        self.__log: Optional[BinaryIO] = None
+        self.__idx: Optional[BinaryIO] = None
+        self.__size = 0
+
+    def open(self) -> None:
+        os.makedirs(self.path, exist_ok=True)
+        # A new segment on every start, a previous run could end with a partially written record
+        self.__segment_id = max(_segment_ids(self.path), default=0) + 1
+        self.__open_segment()
+
+    def __open_segment(self) -> None:
+        self.__log = open(_segment_path(self.path, self.__segment_id, SEGMENT_EXT), "ab")
+        self.__idx = open(_segment_path(self.path, self.__segment_id, INDEX_EXT), "ab")
+        self.__size = self.__log.tell()
+
+    def __rotate(self) -> None:
+        self.close()
+        self.__segment_id += 1
+        self.__open_segment()
+        for segment_id in _segment_ids(self.path)[:-self.max_segments]:
+            for ext in (SEGMENT_EXT, INDEX_EXT):
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(_segment_path(self.path, segment_id, ext))
+
+    def write(self, messages: List[misc.Message]) -> None:
+        assert self.__log and self.__idx, "Journal is not opened"
+        indexed = False
+        for msg in messages:
+            if self.__size >= self.segment_size:
+                self.__rotate()
+                indexed = False
+            if not indexed:
+                self.__idx.write(INDEX_ENTRY.pack(msg.timestamp, self.__size))
+                indexed = True
+            data = _encode(msg)
+            self.__log.write(RECORD_HEADER.pack(msg.timestamp, len(data)))
+            self.__log.write(data)
+            self.__size += RECORD_HEADER.size + len(data)
+        self.__log.flush()
+        self.__idx.flush()
+
+    def close(self) -> None:
+        for file in (self.__log, self.__idx):
+            if file:
+                file.close()
+        self.__log = self.__idx = None
+
+
+class MessagesJournal:
+    """Append-only, segment rotated journal of the messages published by the messenger pipes.
+
+    Messages are collected on the event loop and written in batches by the executor,
+    so journaling does not delay the delivery to other subscribers.
+    """
+
+    __slots__ = ("__handler", "__names", "__writer", "__buffer", "__flush_interval", "__consumer", "__flusher")
+
+    def __init__(
+        self,
+        handler: TMessagesHandler,
+        path: str,
+        *names: str,
+        segment_size: int = 64 * 1024 * 1024,
+        max_segments: int = 16,
+        flush_interval: float = 0.5,
+    ) -> None:
+        self.__handler = handler
+        self.__names = names
+        self.__writer = _SegmentWriter(path, segment_size, max_segments)
+        self.__buffer: List[misc.Message] = []
+        self.__flush_interval = flush_interval
+        self.__consumer: Optional["asyncio.Task"] = None
+        self.__flusher: Optional["asyncio.Task"] = None
+
+    async def __run(self, func: partial) -> None:
+        await asyncio.get_running_loop().run_in_executor(None, func)
+
+    async def __consume(self) -> None:
+        async for msg in self.__handler.changes(*self.__names):
+            self.__buffer.append(msg)
+
+    async def __flush(self) -> None:
+        if not self.__buffer:
+            return None
+        batch, self.__buffer = self.__buffer, []
+        try:
+            await self.__run(partial(self.__writer.write, batch))
+        except OSError:
+            # Kept to be written by the next flush, the messages written before the failure are journaled twice
+            self.__buffer = batch + self.__buffer
+            raise
+
+    async def __flush_periodically(self) -> None:
+        while True:
+            await asyncio.sleep(self.__flush_interval)
+            try:
+                await self.__flush()
+            except OSError as e:
+                logger.error(f"Messages journal write failed, {len(self.__buffer)} messages kept to retry: {e}")
+
+    async def start(self) -> None:
+        if self.__consumer:
+            return None
+        await self.__run(partial(self.__writer.open))
+        for name in self.__names:
+            self.__handler.get_pipe(name)
+        self.__consumer = asyncio.create_task(self.__consume(), name="MessagesJournal[consumer]")
+        self.__flusher = asyncio.create_task(self.__flush_periodically(), name="MessagesJournal[flusher]")
+
+    async def stop(self) -> None:
+        """Stop journaling and write the remaining messages.
+
+        :raises OSError: the remaining messages couldn't be written
+        """
+        if not self.__consumer or not self.__flusher:
+            return None
+        for task in (self.__consumer, self.__flusher):
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await task
+        self.__consumer = self.__flusher = None
+        try:
+            await self.__flush()
+        finally:
+            await self.__run(partial(self.__writer.close))
+
+
+class JournalReader:
+    """Stream the journaled messages of a time range back as ``Message`` objects."""
+
+    __slots__ = ("path",)
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+
+    def __read_index(self, segment_id: int) -> List[Tuple[float, int]]:
+        try:
+            with open(_segment_path(self.path, segment_id, INDEX_EXT), "rb") as idx:
+                data = idx.read()
+        except FileNotFoundError:
+            return []
+        usable = len(data) - len(data) % INDEX_ENTRY.size
+        return list(INDEX_ENTRY.iter_unpack(data[:usable]))
+
+    def __read_segment(self, segment_id: int, begin: int, end: Optional[int]) -> Generator[Tuple[float, bytes], None, None]:
+        with open(_segment_path(self.path, segment_id, SEGMENT_EXT), "rb") as log:
+            log.seek(begin)
+            while end is None or log.tell() < end:
+                header = log.read(RECORD_HEADER.size)
+                if len(header) < RECORD_HEADER.size:
+                    return
+                timestamp, length = RECORD_HEADER.unpack(header)
+                data = log.read(length)
+                if len(data) < length:
+                    return  # The record was not completely written
+                yield timestamp, data
+
+    def read(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        names: Optional[Set[str]] = None,
+    ) -> Generator[misc.Message, None, None]:
+        """Read the messages with timestamp between start and end (both included).
+
+        :param start: unix timestamp of the first message, defaults to the beginning of the journal
+        :type start: Optional[float], optional
+        :param end: unix timestamp of the last message, defaults to the end of the journal
+        :type end: Optional[float], optional
+        :param names: read only the messages of these pipes, defaults to all pipes
+        :type names: Optional[Set[str]], optional
+        """
+        segment_ids = _segment_ids(self.path)
+        indexes = [self.__read_index(segment_id) for segment_id in segment_ids]
+        for pos, (segment_id, index) in enumerate(zip(segment_ids, indexes)):
+            if not index:
+                continue
+            if end is not None and index[0][0] > end:
+                break
+            next_index = next((i for i in indexes[pos + 1:] if i), None)
+            if start is not None and next_index and next_index[0][0] <= start:
+                continue
+            timestamps = [entry[0] for entry in index]
+            # Timestamps are ordered per batch only, so the batch before the range is read as well
+            first = max(bisect.bisect_left(timestamps, start) - 1, 0) if start is not None else 0
+            last = bisect.bisect_right(timestamps, end) if end is not None else len(index)
+            stop_offset = index[last][1] if last < len(index) else None
+            for timestamp, data in self.__read_segment(segment_id, index[first][1], stop_offset):
+                if (start is not None and timestamp < start) or (end is not None and timestamp > end):
+                    continue
+                msg = _decode(data)
+                if names and msg.pipe_name not in names:
+                    continue
+                yield msg
@@ -0,0 +1,141 @@
+import bisect
+import collections
+import time
+from typing import (
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+)
+
+from pydantic import BaseModel
+
+from .misc import EMsgType
+
+
+LAG_BUCKETS: Tuple[float, ...] = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+"""Upper bounds (seconds) of the delivery lag histogram buckets, the last bucket is unbounded."""
+
+THROUGHPUT_WINDOW = 10
+"""Size of the sliding window (seconds) used for the throughput calculation."""
+
+
+class LagHistogramModel(BaseModel):
+    bounds: Tuple[float, ...]
+    counts: Tuple[int, ...]
+    count: int
+    total: float
+    max: float
+
+
+class SubscriberMetricsModel(BaseModel):
+    key: str
+    queue_depth: int
+
+
+class PipeMetricsModel(BaseModel):
+    name: str
+    queue_depth: int
+    transmitted: int
+    delivered: int
+    transmit_rate: float
+    delivery_rate: float
+    per_type: Dict[str, int]
+    lag: LagHistogramModel
+    subscribers: List[SubscriberMetricsModel]
+
+
+class MessengerMetricsModel(BaseModel):
+    timestamp: float
+    pipes: List[PipeMetricsModel]
+
+
+class LagHistogram:
+    """Fixed buckets histogram of the time between transmit and delivery to a subscriber."""
+
+    __slots__ = ("__bounds", "__counts", "__count", "__total", "__max")
+
+    def __init__(self, bounds: Tuple[float, ...] = LAG_BUCKETS) -> None:
+        self.__bounds = bounds
+        self.__counts = [0] * (len(bounds) + 1)
+        self.__count = 0
+        self.__total = 0.0
+        self.__max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.__counts[bisect.bisect_left(self.__bounds, value)] += 1
+        self.__count += 1
+        self.__total += value
+        if value > self.__max:
+            self.__max = value
+
+    def to_model(self) -> LagHistogramModel:
+        return LagHistogramModel(
+            bounds=self.__bounds,
+            counts=tuple(self.__counts),
+            count=self.__count,
+            total=self.__total,
+            max=self.__max,
+        )
+
+
+class RateMeter:
+    """Events per second over a sliding window of one second slots."""
+
+    __slots__ = ("__window", "__slots")
+
+    def __init__(self, window: int = THROUGHPUT_WINDOW) -> None:
+        self.__window = window
+        self.__slots: Deque[List[int]] = collections.deque(maxlen=window)
+
+    def mark(self) -> None:
+        now = int(time.monotonic())
+        if self.__slots and self.__slots[-1][0] == now:
+            self.__slots[-1][1] += 1
+        else:
+            self.__slots.append([now, 1])
+
+    def rate(self) -> float:
+        oldest = int(time.monotonic()) - self.__window
+        return sum(count for second, count in self.__slots if second > oldest) / self.__window
+
+
+class PipeMetrics:
+    """Counters collected by a single messages pipe."""
+
+    __slots__ = ("transmitted", "delivered", "per_type", "lag", "__transmit_rate", "__delivery_rate")
+
+    def __init__(self) -> None:
+        self.transmitted = 0
+        self.delivered = 0
+        self.per_type: Dict[EMsgType, int] = collections.defaultdict(int)
+        self.lag = LagHistogram()
+        self.__transmit_rate = RateMeter()
+        self.__delivery_rate = RateMeter()
+
+    def on_transmit(self, msg_type: EMsgType) -> None:
+        self.transmitted += 1
+        self.per_type[msg_type] += 1
+        self.__transmit_rate.mark()
+
+    def on_delivered(self, lag: float) -> None:
+        self.delivered += 1
+        self.lag.observe(lag)
+        self.__delivery_rate.mark()
+
+    def to_model(self, name: str, queue_depth: int, subscribers: Optional[Dict[str, int]] = None) -> PipeMetricsModel:
+        return PipeMetricsModel(
+            name=name,
+            queue_depth=queue_depth,
+            transmitted=self.transmitted,
+            delivered=self.delivered,
+            transmit_rate=self.__transmit_rate.rate(),
+            delivery_rate=self.__delivery_rate.rate(),
+            per_type={msg_type.value: count for msg_type, count in self.per_type.items()},
+            lag=self.lag.to_model(),
+            subscribers=[
+                SubscriberMetricsModel(key=key, queue_depth=depth)
+                for key, depth in (subscribers or {}).items()
+            ],
+        )
@@ -6,8 +6,9 @@ from typing import (
     Union
 )
 from enum import Enum
+import time
 import typing
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 DISABLED = 1
 
@@ -24,6 +25,7 @@ class Message(BaseModel):
     destenation: Optional[str] = None
     type: EMsgType = EMsgType.DATA
     payload: Any
+    timestamp: float = Field(default_factory=time.time)
 
 
 class StatePayload(BaseModel):
@@ -1,5 +1,6 @@
 import asyncio
 import contextlib
+import time
 from functools import partialmethod
 from typing import (
     Any,
@@ -10,12 +11,13 @@ from typing import (
 
 from chimera_core.core.generic_types import TObserver
 from . import misc
+from .metrics import PipeMetrics, PipeMetricsModel
 
 from loguru import logger
 
 
 class MesagesPipe:
-    __slots__ = ("name", "__evt", "__queue", "__observer", "__push_streams", "__lock", "__procesor")
+    __slots__ = ("name", "__evt", "__queue", "__observer", "__push_streams", "__lock", "__procesor", "__metrics")
 
     def __init__(self, name: str, observer: "TObserver") -> None:
         self.name: Final[str] = name
@@ -24,6 +26,7 @@ class MesagesPipe:
         self.__observer = observer
         self.__lock = asyncio.Lock()
         self.__push_streams: Dict[str, asyncio.Queue[Optional["misc.Message"]]] = {}
+        self.__metrics = PipeMetrics()
         self.__procesor = asyncio.create_task(
             self.__worker(),
             name=f"MessagesPipe[{self.name}]"
@@ -71,6 +74,18 @@ class MesagesPipe:
         )
         # logger.debug(message)
         self.__queue.put_nowait(message)
+        self.__metrics.on_transmit(msg_type)
+
+    def _on_delivered(self, msg: misc.Message) -> None:
+        """Register the message was received by one of the subscribers"""
+        self.__metrics.on_delivered(time.time() - msg.timestamp)
+
+    def get_metrics(self) -> PipeMetricsModel:
+        return self.__metrics.to_model(
+            self.name,
+            self.__queue.qsize(),
+            {key: stm.qsize() for key, stm in self.__push_streams.items()},
+        )
 
     def get_facade(self) -> misc.PipeFacade:
         return misc.PipeFacade(self.transmit)
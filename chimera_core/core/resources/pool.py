@@ -109,7 +109,7 @@ class ResourcesPool:
         """Exclude the Resource from the pool and stop propagate changes"""
         if resource := self.__resources.pop(id, None):
             self.__optimize()
-            resource.events.reset()
+            await resource.close()
             await self.__publish_message(resource.info(), const.REMOVED)
             return resource
         raise UnknownResourceError(id)
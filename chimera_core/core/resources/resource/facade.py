@@ -50,7 +50,7 @@ class Resource:
     __slots__ = ("tester", "dataset", "__observer")
 
     def __init__(self, credentials: misc.Credentials, *, name: str | None = None, keep_disconnected: bool | None = None) -> None:
-        self.__observer: SimpleObserver[str] = SimpleObserver(pass_event=True)
+        self.__observer: SimpleObserver[str] = SimpleObserver(pass_event=True, ordered=True)
         self.dataset = TesterModel(
             id=misc.make_resource_id(credentials.host, credentials.port),
             product=credentials.product,
@@ -150,6 +150,11 @@ class Resource:
     def info(self) -> TesterInfoModel:
         return TesterInfoModel.parse_obj(asdict(self.dataset))
 
+    async def close(self) -> None:
+        """Unsubscribe all the callbacks and stop dispatching the events of the resource."""
+        self.__observer.reset()
+        await self.__observer.close()
+
     @property
     def events(self) -> Events:
         return Events(self.__observer)
@@ -0,0 +1,252 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+
+IMPAIRMENT_COUNTERS: Tuple[str, ...] = (
+    "dropped_total",
+    "dropped_programmed",
+    "dropped_bandwidth",
+    "dropped_other",
+    "corrupted_total",
+    "corrupted_fcs",
+    "corrupted_ip",
+    "corrupted_udp",
+    "corrupted_tcp",
+    "delayed",
+    "jittered",
+    "duplicated",
+    "misordered",
+)
+"""Cumulative impairment counters, reported for ports and for flows."""
+
+PORT_COUNTERS: Tuple[str, ...] = IMPAIRMENT_COUNTERS
+"""Cumulative counters of a port."""
+
+FLOW_COUNTERS: Tuple[str, ...] = (
+    "rx_packets",
+    "rx_bytes",
+    "tx_packets",
+    "tx_bytes",
+) + IMPAIRMENT_COUNTERS
+"""Cumulative counters of a flow."""
+
+
+class FlowStatistics(BaseModel):
+    flow: int
+    """Flow index"""
+    counters: Dict[str, int]
+    """Counters values, keyed by the names of ``FLOW_COUNTERS``"""
+
+
+class PortStatistics(BaseModel):
+    port: str
+    """Name of the port given to the collector"""
+    module_id: int
+    port_id: int
+    counters: Dict[str, int]
+    """Counters values, keyed by the names of ``PORT_COUNTERS``"""
+    flows: List[FlowStatistics]
+    sent_at: float
+    """Unix time when the commands of the port were sent"""
+    received_at: float
+    """Unix time when the last response of the port was received"""
+
+    @property
+    def sampled_at(self) -> float:
+        """Best estimate of the time the counters were read, at most half of the round trip away."""
+        return (self.sent_at + self.received_at) / 2
+
+
+class FlowDerived(BaseModel):
+    flow: int
+    interval: float
+    """Seconds elapsed since the previous sample of the flow"""
+    rates: Dict[str, float]
+    """Per second rates of the flow counters, and the ``rx_bps``/``tx_bps`` bit rates"""
+    ratios: Dict[str, float]
+    """Observed impairment ratios, keyed by the names of ``derived.IMPAIRMENT_RATIOS``"""
+    expected: Dict[str, float]
+    """Configured impairment ratios, only of the ones set with ``derived.DerivedStatistics.expect``"""
+
+
+class PortDerived(BaseModel):
+    port: str
+    interval: float
+    """Seconds elapsed since the previous sample of the port"""
+    rates: Dict[str, float]
+    """Per second rates of the port counters"""
+    flows: List[FlowDerived]
+
+
+class DerivedSnapshot(BaseModel):
+    interval: float
+    """Seconds elapsed since the previous round"""
+    ports: List[PortDerived]
+
+
+class StatisticsSnapshot(BaseModel):
+    round: int
+    """Sequence number of the collection round"""
+    timestamp: float
+    """Unix time when the statistics were requested"""
+    ports: List[PortStatistics]
+    skew: float = 0.0
+    """Upper bound of the time between the readings of any two ports, in seconds"""
+    derived: Optional[DerivedSnapshot] = None
+    """Rates and ratios since the previous round, None for the first one"""
+
+
+def impairment_counters(dropped: Any, corrupted: Any, delayed: Any, jittered: Any, duplicated: Any, misordered: Any) -> Dict[str, int]:
+    """Flatten the responses of the total impairment statistics commands."""
+    return {
+        "dropped_total": dropped.pkt_drop_count_total,
+        "dropped_programmed": dropped.pkt_drop_count_programmed,
+        "dropped_bandwidth": dropped.pkt_drop_count_bandwidth,
+        "dropped_other": dropped.pkt_drop_count_other,
+        "corrupted_total": corrupted.total_corrupted_pkt_count,
+        "corrupted_fcs": corrupted.fcs_corrupted_pkt_count,
+        "corrupted_ip": corrupted.ip_corrupted_pkt_count,
+        "corrupted_udp": corrupted.udp_corrupted_pkt_count,
+        "corrupted_tcp": corrupted.tcp_corrupted_pkt_count,
+        "delayed": delayed.pkt_count,
+        "jittered": jittered.pkt_count,
+        "duplicated": duplicated.pkt_count,
+        "misordered": misordered.pkt_count,
+    }
+
+
+class CountersDelta(BaseModel):
+    port: str
+    flow: Optional[int]
+    """Index of the flow, None for the port totals"""
+    counters: Dict[str, int]
+
+
+class BaselineDeltas(BaseModel):
+    name: str
+    """Name of the checkpoint"""
+    since: float
+    """Unix time of the checkpoint"""
+    timestamp: float
+    """Unix time of the latest snapshot"""
+    deltas: List[CountersDelta]
+
+
+@dataclass
+class ThresholdRule:
+    """Alert when a metric is above or below a limit.
+
+    Metrics are named ``counters.<name>``, ``rates.<name>`` or ``ratios.<name>``, e.g. ``rates.tx_packets``.
+    """
+
+    name: str
+    metric: str
+    above: Optional[float] = None
+    below: Optional[float] = None
+    port: Optional[str] = None
+    """Name of the port, defaults to all the ports"""
+    flow: Optional[int] = None
+    """Index of the flow, defaults to all the flows"""
+    totals: bool = False
+    """Evaluate the port totals instead of the flows"""
+    rounds: int = 1
+    """Consecutive violating rounds before alerting"""
+    cooldown: float = 0.0
+    """Seconds without a new alert of the same port or flow after alerting"""
+
+
+@dataclass
+class RateOfChangeRule:
+    """Alert when a metric changes faster than a limit, in units per second."""
+
+    name: str
+    metric: str
+    max_increase: Optional[float] = None
+    max_decrease: Optional[float] = None
+    port: Optional[str] = None
+    flow: Optional[int] = None
+    totals: bool = False
+    rounds: int = 1
+    cooldown: float = 0.0
+
+
+@dataclass
+class DeviationRule:
+    """Alert when the observed ratio of an impairment deviates from the configured probability of the flow.
+
+    The tolerance is ``sigmas`` standard deviations of the binomial ratio over the received packets of the round.
+    """
+
+    name: str
+    impairment: str = "drop"
+    """Name of the ratio, see ``derived.IMPAIRMENT_RATIOS``"""
+    sigmas: float = 3.0
+    min_packets: int = 1000
+    """Rounds with fewer received packets are not evaluated"""
+    port: Optional[str] = None
+    flow: Optional[int] = None
+    rounds: int = 1
+    cooldown: float = 0.0
+
+
+class Alert(BaseModel):
+    rule: str
+    port: str
+    flow: Optional[int]
+    """Index of the flow, None for the port totals"""
+    value: float
+    message: str
+    timestamp: float
+
+
+class ImpairmentEffectiveness(BaseModel):
+    impairment: str
+    distribution: str
+    """Name of the configured distribution class"""
+    expected: float
+    """Expected ratio of impaired packets, scaled by the duty cycle of the schedule"""
+    observed: float
+    lower: float
+    """Lower bound of the confidence interval of the observed ratio"""
+    upper: float
+    packets: int
+    """Packets received by the flow"""
+    impaired: int
+    passed: Optional[bool]
+    """None when too few packets were received to decide"""
+
+
+class FlowEffectiveness(BaseModel):
+    port: str
+    flow: int
+    passed: Optional[bool]
+    """False if any impairment failed, None if none could be decided"""
+    impairments: List[ImpairmentEffectiveness]
+
+
+class EffectivenessReport(BaseModel):
+    timestamp: float
+    flows: List[FlowEffectiveness]
+
+
+class SketchModel(BaseModel):
+    """Serialized quantile sketch, to be merged with the ones of other processes."""
+
+    relative_accuracy: float
+    count: int
+    zeros: int
+    minimum: float
+    maximum: float
+    total: float
+    buckets: Dict[int, int]
+
+
+class QuantilesSummary(BaseModel):
+    count: int
+    minimum: float
+    maximum: float
+    mean: float
+    quantiles: Dict[str, float]
+    """Values keyed by ``p<percent>``, e.g. ``p99``"""
@@ -0,0 +1,193 @@
+import math
+from typing import (
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from chimera_core.core.generic_types import TMesagesPipe
+from chimera_core.core.utils.observer import SimpleObserver, CB
+from .__dataset import (
+    Alert,
+    DeviationRule,
+    RateOfChangeRule,
+    StatisticsSnapshot,
+    ThresholdRule,
+)
+from .derived import IMPAIRMENT_RATIOS
+from .exception import StatisticsAlertWarning
+
+
+ALERT = "ALERT"
+
+Rule = Union[ThresholdRule, RateOfChangeRule, DeviationRule]
+TargetKey = Tuple[str, Optional[int]]
+
+
+class _Target:
+    """Metrics of a port or flow in one snapshot, flattened as ``<group>.<name>``."""
+
+    __slots__ = ("timestamp", "metrics", "expected", "received")
+
+    def __init__(self, timestamp: float) -> None:
+        self.timestamp = timestamp
+        self.metrics: Dict[str, float] = {}
+        self.expected: Dict[str, float] = {}
+        self.received = 0.0
+        """Packets received by the flow since its previous sample"""
+
+    def update(self, group: str, values: Dict[str, float]) -> None:
+        self.metrics.update({f"{group}.{name}": value for name, value in values.items()})
+
+
+def _targets(snapshot: StatisticsSnapshot) -> Dict[TargetKey, _Target]:
+    targets: Dict[TargetKey, _Target] = {}
+    for port in snapshot.ports:
+        targets[(port.port, None)] = target = _Target(port.sampled_at)
+        target.update("counters", port.counters)
+        for flow in port.flows:
+            targets[(port.port, flow.flow)] = target = _Target(port.sampled_at)
+            target.update("counters", flow.counters)
+    for port_derived in snapshot.derived.ports if snapshot.derived else ():
+        if target := targets.get((port_derived.port, None)):
+            target.update("rates", port_derived.rates)
+        for flow_derived in port_derived.flows:
+            if target := targets.get((port_derived.port, flow_derived.flow)):
+                target.update("rates", flow_derived.rates)
+                target.update("ratios", flow_derived.ratios)
+                target.expected = flow_derived.expected
+                target.received = flow_derived.rates["rx_packets"] * flow_derived.interval
+    return targets
+
+
+class _RuleState:
+    __slots__ = ("violations", "alerted_at", "previous")
+
+    def __init__(self) -> None:
+        self.violations = 0
+        self.alerted_at: Optional[float] = None
+        self.previous: Optional[Tuple[float, float]] = None
+        """Timestamp and value of the previous evaluation, for the rate of change"""
+
+
+class AlertEngine:
+    """Evaluate the alerting rules against every statistics snapshot and publish the alerts as warnings.
+
+    A port or flow is alerted once it violates a rule for ``rule.rounds`` consecutive snapshots,
+    and again only after it stopped violating it and ``rule.cooldown`` seconds passed.
+    """
+
+    __slots__ = ("__pipe", "__rules", "__states", "__observer")
+
+    def __init__(self, pipe: TMesagesPipe) -> None:
+        self.__pipe = pipe
+        self.__rules: Dict[str, Rule] = {}
+        self.__states: Dict[Tuple[str, TargetKey], _RuleState] = {}
+        self.__observer: SimpleObserver[str] = SimpleObserver(ordered=True)
+
+    @property
+    def rules(self) -> Tuple[Rule, ...]:
+        return tuple(self.__rules.values())
+
+    def add_rule(self, rule: Rule) -> None:
+        """Add or replace the rule of the same name.
+
+        :param rule: the alerting rule
+        :type rule: Union[ThresholdRule, RateOfChangeRule, DeviationRule]
+        """
+        if isinstance(rule, DeviationRule) and rule.impairment not in IMPAIRMENT_RATIOS:
+            raise KeyError(f"Unknown impairment {rule.impairment!r}, expected one of {tuple(IMPAIRMENT_RATIOS)}")
+        if rule.rounds < 1:
+            raise ValueError("Rounds must be at least 1.")
+        self.remove_rule(rule.name)
+        self.__rules[rule.name] = rule
+
+    def remove_rule(self, name: str) -> None:
+        self.__rules.pop(name, None)
+        for key in [key for key in self.__states if key[0] == name]:
+            del self.__states[key]
+
+    def on_alert(self, func: CB) -> None:
+        """Register a callback called with every published ``Alert``."""
+        self.__observer.subscribe(ALERT, func)
+
+    def __selected(self, rule: Rule, targets: Dict[TargetKey, _Target]) -> Iterator[Tuple[TargetKey, _Target]]:
+        totals = getattr(rule, "totals", False)
+        for key, target in targets.items():
+            port, flow = key
+            if rule.port is not None and port != rule.port:
+                continue
+            if totals != (flow is None):
+                continue
+            if flow is not None and rule.flow is not None and flow != rule.flow:
+                continue
+            yield key, target
+
+    def __check(self, rule: Rule, state: _RuleState, target: _Target) -> Optional[Tuple[bool, float, str]]:
+        """Whether the target violates the rule, with the evaluated value, None if it can't be evaluated."""
+        if isinstance(rule, DeviationRule):
+            probability = target.expected.get(rule.impairment)
+            observed = target.metrics.get(f"ratios.{rule.impairment}")
+            if probability is None or observed is None or target.received < rule.min_packets:
+                return None
+            tolerance = rule.sigmas * math.sqrt(probability * (1 - probability) / target.received)
+            deviation = observed - probability
+            message = f"{rule.impairment} ratio {observed:.6f} deviates from the configured {probability:.6f} by more than {tolerance:.6f}"
+            return abs(deviation) > tolerance, observed, message
+        if (value := target.metrics.get(rule.metric)) is None:
+            return None
+        if isinstance(rule, ThresholdRule):
+            if rule.above is not None and value > rule.above:
+                return True, value, f"{rule.metric} {value:g} above {rule.above:g}"
+            if rule.below is not None and value < rule.below:
+                return True, value, f"{rule.metric} {value:g} below {rule.below:g}"
+            return False, value, ""
+        previous, state.previous = state.previous, (target.timestamp, value)
+        if previous is None or target.timestamp <= previous[0]:
+            return None
+        change = (value - previous[1]) / (target.timestamp - previous[0])
+        if rule.max_increase is not None and change > rule.max_increase:
+            return True, value, f"{rule.metric} increases by {change:g}/s, above {rule.max_increase:g}/s"
+        if rule.max_decrease is not None and -change > rule.max_decrease:
+            return True, value, f"{rule.metric} decreases by {-change:g}/s, above {rule.max_decrease:g}/s"
+        return False, value, ""
+
+    def evaluate(self, snapshot: StatisticsSnapshot) -> List[Alert]:
+        """Evaluate all the rules against a snapshot, publish and return the new alerts, can be subscribed to ``StatisticsCollector.on_snapshot``.
+
+        :param snapshot: statistics of a collection round, with its derived metrics
+        :type snapshot: StatisticsSnapshot
+        :return: the alerts raised by this snapshot
+        :rtype: List[Alert]
+        """
+        if not self.__rules:
+            return []
+        targets = _targets(snapshot)
+        alerts = []
+        for rule in self.__rules.values():
+            for key, target in self.__selected(rule, targets):
+                state = self.__states.setdefault((rule.name, key), _RuleState())
+                if (result := self.__check(rule, state, target)) is None:
+                    continue
+                violated, value, message = result
+                state.violations = state.violations + 1 if violated else 0
+                if state.violations != rule.rounds:
+                    continue
+                if state.alerted_at is not None and target.timestamp - state.alerted_at < rule.cooldown:
+                    continue
+                state.alerted_at = target.timestamp
+                alerts.append(Alert(
+                    rule=rule.name,
+                    port=key[0],
+                    flow=key[1],
+                    value=value,
+                    message=message,
+                    timestamp=target.timestamp,
+                ))
+        for alert in alerts:
+            self.__pipe.get_facade().send_warning(StatisticsAlertWarning(alert))
+            self.__observer.emit(ALERT, alert)
+        return alerts
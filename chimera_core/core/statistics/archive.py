@@ -0,0 +1,267 @@
+import json
+import os
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from urllib.parse import quote
+
+import numpy as np
+
+from .__dataset import (
+    FLOW_COUNTERS,
+    PORT_COUNTERS,
+    StatisticsSnapshot,
+)
+
+
+MAGIC = b"CHSTATS1"
+MANIFEST = "manifest.json"
+
+HEADER = np.dtype([
+    ("magic", "S8"),
+    ("columns", "<u4"),
+    ("index_stride", "<u4"),
+    ("count", "<u8"),
+    ("reserved", "S40"),
+])
+"""Header of a series file, ``count`` is the number of complete records."""
+
+DEFAULT_CHUNK_RECORDS = 65_536
+"""Records the files grow by."""
+
+DEFAULT_INDEX_STRIDE = 1024
+"""Records between two entries of the sparse time index."""
+
+SeriesKey = Tuple[str, Optional[int]]
+
+
+def record_dtype(counters: Sequence[str]) -> np.dtype:
+    return np.dtype([("timestamp", "<f8")] + [(name, "<u8") for name in counters])
+
+
+def series_filename(port: str, flow: Optional[int]) -> str:
+    """Base name of the files of a series, ``.dat`` holds the header and the records, ``.idx`` the sparse index."""
+    return f"{quote(port, safe='')}_{'totals' if flow is None else flow}"
+
+
+class _SeriesWriter:
+    """Append records to a memory-mapped series file, growing it by chunks."""
+
+    __slots__ = ("name", "path", "dtype", "__chunk", "__stride", "__header", "__records", "__index")
+
+    def __init__(self, directory: Path, name: str, counters: Sequence[str], chunk_records: int, index_stride: int) -> None:
+        self.name = name
+        self.path = directory / f"{name}.dat"
+        self.dtype = record_dtype(counters)
+        self.__chunk = chunk_records
+        self.__stride = index_stride
+        if not self.path.exists():
+            with open(self.path, "wb") as f:
+                header = np.zeros(1, dtype=HEADER)
+                header["magic"], header["columns"], header["index_stride"] = MAGIC, len(counters), index_stride
+                f.write(header.tobytes())
+                f.truncate(HEADER.itemsize + self.dtype.itemsize * chunk_records)
+        self.__header = np.memmap(self.path, dtype=HEADER, mode="r+", shape=(1,))
+        if self.__header["magic"][0] != MAGIC or self.__header["columns"][0] != len(counters):
+            raise ValueError(f"{self.path} is not an archive of {len(counters)} counters")
+        self.__stride = int(self.__header["index_stride"][0])
+        self.__records = self.__map()
+        self.__index = open(directory / f"{name}.idx", "ab", buffering=0)
+
+    def __map(self) -> np.memmap:
+        size = os.path.getsize(self.path) - HEADER.itemsize
+        return np.memmap(self.path, dtype=self.dtype, mode="r+", offset=HEADER.itemsize, shape=(size // self.dtype.itemsize,))
+
+    @property
+    def count(self) -> int:
+        return int(self.__header["count"][0])
+
+    def append(self, timestamp: float, values: Sequence[int]) -> None:
+        count = self.count
+        if count == len(self.__records):
+            self.__records.flush()
+            with open(self.path, "r+b") as f:
+                f.truncate(HEADER.itemsize + self.dtype.itemsize * (count + self.__chunk))
+            self.__records = self.__map()
+        self.__records[count] = (timestamp, *values)
+        if count % self.__stride == 0:
+            self.__index.write(np.float64(timestamp).tobytes())
+        # Published last, readers only look at the records below the count
+        self.__header["count"] = count + 1
+
+    def flush(self) -> None:
+        self.__records.flush()
+        self.__header.flush()
+        self.__index.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self.__index.close()
+
+
+class ArchiveWriter:
+    """Append the collected snapshots to a directory of memory-mapped fixed-record files, one file per port and flow.
+
+    Every file holds a header and records of the timestamp and the counters,
+    with a sparse index of the timestamp of every ``index_stride`` record beside it.
+    The files grow by ``chunk_records``, the header count tells the readers how many records are complete.
+    """
+
+    __slots__ = ("path", "__chunk", "__stride", "__series", "__manifest")
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        *,
+        chunk_records: int = DEFAULT_CHUNK_RECORDS,
+        index_stride: int = DEFAULT_INDEX_STRIDE,
+    ) -> None:
+        if chunk_records <= 0 or index_stride <= 0:
+            raise ValueError("Chunk records and index stride must be positive.")
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.__chunk = chunk_records
+        self.__stride = index_stride
+        self.__series: Dict[SeriesKey, _SeriesWriter] = {}
+        self.__manifest: Dict[SeriesKey, Dict[str, Any]] = {}
+        """Series of the archive, also the ones written before reopening it"""
+        if (self.path / MANIFEST).exists():
+            for series in json.loads((self.path / MANIFEST).read_text(encoding="utf-8"))["series"]:
+                self.__manifest[(series["port"], series["flow"])] = series
+
+    def __enter__(self) -> "ArchiveWriter":
+        return self
+
+    def __exit__(self, *_) -> None:
+        self.close()
+
+    def __write_manifest(self) -> None:
+        temporary = self.path / f"{MANIFEST}.tmp"
+        temporary.write_text(json.dumps({"series": list(self.__manifest.values())}), encoding="utf-8")
+        os.replace(temporary, self.path / MANIFEST)
+
+    def __get_writer(self, key: SeriesKey) -> _SeriesWriter:
+        if (writer := self.__series.get(key)) is None:
+            counters = PORT_COUNTERS if key[1] is None else FLOW_COUNTERS
+            writer = self.__series[key] = _SeriesWriter(self.path, series_filename(*key), counters, self.__chunk, self.__stride)
+            if key not in self.__manifest:
+                self.__manifest[key] = {"port": key[0], "flow": key[1], "name": writer.name, "counters": list(counters)}
+                self.__write_manifest()
+        return writer
+
+    def add(self, snapshot: StatisticsSnapshot) -> None:
+        """Append the statistics of a collection round, can be subscribed to ``StatisticsCollector.on_snapshot``."""
+        for port in snapshot.ports:
+            self.__get_writer((port.port, None)).append(port.sampled_at, [port.counters[name] for name in PORT_COUNTERS])
+            for flow in port.flows:
+                self.__get_writer((port.port, flow.flow)).append(port.sampled_at, [flow.counters[name] for name in FLOW_COUNTERS])
+
+    def flush(self) -> None:
+        for writer in self.__series.values():
+            writer.flush()
+
+    def close(self) -> None:
+        for writer in self.__series.values():
+            writer.close()
+        self.__series.clear()
+
+
+class _SeriesReader:
+    __slots__ = ("path", "index_path", "dtype", "__header", "__records")
+
+    def __init__(self, directory: Path, name: str, counters: Sequence[str]) -> None:
+        self.path = directory / f"{name}.dat"
+        self.index_path = directory / f"{name}.idx"
+        self.dtype = record_dtype(counters)
+        self.__header = np.memmap(self.path, dtype=HEADER, mode="r", shape=(1,))
+        self.__records: Optional[np.memmap] = None
+
+    @property
+    def index_stride(self) -> int:
+        return int(self.__header["index_stride"][0])
+
+    def records(self) -> np.ndarray:
+        count = int(self.__header["count"][0])
+        if self.__records is None or len(self.__records) < count:
+            size = os.path.getsize(self.path) - HEADER.itemsize
+            self.__records = np.memmap(self.path, dtype=self.dtype, mode="r", offset=HEADER.itemsize, shape=(size // self.dtype.itemsize,))
+        return self.__records[:count]
+
+    def index(self) -> np.ndarray:
+        return np.fromfile(self.index_path, dtype="<f8")
+
+
+class ArchiveReader:
+    """Read-only, zero-copy views of an archive, also while another process keeps appending to it."""
+
+    __slots__ = ("path", "__series")
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.__series: Dict[SeriesKey, _SeriesReader] = {}
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Discover the series added since the archive was opened."""
+        manifest = json.loads((self.path / MANIFEST).read_text(encoding="utf-8"))
+        for series in manifest["series"]:
+            key = (series["port"], series["flow"])
+            if key not in self.__series:
+                self.__series[key] = _SeriesReader(self.path, series["name"], series["counters"])
+
+    @property
+    def keys(self) -> Tuple[SeriesKey, ...]:
+        return tuple(self.__series)
+
+    def __get_reader(self, port: str, flow: Optional[int]) -> _SeriesReader:
+        try:
+            return self.__series[(port, flow)]
+        except KeyError:
+            raise KeyError(f"No statistics archived for port {port!r} flow {flow}") from None
+
+    def view(self, port: str, flow: Optional[int] = None) -> np.ndarray:
+        """All the complete records of a series, a structured array of the timestamp and the counters.
+
+        :param port: name of the port
+        :type port: str
+        :param flow: index of the flow, defaults to the port totals
+        :type flow: Optional[int], optional
+        :return: records view backed by the file
+        :rtype: np.ndarray
+        """
+        return self.__get_reader(port, flow).records()
+
+    def range(self, port: str, flow: Optional[int] = None, start: Optional[float] = None, end: Optional[float] = None) -> np.ndarray:
+        """Records of a series taken within ``[start, end]``, located with the sparse time index.
+
+        :param port: name of the port
+        :type port: str
+        :param flow: index of the flow, defaults to the port totals
+        :type flow: Optional[int], optional
+        :param start: unix time of the first record, defaults to the oldest one
+        :type start: Optional[float], optional
+        :param end: unix time of the last record, defaults to the newest one
+        :type end: Optional[float], optional
+        :return: records view backed by the file
+        :rtype: np.ndarray
+        """
+        reader = self.__get_reader(port, flow)
+        records = reader.records()
+        index, stride = reader.index(), reader.index_stride
+
+        def locate(timestamp: float, side: str) -> int:
+            block = max(int(np.searchsorted(index, timestamp, side=side)) - 1, 0)
+            begin = block * stride
+            # Records appended after the last index entry are in the last block
+            stop = min((block + 2) * stride, len(records)) if block + 2 < len(index) else len(records)
+            return begin + int(np.searchsorted(records["timestamp"][begin:stop], timestamp, side=side))
+
+        begin = 0 if start is None else locate(start, "left")
+        stop = len(records) if end is None else locate(end, "right")
+        return records[begin:stop]
@@ -0,0 +1,92 @@
+from typing import (
+    Dict,
+    Optional,
+    Tuple,
+)
+
+import numpy as np
+
+from .__dataset import (
+    FLOW_COUNTERS,
+    PORT_COUNTERS,
+    BaselineDeltas,
+    CountersDelta,
+    StatisticsSnapshot,
+)
+from .derived import counter_deltas
+
+
+SeriesKey = Tuple[str, Optional[int]]
+
+
+class StatisticsBaselines:
+    """Named checkpoints of the counters, measuring deltas without clearing the statistics of the tester.
+
+    Every counter is accumulated from the increments between consecutive snapshots,
+    so hardware clears and wraps between two checkpoints do not distort the deltas.
+    """
+
+    __slots__ = ("__timestamp", "__latest", "__totals", "__checkpoints")
+
+    def __init__(self) -> None:
+        self.__timestamp = 0.0
+        self.__latest: Dict[SeriesKey, np.ndarray] = {}
+        """Counters of the latest sample"""
+        self.__totals: Dict[SeriesKey, np.ndarray] = {}
+        """Counters accumulated since the first sample"""
+        self.__checkpoints: Dict[str, Tuple[float, Dict[SeriesKey, np.ndarray]]] = {}
+
+    @property
+    def checkpoints(self) -> Tuple[str, ...]:
+        return tuple(self.__checkpoints)
+
+    def __accumulate(self, key: SeriesKey, counters: Dict[str, int], names: Tuple[str, ...]) -> None:
+        current = np.array([counters[name] for name in names], dtype=np.uint64)
+        if (latest := self.__latest.get(key)) is None:
+            self.__totals[key] = np.zeros(len(names), dtype=np.uint64)
+        else:
+            self.__totals[key] += counter_deltas(latest, current)
+        self.__latest[key] = current
+
+    def add(self, snapshot: StatisticsSnapshot) -> None:
+        """Accumulate the counters of a snapshot, can be subscribed to ``StatisticsCollector.on_snapshot``."""
+        for port in snapshot.ports:
+            self.__accumulate((port.port, None), port.counters, PORT_COUNTERS)
+            for flow in port.flows:
+                self.__accumulate((port.port, flow.flow), flow.counters, FLOW_COUNTERS)
+        self.__timestamp = max(self.__timestamp, snapshot.timestamp)
+
+    def checkpoint(self, name: str) -> float:
+        """Record the counters of the latest snapshot under ``name``, replacing a checkpoint of the same name.
+
+        :param name: name of the checkpoint
+        :type name: str
+        :return: unix time of the checkpoint
+        :rtype: float
+        """
+        self.__checkpoints[name] = (self.__timestamp, {key: totals.copy() for key, totals in self.__totals.items()})
+        return self.__timestamp
+
+    def remove(self, name: str) -> None:
+        self.__checkpoints.pop(name, None)
+
+    def deltas(self, name: str) -> BaselineDeltas:
+        """Increments of the counters since a checkpoint, up to the latest snapshot.
+
+        Ports and flows first seen after the checkpoint are counted from their first sample.
+
+        :param name: name of the checkpoint
+        :type name: str
+        :return: increments of every port and flow
+        :rtype: BaselineDeltas
+        """
+        try:
+            since, baseline = self.__checkpoints[name]
+        except KeyError:
+            raise KeyError(f"Unknown checkpoint {name!r}") from None
+        deltas = []
+        for key, totals in self.__totals.items():
+            names = PORT_COUNTERS if key[1] is None else FLOW_COUNTERS
+            delta = totals - baseline[key] if key in baseline else totals
+            deltas.append(CountersDelta(port=key[0], flow=key[1], counters=dict(zip(names, delta.tolist()))))
+        return BaselineDeltas(name=name, since=since, timestamp=self.__timestamp, deltas=deltas)
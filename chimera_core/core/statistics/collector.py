@@ -0,0 +1,253 @@
+import asyncio
+import contextlib
+import time
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Collection,
+    Dict,
+    Iterable,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+from xoa_driver.v2.misc import Token
+
+from chimera_core.core.generic_types import TMesagesPipe
+from chimera_core.core.utils.observer import SimpleObserver, CB
+from chimera_core.core.utils.tokens import Timing, apply_by_connection_timed
+from .__dataset import (
+    FlowStatistics,
+    PortStatistics,
+    StatisticsSnapshot,
+    impairment_counters,
+)
+
+if TYPE_CHECKING:
+    from xoa_driver.v2.ports import PortChimera
+    from chimera_core.core.manager.port import PortManager
+    from .scheduler import AdaptiveScheduler
+
+
+SNAPSHOT = "SNAPSHOT"
+
+PORT_COMMANDS_COUNT = 6
+FLOW_COMMANDS_COUNT = 8
+
+
+class WatchedPort:
+    __slots__ = ("name", "port", "flows")
+
+    def __init__(self, name: str, port: "PortChimera", flows: Tuple[Tuple[int, Any], ...]) -> None:
+        self.name = name
+        self.port = port
+        self.flows = flows
+        """Pairs of flow index and flow statistics"""
+
+    @property
+    def tester(self) -> int:
+        """Identity of the connection to the tester of the port."""
+        return id(self.port._conn)
+
+    def select(self, flows: Optional[Collection[int]] = None) -> Tuple[Tuple[int, Any], ...]:
+        if flows is None:
+            return self.flows
+        return tuple((index, flow_stats) for index, flow_stats in self.flows if index in flows)
+
+    def commands_count(self, flows: Optional[Collection[int]] = None) -> int:
+        return PORT_COMMANDS_COUNT + FLOW_COMMANDS_COUNT * len(self.select(flows))
+
+    def tokens(self, flows: Optional[Collection[int]] = None) -> List[Token]:
+        stats = self.port.emulation.statistics
+        tokens: List[Token] = [
+            stats.dropped.get(),
+            stats.corrupted.get(),
+            stats.delayed.get(),
+            stats.jittered.get(),
+            stats.duplicated.get(),
+            stats.misordered.get(),
+        ]
+        for _, flow_stats in self.select(flows):
+            tokens.extend((
+                flow_stats.rx.total.get(),
+                flow_stats.tx.total.get(),
+                flow_stats.total.dropped.get(),
+                flow_stats.total.corrupted.get(),
+                flow_stats.total.delayed.get(),
+                flow_stats.total.jittered.get(),
+                flow_stats.total.duplicated.get(),
+                flow_stats.total.misordered.get(),
+            ))
+        return tokens
+
+    def parse(self, responses: Sequence[Any], timings: Sequence[Timing], flows: Optional[Collection[int]] = None) -> PortStatistics:
+        flow_statistics = []
+        for pos, (index, _) in enumerate(self.select(flows)):
+            begin = PORT_COMMANDS_COUNT + pos * FLOW_COMMANDS_COUNT
+            rx, tx, *totals = responses[begin:begin + FLOW_COMMANDS_COUNT]
+            flow_statistics.append(FlowStatistics(
+                flow=index,
+                counters={
+                    "rx_packets": rx.packet_count,
+                    "rx_bytes": rx.byte_count,
+                    "tx_packets": tx.packet_count,
+                    "tx_bytes": tx.byte_count,
+                    **impairment_counters(*totals),
+                },
+            ))
+        return PortStatistics(
+            port=self.name,
+            module_id=self.port.kind.module_id,
+            port_id=self.port.kind.port_id,
+            counters=impairment_counters(*responses[:PORT_COMMANDS_COUNT]),
+            flows=flow_statistics,
+            sent_at=min(sent_at for sent_at, _ in timings),
+            received_at=max(received_at for _, received_at in timings),
+        )
+
+
+class StatisticsCollector:
+    """Poll the statistics of the watched ports and their flows, and publish them on the STATISTICS pipe.
+
+    Every round reads all the counters in one burst of commands per tester, the testers concurrently.
+    Every port records when its commands were sent and its responses received, which bounds the skew of the round.
+
+    The collector only collects, the consumers of the snapshots subscribe to ``on_snapshot``.
+    They are called in the order of subscription, so the ones attaching data to the snapshot come first:
+
+    .. code-block:: python
+
+        derived, alerts = DerivedStatistics(), AlertEngine(collector.pipe)
+        collector.on_snapshot(derived.add)
+        collector.on_snapshot(alerts.evaluate)
+    """
+
+    __slots__ = ("max_skew", "__pipe", "__ports", "__observer", "__round", "__task")
+
+    def __init__(self, pipe: TMesagesPipe) -> None:
+        self.max_skew: Optional[float] = None
+        """Seconds of skew between the ports readings above which a warning is published"""
+        self.__pipe = pipe
+        self.__ports: Dict[str, WatchedPort] = {}
+        self.__observer: SimpleObserver[str] = SimpleObserver(ordered=True)
+        self.__round = 0
+        self.__task: Optional["asyncio.Task"] = None
+
+    def watch(self, port: "PortManager", *, name: Optional[str] = None, flows: Optional[Iterable[int]] = None) -> str:
+        """Add the port to the collected ones.
+
+        :param port: the port manager
+        :type port: PortManager
+        :param name: name of the port in the snapshots, defaults to "<module index>/<port index>"
+        :type name: Optional[str], optional
+        :param flows: indices of the flows to collect, defaults to all flows of the port
+        :type flows: Optional[Iterable[int]], optional
+        :return: name of the port in the snapshots
+        :rtype: str
+        """
+        hli_port = port.resource_instance
+        name = name or f"{hli_port.kind.module_id}/{hli_port.kind.port_id}"
+        selected = None if flows is None else set(flows)
+        self.__ports[name] = WatchedPort(
+            name,
+            hli_port,
+            tuple(
+                (index, flow.statistics)
+                for index, flow in enumerate(port.flows.flows)
+                if selected is None or index in selected
+            ),
+        )
+        return name
+
+    def unwatch(self, name: str) -> None:
+        self.__ports.pop(name, None)
+
+    @property
+    def watched(self) -> Tuple[str, ...]:
+        return tuple(self.__ports)
+
+    @property
+    def pipe(self) -> TMesagesPipe:
+        """Pipe the snapshots are published on, also for the consumers publishing their results."""
+        return self.__pipe
+
+    def on_snapshot(self, func: CB) -> None:
+        """Register a callback called with every collected ``StatisticsSnapshot``, before it is published."""
+        self.__observer.subscribe(SNAPSHOT, func)
+
+    async def collect(self, selection: Optional[Mapping[str, Collection[int]]] = None) -> StatisticsSnapshot:
+        """Run one collection round, publish and return its snapshot once all the ``on_snapshot`` callbacks handled it.
+
+        :param selection: indices of the flows to read keyed by the names of the ports, defaults to all the watched ports and flows
+        :type selection: Optional[Mapping[str, Collection[int]]], optional
+        :return: statistics of the selected ports
+        :rtype: StatisticsSnapshot
+        """
+        if selection is None:
+            watched = [(port, None) for port in self.__ports.values()]
+        else:
+            watched = [(self.__ports[name], flows) for name, flows in selection.items() if name in self.__ports]
+        tokens = [token for port, flows in watched for token in port.tokens(flows)]
+        timestamp = time.time()
+        responses, timings = await apply_by_connection_timed(tokens)
+        ports, begin = [], 0
+        for port, flows in watched:
+            count = port.commands_count(flows)
+            ports.append(port.parse(responses[begin:begin + count], timings[begin:begin + count], flows))
+            begin += count
+        self.__round += 1
+        snapshot = StatisticsSnapshot(
+            round=self.__round,
+            timestamp=timestamp,
+            ports=ports,
+            skew=max((port.received_at for port in ports), default=0.0) - min((port.sent_at for port in ports), default=0.0),
+        )
+        self.__observer.emit(SNAPSHOT, snapshot)
+        await self.__observer.join()
+        if self.max_skew is not None and snapshot.skew > self.max_skew:
+            self.__pipe.get_facade().send_warning(
+                RuntimeWarning(f"Statistics round {snapshot.round} skew {snapshot.skew:.3f}s exceeds {self.max_skew:.3f}s")
+            )
+        self.__pipe.get_facade().send_statistics(snapshot)
+        return snapshot
+
+    async def __poll(self, interval: float, scheduler: Optional["AdaptiveScheduler"]) -> None:
+        while True:
+            begin = time.monotonic()
+            try:
+                if scheduler is None:
+                    await self.collect()
+                elif selection := scheduler.select(tuple(self.__ports.values()), time.time()):
+                    scheduler.update(await self.collect(selection))
+            except Exception as e:
+                self.__pipe.get_facade().send_warning(e)
+            await asyncio.sleep(max(interval - (time.monotonic() - begin), 0))
+
+    @property
+    def is_running(self) -> bool:
+        return self.__task is not None
+
+    def start(self, interval: float = 1.0, *, scheduler: Optional["AdaptiveScheduler"] = None) -> None:
+        """Start collecting the statistics periodically.
+
+        :param interval: seconds between the beginnings of two rounds, defaults to 1.0
+        :type interval: float, optional
+        :param scheduler: polls only the ports and flows due in every round, the rounds then run every ``scheduler.min_interval``
+        :type scheduler: Optional[AdaptiveScheduler], optional
+        """
+        if self.__task:
+            return None
+        if scheduler is not None:
+            interval = scheduler.min_interval
+        self.__task = asyncio.create_task(self.__poll(interval, scheduler), name="StatisticsCollector")
+
+    async def stop(self) -> None:
+        if not self.__task:
+            return None
+        self.__task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self.__task
+        self.__task = None
@@ -0,0 +1,198 @@
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+from .__dataset import (
+    FLOW_COUNTERS,
+    PORT_COUNTERS,
+    DerivedSnapshot,
+    FlowDerived,
+    PortDerived,
+    StatisticsSnapshot,
+)
+
+
+COUNTER_MODULO = 2 ** 64
+WRAP_THRESHOLD = COUNTER_MODULO // 2
+"""A decreasing counter whose previous value was above the threshold has wrapped, otherwise it was cleared."""
+
+PPM = 1_000_000
+
+IMPAIRMENT_RATIOS: Dict[str, str] = {
+    "drop": "dropped_total",
+    "corruption": "corrupted_total",
+    "latency": "delayed",
+    "jitter": "jittered",
+    "duplication": "duplicated",
+    "misordering": "misordered",
+}
+"""Name of the ratio and the impairment counter divided by the received packets."""
+
+BITS_RATES: Dict[str, str] = {
+    "rx_bps": "rx_bytes",
+    "tx_bps": "tx_bytes",
+}
+
+SeriesKey = Tuple[str, Optional[int]]
+
+
+def counter_deltas(previous: np.ndarray, current: np.ndarray) -> np.ndarray:
+    """Increments of unsigned 64 bits counters, counting a cleared counter from zero.
+
+    :param previous: counters of the previous snapshot
+    :type previous: np.ndarray
+    :param current: counters of the current snapshot
+    :type current: np.ndarray
+    :return: increments of the counters
+    :rtype: np.ndarray
+    """
+    deltas = current - previous  # modular for uint64, which is right for wrapped counters
+    cleared = (current < previous) & (previous < WRAP_THRESHOLD)
+    return np.where(cleared, current, deltas)
+
+
+def _per_second(deltas: np.ndarray, elapsed: np.ndarray) -> np.ndarray:
+    seconds = elapsed[:, np.newaxis]
+    return np.divide(deltas.astype(np.float64), seconds, out=np.zeros(deltas.shape), where=seconds > 0)
+
+
+class _Counters:
+    """Counters of a snapshot as a matrix, one row per port or flow, with the time of every row."""
+
+    __slots__ = ("keys", "rows", "values", "timestamps")
+
+    def __init__(self, keys: Sequence[SeriesKey], values: Any, timestamps: Any, columns: int) -> None:
+        self.keys = tuple(keys)
+        self.rows = {key: row for row, key in enumerate(self.keys)}
+        self.values = np.array(values, dtype=np.uint64).reshape(len(self.keys), columns)
+        self.timestamps = np.array(timestamps, dtype=np.float64).reshape(len(self.keys))
+
+    def deltas(self, previous: "_Counters") -> Tuple[np.ndarray, np.ndarray]:
+        """Increments and elapsed seconds since the previous sample of every row, zero seconds for the new rows."""
+        rows = np.array([previous.rows.get(key, -1) for key in self.keys], dtype=np.int64)
+        known = rows >= 0
+        before = self.values.copy()
+        before[known] = previous.values[rows[known]]
+        elapsed = np.zeros(len(self.keys), dtype=np.float64)
+        elapsed[known] = self.timestamps[known] - previous.timestamps[rows[known]]
+        return counter_deltas(before, self.values), elapsed
+
+    def merge(self, previous: "_Counters") -> "_Counters":
+        """Latest sample of every row, keeping the rows of the previous snapshot missing from this one."""
+        missing = [row for key, row in previous.rows.items() if key not in self.rows]
+        return _Counters(
+            self.keys + tuple(previous.keys[row] for row in missing),
+            np.concatenate((self.values, previous.values[missing])),
+            np.concatenate((self.timestamps, previous.timestamps[missing])),
+            self.values.shape[1],
+        )
+
+
+class DerivedStatistics:
+    """Rates and impairment ratios of all the ports and flows, derived from consecutive snapshots.
+
+    Every snapshot is converted to a matrix of counters and all the metrics are computed in one vectorized pass.
+    """
+
+    __slots__ = ("__previous", "__expected")
+
+    def __init__(self) -> None:
+        self.__previous: Optional[Tuple[float, _Counters, _Counters]] = None
+        self.__expected: Dict[SeriesKey, Dict[str, float]] = {}
+
+    def expect(self, port: str, flow: int, **probabilities: int) -> None:
+        """Set the configured impairment probabilities of a flow, to be reported along the observed ratios.
+
+        :param port: name of the port
+        :type port: str
+        :param flow: index of the flow
+        :type flow: int
+        :param probabilities: probabilities in ppm, keyed by the names of ``IMPAIRMENT_RATIOS``
+        :type probabilities: int
+        """
+        if unknown := set(probabilities).difference(IMPAIRMENT_RATIOS):
+            raise KeyError(f"Unknown impairments {sorted(unknown)}, expected some of {tuple(IMPAIRMENT_RATIOS)}")
+        self.__expected.setdefault((port, flow), {}).update(
+            {name: probability / PPM for name, probability in probabilities.items()}
+        )
+
+    def reset(self) -> None:
+        """Forget the previous snapshot, for example after the statistics are cleared on purpose."""
+        self.__previous = None
+
+    def add(self, snapshot: StatisticsSnapshot) -> None:
+        """Attach the derived metrics to the snapshot, can be subscribed to ``StatisticsCollector.on_snapshot`` before their consumers."""
+        snapshot.derived = self.update(snapshot)
+
+    def update(self, snapshot: StatisticsSnapshot) -> Optional[DerivedSnapshot]:
+        """Derive the metrics of the interval since the previous snapshot.
+
+        :param snapshot: statistics of a collection round
+        :type snapshot: StatisticsSnapshot
+        :return: derived metrics, None for the first snapshot or if no time elapsed
+        :rtype: Optional[DerivedSnapshot]
+        """
+        ports = _Counters(
+            [(port.port, None) for port in snapshot.ports],
+            [[port.counters[name] for name in PORT_COUNTERS] for port in snapshot.ports],
+            [port.sampled_at for port in snapshot.ports],
+            len(PORT_COUNTERS),
+        )
+        flows = _Counters(
+            [(port.port, flow.flow) for port in snapshot.ports for flow in port.flows],
+            [[flow.counters[name] for name in FLOW_COUNTERS] for port in snapshot.ports for flow in port.flows],
+            [port.sampled_at for port in snapshot.ports for _ in port.flows],
+            len(FLOW_COUNTERS),
+        )
+        previous = self.__previous
+        if previous is None:
+            self.__previous = (snapshot.timestamp, ports, flows)
+            return None
+        if snapshot.timestamp <= previous[0]:
+            return None
+        self.__previous = (snapshot.timestamp, ports.merge(previous[1]), flows.merge(previous[2]))
+
+        port_deltas, port_elapsed = ports.deltas(previous[1])
+        port_rates = _per_second(port_deltas, port_elapsed)
+
+        flow_deltas, flow_elapsed = flows.deltas(previous[2])
+        flow_rates = _per_second(flow_deltas, flow_elapsed)
+        bits = np.column_stack([flow_rates[:, FLOW_COUNTERS.index(counter)] * 8 for counter in BITS_RATES.values()])
+        received = flow_deltas[:, FLOW_COUNTERS.index("rx_packets")].astype(np.float64)[:, np.newaxis]
+        impaired = flow_deltas[:, [FLOW_COUNTERS.index(counter) for counter in IMPAIRMENT_RATIOS.values()]].astype(np.float64)
+        ratios = np.divide(impaired, received, out=np.zeros_like(impaired), where=received > 0)
+
+        derived_flows: Dict[str, List[FlowDerived]] = {key[0]: [] for key in ports.keys}
+        for row, (port, flow) in enumerate(flows.keys):
+            if not flow_elapsed[row] > 0:
+                continue
+            derived_flows[port].append(FlowDerived(
+                flow=flow,
+                interval=flow_elapsed[row],
+                rates={
+                    **dict(zip(FLOW_COUNTERS, flow_rates[row].tolist())),
+                    **dict(zip(BITS_RATES, bits[row].tolist())),
+                },
+                ratios=dict(zip(IMPAIRMENT_RATIOS, ratios[row].tolist())),
+                expected=self.__expected.get((port, flow), {}),
+            ))
+        return DerivedSnapshot(
+            interval=snapshot.timestamp - previous[0],
+            ports=[
+                PortDerived(
+                    port=port,
+                    interval=port_elapsed[row],
+                    rates=dict(zip(PORT_COUNTERS, port_rates[row].tolist())),
+                    flows=derived_flows[port],
+                )
+                for row, (port, _) in enumerate(ports.keys)
+                if port_elapsed[row] > 0
+            ],
+        )
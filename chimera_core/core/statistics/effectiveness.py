@@ -0,0 +1,249 @@
+import asyncio
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from chimera_core.types import enums
+from chimera_core.core.manager.flow.distributions.__dataset import (
+    BitErrorRate,
+    DistributionConfigBase,
+    FixedRate,
+    Gamma,
+    Gaussian,
+    GilbertElliot,
+    Poisson,
+    RandomBurst,
+    RandomRate,
+    ScheduleMixin,
+    Uniform,
+)
+from .__dataset import (
+    BaselineDeltas,
+    EffectivenessReport,
+    FlowEffectiveness,
+    ImpairmentEffectiveness,
+    StatisticsSnapshot,
+)
+
+if TYPE_CHECKING:
+    from chimera_core.core.manager.flow import FlowManager
+
+
+PPM = 1_000_000
+
+DEFAULT_Z = 3.0
+"""Standard scores of the confidence intervals, about 99.7%."""
+
+IMPAIRMENT_COUNTERS: Dict[str, str] = {
+    "drop": "dropped_programmed",
+    "corruption": "corrupted_total",
+    "duplication": "duplicated",
+    "misordering": "misordered",
+}
+"""Impairments with a rate defined by their distribution, and the counter of the packets they impaired."""
+
+
+class Expectation:
+    """Expected ratio of impaired packets of a flow, ``ratio + per_bit * <bits per packet>``."""
+
+    __slots__ = ("distribution", "ratio", "per_bit")
+
+    def __init__(self, distribution: str, ratio: float = 0.0, per_bit: float = 0.0) -> None:
+        self.distribution = distribution
+        self.ratio = ratio
+        self.per_bit = per_bit
+
+
+def _duty_cycle(distribution: DistributionConfigBase) -> float:
+    """Fraction of the time the schedule keeps the impairment on, 1 when continuous."""
+    schedule = getattr(distribution, "schedule", None) if isinstance(distribution, ScheduleMixin) else None
+    if schedule is None or not schedule.period:
+        return 1.0
+    return min(schedule.duration / schedule.period, 1.0)
+
+
+def _mean_distance_ratio(mean: float) -> float:
+    return 1 / mean if mean > 0 else 0.0
+
+
+def expected_ratio(distribution: DistributionConfigBase) -> Optional[Expectation]:
+    """Long term ratio of impaired packets of a distribution, None for the ones without one.
+
+    The distances between impairments of Uniform, Gaussian, Gamma and Poisson are counted in packets.
+    Bursts triggered by RandomBurst are not re-triggered while they last.
+
+    :param distribution: the configured distribution
+    :type distribution: DistributionConfigBase
+    :return: the expected ratio
+    :rtype: Optional[Expectation]
+    """
+    name = type(distribution).__name__
+    if isinstance(distribution, (FixedRate, RandomRate)):
+        expectation = Expectation(name, distribution.probability / PPM)
+    elif isinstance(distribution, GilbertElliot):
+        to_bad, to_good = distribution.good_state_trans_prob / PPM, distribution.bad_state_trans_prob / PPM
+        bad = to_bad / (to_bad + to_good) if to_bad + to_good else 0.0
+        expectation = Expectation(name, ((1 - bad) * distribution.good_state_impair_prob + bad * distribution.bad_state_impair_prob) / PPM)
+    elif isinstance(distribution, BitErrorRate):
+        expectation = Expectation(name, per_bit=distribution.coefficient * 10.0 ** distribution.exponent)
+    elif isinstance(distribution, RandomBurst):
+        burst = distribution.probability / PPM * (distribution.minimum + distribution.maximum) / 2
+        expectation = Expectation(name, burst / (1 + burst))
+    elif isinstance(distribution, Uniform):
+        expectation = Expectation(name, _mean_distance_ratio((distribution.minimum + distribution.maximum) / 2))
+    elif isinstance(distribution, Gaussian):
+        expectation = Expectation(name, _mean_distance_ratio(distribution.mean))
+    elif isinstance(distribution, Gamma):
+        expectation = Expectation(name, _mean_distance_ratio(distribution.shape * distribution.scale))
+    elif isinstance(distribution, Poisson):
+        expectation = Expectation(name, _mean_distance_ratio(distribution.lamda))
+    else:
+        return None
+    duty = _duty_cycle(distribution)
+    expectation.ratio *= duty
+    expectation.per_bit *= duty
+    return expectation
+
+
+def wilson_interval(impaired: np.ndarray, packets: np.ndarray, z: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Wilson score intervals of binomial ratios, (0, 1) where no packets were received."""
+    n = packets.astype(np.float64)
+    safe = np.maximum(n, 1)
+    ratio = impaired / safe
+    denominator = 1 + z ** 2 / safe
+    center = (ratio + z ** 2 / (2 * safe)) / denominator
+    margin = z * np.sqrt(ratio * (1 - ratio) / safe + z ** 2 / (4 * safe ** 2)) / denominator
+    empty = n == 0
+    return np.where(empty, 0.0, np.clip(center - margin, 0, 1)), np.where(empty, 1.0, np.clip(center + margin, 0, 1))
+
+
+class EffectivenessAnalyzer:
+    """Compare the impairment ratios configured on the flows with the ones observed in their statistics.
+
+    The configurations are read once through the impairment managers, every report is then one vectorized pass
+    over the counters of a snapshot or of baseline deltas. An impairment passes when its expected ratio is within
+    the confidence interval of the observed one widened by ``tolerance`` of the expected ratio,
+    the correlated impairments of bursty distributions need some.
+    """
+
+    __slots__ = ("z", "tolerance", "min_packets", "__expectations")
+
+    def __init__(self, *, z: float = DEFAULT_Z, tolerance: float = 0.05, min_packets: int = 1000) -> None:
+        self.z = z
+        self.tolerance = tolerance
+        self.min_packets = min_packets
+        self.__expectations: Dict[Tuple[str, int], Dict[str, Expectation]] = {}
+
+    def expect(self, port: str, flow: int, impairment: str, distribution: DistributionConfigBase) -> None:
+        """Set the expected ratio of an impairment of a flow from its distribution.
+
+        :param port: name of the port
+        :type port: str
+        :param flow: index of the flow
+        :type flow: int
+        :param impairment: name of the impairment, one of ``IMPAIRMENT_COUNTERS``
+        :type impairment: str
+        :param distribution: the configured distribution
+        :type distribution: DistributionConfigBase
+        """
+        if impairment not in IMPAIRMENT_COUNTERS:
+            raise KeyError(f"Unknown impairment {impairment!r}, expected one of {tuple(IMPAIRMENT_COUNTERS)}")
+        expectations = self.__expectations.setdefault((port, flow), {})
+        if (expectation := expected_ratio(distribution)) is None:
+            expectations.pop(impairment, None)
+        else:
+            expectations[impairment] = expectation
+
+    async def load(self, port: str, flow: int, manager: "FlowManager") -> None:
+        """Read the enabled impairments of a flow through its impairment managers.
+
+        :param port: name of the port
+        :type port: str
+        :param flow: index of the flow
+        :type flow: int
+        :param manager: the flow manager
+        :type manager: FlowManager
+        """
+        impairments = [getattr(manager, impairment) for impairment in IMPAIRMENT_COUNTERS]
+        configs = await asyncio.gather(*(impairment.get() for impairment in impairments))
+        self.__expectations.pop((port, flow), None)
+        for impairment, config in zip(IMPAIRMENT_COUNTERS, configs):
+            distribution = config.get_current_distribution()
+            if config.enable == enums.OnOff.ON and distribution is not None:
+                self.expect(port, flow, impairment, distribution)
+
+    def forget(self, port: str, flow: Optional[int] = None) -> None:
+        for key in [key for key in self.__expectations if key[0] == port and flow in (None, key[1])]:
+            del self.__expectations[key]
+
+    def report(self, statistics: Union[StatisticsSnapshot, BaselineDeltas]) -> EffectivenessReport:
+        """Expected versus observed impairment ratios of the flows with expectations.
+
+        Cumulative counters of a snapshot compare since the statistics were cleared, deltas since their checkpoint.
+
+        :param statistics: the collected statistics
+        :type statistics: Union[StatisticsSnapshot, BaselineDeltas]
+        :return: per flow pass/fail report
+        :rtype: EffectivenessReport
+        """
+        if isinstance(statistics, StatisticsSnapshot):
+            counters = {(port.port, flow.flow): flow.counters for port in statistics.ports for flow in port.flows}
+        else:
+            counters = {(delta.port, delta.flow): delta.counters for delta in statistics.deltas if delta.flow is not None}
+        rows: List[Tuple[Tuple[str, int], str, Expectation]] = [
+            (key, impairment, expectation)
+            for key, expectations in self.__expectations.items() if key in counters
+            for impairment, expectation in expectations.items()
+        ]
+        packets = np.array([counters[key]["rx_packets"] for key, _, _ in rows], dtype=np.int64)
+        impaired = np.array([counters[key][IMPAIRMENT_COUNTERS[impairment]] for key, impairment, _ in rows], dtype=np.int64)
+        octets = np.array([counters[key]["rx_bytes"] for key, _, _ in rows], dtype=np.float64)
+        bits = np.divide(octets * 8, packets, out=np.zeros(len(rows)), where=packets > 0)
+        expected = np.clip(
+            np.array([expectation.ratio for _, _, expectation in rows]) + np.array([expectation.per_bit for _, _, expectation in rows]) * bits,
+            0,
+            1,
+        )
+        observed = np.divide(impaired, packets, out=np.zeros(len(rows)), where=packets > 0)
+        lower, upper = wilson_interval(impaired, packets, self.z)
+        slack = self.tolerance * expected
+        passed = (expected >= lower - slack) & (expected <= upper + slack)
+        decided = packets >= self.min_packets
+
+        flows: Dict[Tuple[str, int], List[ImpairmentEffectiveness]] = {}
+        for row, (key, impairment, expectation) in enumerate(rows):
+            flows.setdefault(key, []).append(ImpairmentEffectiveness(
+                impairment=impairment,
+                distribution=expectation.distribution,
+                expected=expected[row],
+                observed=observed[row],
+                lower=lower[row],
+                upper=upper[row],
+                packets=packets[row],
+                impaired=impaired[row],
+                passed=bool(passed[row]) if decided[row] else None,
+            ))
+        return EffectivenessReport(
+            timestamp=statistics.timestamp,
+            flows=[
+                FlowEffectiveness(
+                    port=port,
+                    flow=flow,
+                    passed=_flow_passed(impairments),
+                    impairments=impairments,
+                )
+                for (port, flow), impairments in flows.items()
+            ],
+        )
+
+
+def _flow_passed(impairments: List[ImpairmentEffectiveness]) -> Optional[bool]:
+    decided = [impairment.passed for impairment in impairments if impairment.passed is not None]
+    return all(decided) if decided else None
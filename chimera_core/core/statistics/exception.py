@@ -0,0 +1,12 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .__dataset import Alert
+
+
+class StatisticsAlertWarning(Warning):
+    def __init__(self, alert: "Alert") -> None:
+        self.alert = alert
+        target = alert.port if alert.flow is None else f"{alert.port} flow {alert.flow}"
+        self.msg = f"[{alert.rule}] {target}: {alert.message}"
+        super().__init__(self.msg)
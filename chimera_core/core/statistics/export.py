@@ -0,0 +1,169 @@
+import csv
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+import numpy as np
+
+from .__dataset import FLOW_COUNTERS, StatisticsSnapshot
+from .store import StatisticsStore
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+
+PARQUET = "parquet"
+CSV = "csv"
+
+DEFAULT_ROW_GROUP_SIZE = 65_536
+
+COLUMNS = ("timestamp", "port", "flow") + FLOW_COUNTERS
+"""One row per port or flow sample, ``flow`` and the rx/tx counters are empty for the port totals."""
+
+
+def _schema() -> "pa.Schema":
+    return pa.schema([
+        ("timestamp", pa.float64()),
+        ("port", pa.string()),
+        ("flow", pa.int32()),
+        *((name, pa.uint64()) for name in FLOW_COUNTERS),
+    ])
+
+
+def resolve_format(path: Union[str, Path], format: Optional[str] = None) -> str:
+    """Format of the export, Parquet when the path says so and pyarrow is installed, CSV otherwise."""
+    if format is None:
+        format = PARQUET if Path(path).suffix.lower() == ".parquet" else CSV
+    if format not in (PARQUET, CSV):
+        raise ValueError(f"Unknown export format {format!r}, expected {PARQUET!r} or {CSV!r}")
+    if format == PARQUET and pq is None:
+        return CSV
+    return format
+
+
+class StatisticsExporter:
+    """Write the collected snapshots to a Parquet or CSV file, one row group at a time.
+
+    Rows are buffered up to ``row_group_size`` then written, so the memory use does not grow with the test length.
+    Parquet requires pyarrow, without it the rows are written as CSV to the path with the ``.csv`` suffix.
+    """
+
+    __slots__ = ("path", "format", "__row_group_size", "__columns", "__rows", "__file", "__writer")
+
+    def __init__(self, path: Union[str, Path], *, format: Optional[str] = None, row_group_size: int = DEFAULT_ROW_GROUP_SIZE) -> None:
+        if row_group_size <= 0:
+            raise ValueError("Row group size must be positive.")
+        self.format = resolve_format(path, format)
+        self.path = Path(path) if self.format != CSV else Path(path).with_suffix(".csv")
+        self.__row_group_size = row_group_size
+        self.__columns: Dict[str, List[Any]] = {name: [] for name in COLUMNS}
+        self.__rows = 0
+        self.__file = None
+        self.__writer: Any = None
+
+    def __enter__(self) -> "StatisticsExporter":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
+
+    def __open(self) -> None:
+        if self.format == PARQUET:
+            self.__writer = pq.ParquetWriter(str(self.path), _schema())
+            return None
+        self.__file = open(self.path, "w", newline="", encoding="utf-8")
+        self.__writer = csv.writer(self.__file)
+        self.__writer.writerow(COLUMNS)
+
+    def write_columns(self, columns: Dict[str, Sequence[Any]]) -> None:
+        """Write one row group, the values of the columns missing from ``columns`` are empty."""
+        rows = len(columns["timestamp"])
+        if not rows:
+            return None
+        if self.__writer is None:
+            self.__open()
+        if self.format == PARQUET:
+            self.__writer.write_table(
+                pa.table({name: columns.get(name, [None] * rows) for name in COLUMNS}, schema=_schema())
+            )
+            return None
+        empty = [None] * rows
+        self.__writer.writerows(zip(*(columns.get(name, empty) for name in COLUMNS)))
+
+    def add(self, snapshot: StatisticsSnapshot) -> None:
+        """Buffer the rows of a snapshot, can be subscribed to ``StatisticsCollector.on_snapshot``."""
+        for port in snapshot.ports:
+            self.__append(port.sampled_at, port.port, None, port.counters)
+            for flow in port.flows:
+                self.__append(port.sampled_at, port.port, flow.flow, flow.counters)
+        if self.__rows >= self.__row_group_size:
+            self.flush()
+
+    def __append(self, timestamp: float, port: str, flow: Optional[int], counters: Dict[str, int]) -> None:
+        self.__columns["timestamp"].append(timestamp)
+        self.__columns["port"].append(port)
+        self.__columns["flow"].append(flow)
+        for name in FLOW_COUNTERS:
+            self.__columns[name].append(counters.get(name))
+        self.__rows += 1
+
+    def flush(self) -> None:
+        """Write the buffered rows as a row group."""
+        self.write_columns(self.__columns)
+        self.__columns = {name: [] for name in COLUMNS}
+        self.__rows = 0
+
+    def close(self) -> None:
+        self.flush()
+        if self.format == PARQUET and self.__writer is not None:
+            self.__writer.close()
+        if self.__file is not None:
+            self.__file.close()
+        self.__writer = self.__file = None
+
+
+def export_store(
+    store: StatisticsStore,
+    path: Union[str, Path],
+    *,
+    format: Optional[str] = None,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+) -> Path:
+    """Dump all the series of a store to a file, in the layout of ``StatisticsExporter``.
+
+    :param store: the statistics store
+    :type store: StatisticsStore
+    :param path: path of the file
+    :type path: Union[str, Path]
+    :param format: "parquet" or "csv", defaults to the one of the path suffix
+    :type format: Optional[str], optional
+    :param row_group_size: rows per row group, defaults to DEFAULT_ROW_GROUP_SIZE
+    :type row_group_size: int, optional
+    :return: path of the written file
+    :rtype: Path
+    """
+    with StatisticsExporter(path, format=format, row_group_size=row_group_size) as exporter:
+        for port, flow in store.keys:
+            series = store.series(port, flow)
+            timestamps, values = series.window()
+            for begin in range(0, len(timestamps), row_group_size):
+                chunk = slice(begin, begin + row_group_size)
+                rows = len(timestamps[chunk])
+                columns: Dict[str, Sequence[Any]] = {
+                    "timestamp": timestamps[chunk],
+                    "port": [port] * rows,
+                    "flow": [flow] * rows,
+                }
+                for column, name in enumerate(series.counters):
+                    columns[name] = values[chunk, column].astype(np.uint64)
+                exporter.write_columns(columns)
+    return exporter.path
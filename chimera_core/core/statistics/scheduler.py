@@ -0,0 +1,149 @@
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+
+from .__dataset import StatisticsSnapshot
+from .collector import FLOW_COMMANDS_COUNT, PORT_COMMANDS_COUNT
+
+if TYPE_CHECKING:
+    from .collector import WatchedPort
+
+
+DEFAULT_MIN_INTERVAL = 0.1
+DEFAULT_MAX_INTERVAL = 5.0
+DEFAULT_BUDGET = 1000
+"""Commands per second sent to one tester."""
+
+ItemKey = Tuple[str, Optional[int]]
+"""Name of the port and index of the flow, ``None`` for the port totals."""
+
+
+class _Schedule:
+    __slots__ = ("interval", "due", "counters")
+
+    def __init__(self, interval: float) -> None:
+        self.interval = interval
+        self.due = 0.0
+        self.counters: Optional[Dict[str, int]] = None
+
+
+class AdaptiveScheduler:
+    """Choose the ports and flows to poll in every collection round.
+
+    The polling interval of a port or flow is reset to ``min_interval`` when its counters change,
+    or while it is marked active, and doubles up to ``max_interval`` while they stay the same.
+    The due items are polled the most late first, within ``budget`` commands per second for each tester.
+    """
+
+    __slots__ = ("min_interval", "max_interval", "budget", "__schedules", "__active", "__credits")
+
+    def __init__(
+        self,
+        *,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        budget: int = DEFAULT_BUDGET,
+    ) -> None:
+        if not 0 < min_interval <= max_interval:
+            raise ValueError("Intervals must be positive and min_interval not greater than max_interval.")
+        if budget < PORT_COMMANDS_COUNT + FLOW_COMMANDS_COUNT:
+            raise ValueError(f"Budget must allow at least {PORT_COMMANDS_COUNT + FLOW_COMMANDS_COUNT} commands per second.")
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.budget = budget
+        self.__schedules: Dict[ItemKey, _Schedule] = {}
+        self.__active: Set[ItemKey] = set()
+        self.__credits: Dict[int, Tuple[float, float]] = {}
+        """Available commands and time of the last refill, keyed by tester"""
+
+    def set_active(self, port: str, flow: Optional[int] = None, active: bool = True) -> None:
+        """Keep polling a port or flow at ``min_interval``, for example while an impairment schedule is running.
+
+        :param port: name of the port
+        :type port: str
+        :param flow: index of the flow, defaults to the port totals
+        :type flow: Optional[int], optional
+        :param active: poll fast until set inactive, defaults to True
+        :type active: bool, optional
+        """
+        key = (port, flow)
+        if active:
+            self.__active.add(key)
+            if schedule := self.__schedules.get(key):
+                polled = schedule.due - schedule.interval
+                schedule.interval = self.min_interval
+                schedule.due = min(schedule.due, polled + self.min_interval)
+        else:
+            self.__active.discard(key)
+
+    def __schedule(self, key: ItemKey) -> _Schedule:
+        if (schedule := self.__schedules.get(key)) is None:
+            schedule = self.__schedules[key] = _Schedule(self.min_interval)
+        return schedule
+
+    def __refill(self, tester: int, now: float) -> float:
+        credits, refilled = self.__credits.get(tester, (float(self.budget), now))
+        return min(credits + (now - refilled) * self.budget, float(self.budget))
+
+    def select(self, ports: Sequence["WatchedPort"], now: float) -> Dict[str, Tuple[int, ...]]:
+        """Ports and flows to poll in the round starting at ``now``.
+
+        :param ports: the watched ports
+        :type ports: Sequence[WatchedPort]
+        :param now: unix time of the round
+        :type now: float
+        :return: indices of the flows to poll keyed by the names of the ports, the port totals are read for every listed port
+        :rtype: Dict[str, Tuple[int, ...]]
+        """
+        by_tester: Dict[int, List["WatchedPort"]] = {}
+        for port in ports:
+            by_tester.setdefault(port.tester, []).append(port)
+
+        selection: Dict[str, List[int]] = {}
+        for tester, tester_ports in by_tester.items():
+            credits = self.__refill(tester, now)
+            due: List[Tuple[float, ItemKey]] = []
+            for port in tester_ports:
+                for key in ((port.name, None), *((port.name, index) for index, _ in port.flows)):
+                    schedule = self.__schedule(key)
+                    if schedule.due <= now:
+                        due.append((now - schedule.due, key))
+            due.sort(key=lambda item: item[0], reverse=True)
+            for _, (name, flow) in due:
+                cost = (0 if name in selection else PORT_COMMANDS_COUNT) + (0 if flow is None else FLOW_COMMANDS_COUNT)
+                if cost > credits:
+                    continue
+                credits -= cost
+                flows = selection.setdefault(name, [])
+                if flow is not None:
+                    flows.append(flow)
+            self.__credits[tester] = (credits, now)
+        return {name: tuple(flows) for name, flows in selection.items()}
+
+    def __reschedule(self, key: ItemKey, counters: Dict[str, int], timestamp: float) -> None:
+        schedule = self.__schedule(key)
+        if key in self.__active or counters != schedule.counters:
+            schedule.interval = self.min_interval
+        else:
+            schedule.interval = min(schedule.interval * 2, self.max_interval)
+        schedule.counters = counters
+        schedule.due = timestamp + schedule.interval
+
+    def update(self, snapshot: StatisticsSnapshot) -> None:
+        """Adapt the polling intervals to the counters read in a round."""
+        for port in snapshot.ports:
+            self.__reschedule((port.port, None), port.counters, snapshot.timestamp)
+            for flow in port.flows:
+                self.__reschedule((port.port, flow.flow), flow.counters, snapshot.timestamp)
+
+    def forget(self, port: str) -> None:
+        """Drop the schedules of an unwatched port."""
+        for key in [key for key in self.__schedules if key[0] == port]:
+            del self.__schedules[key]
+            self.__active.discard(key)
@@ -0,0 +1,225 @@
+import math
+from typing import (
+    Dict,
+    Iterable,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+from .__dataset import (
+    QuantilesSummary,
+    SketchModel,
+    StatisticsSnapshot,
+)
+
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BUCKETS = 2048
+DEFAULT_QUANTILES = (0.5, 0.9, 0.99)
+DEFAULT_METRICS = (
+    "rates.dropped_total",
+    "rates.delayed",
+    "ratios.drop",
+    "ratios.latency",
+)
+"""Derived metrics summarized by default, named as in the alerting rules."""
+
+SketchKey = Tuple[str, str, Optional[int]]
+"""Name of the metric, name of the port and index of the flow, ``None`` for the port totals."""
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch of non negative values, with logarithmic buckets.
+
+    Every quantile is within ``relative_accuracy`` of the exact one. When there are more than ``max_buckets``
+    buckets the lowest ones are collapsed, so the memory stays bounded and the high quantiles stay accurate.
+    """
+
+    __slots__ = ("relative_accuracy", "max_buckets", "__gamma_log", "__buckets", "__zeros", "__count", "__min", "__max", "__total")
+
+    def __init__(self, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY, max_buckets: int = DEFAULT_MAX_BUCKETS) -> None:
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("Relative accuracy must be between 0 and 1.")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.__gamma_log = math.log((1 + relative_accuracy) / (1 - relative_accuracy))
+        self.__buckets: Dict[int, int] = {}
+        self.__zeros = 0
+        self.__count = 0
+        self.__min = math.inf
+        self.__max = -math.inf
+        self.__total = 0.0
+
+    @property
+    def count(self) -> int:
+        return self.__count
+
+    def add(self, values: Iterable[float]) -> None:
+        """Add the values, their buckets are computed at once."""
+        array = np.asarray(values, dtype=np.float64).ravel()
+        array = array[np.isfinite(array)]
+        if not len(array):
+            return None
+        if (array < 0).any():
+            raise ValueError("Only non negative values are supported.")
+        self.__count += len(array)
+        self.__min = min(self.__min, float(array.min()))
+        self.__max = max(self.__max, float(array.max()))
+        self.__total += float(array.sum())
+        positive = array[array > 0]
+        self.__zeros += len(array) - len(positive)
+        indices, counts = np.unique(np.ceil(np.log(positive) / self.__gamma_log).astype(np.int64), return_counts=True)
+        for index, count in zip(indices.tolist(), counts.tolist()):
+            self.__buckets[index] = self.__buckets.get(index, 0) + count
+        self.__collapse()
+
+    def __collapse(self) -> None:
+        if len(self.__buckets) <= self.max_buckets:
+            return None
+        indices = sorted(self.__buckets)
+        excess = len(indices) - self.max_buckets
+        target = indices[excess]
+        self.__buckets[target] += sum(self.__buckets.pop(index) for index in indices[:excess])
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add the values of another sketch of the same relative accuracy."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Only sketches of the same relative accuracy can be merged.")
+        self.merge_model(other.to_model())
+
+    def merge_model(self, model: SketchModel) -> None:
+        if model.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Only sketches of the same relative accuracy can be merged.")
+        if not model.count:
+            return None
+        self.__count += model.count
+        self.__zeros += model.zeros
+        self.__min = min(self.__min, model.minimum)
+        self.__max = max(self.__max, model.maximum)
+        self.__total += model.total
+        for index, count in model.buckets.items():
+            self.__buckets[index] = self.__buckets.get(index, 0) + count
+        self.__collapse()
+
+    def to_model(self) -> SketchModel:
+        return SketchModel(
+            relative_accuracy=self.relative_accuracy,
+            count=self.__count,
+            zeros=self.__zeros,
+            minimum=self.__min if self.__count else 0.0,
+            maximum=self.__max if self.__count else 0.0,
+            total=self.__total,
+            buckets=dict(self.__buckets),
+        )
+
+    @classmethod
+    def from_model(cls, model: SketchModel, max_buckets: int = DEFAULT_MAX_BUCKETS) -> "QuantileSketch":
+        sketch = cls(model.relative_accuracy, max_buckets)
+        sketch.merge_model(model)
+        return sketch
+
+    def quantile(self, q: float) -> float:
+        """Value of the quantile ``q``, 0 <= q <= 1, NaN when the sketch is empty."""
+        if not 0 <= q <= 1:
+            raise ValueError("Quantile must be between 0 and 1.")
+        if not self.__count:
+            return math.nan
+        rank = q * (self.__count - 1)
+        if rank < self.__zeros:
+            return 0.0
+        seen = self.__zeros
+        for index in sorted(self.__buckets):
+            seen += self.__buckets[index]
+            if seen > rank:
+                gamma = math.exp(self.__gamma_log)
+                value = 2 * gamma ** index / (gamma + 1)
+                return min(max(value, self.__min), self.__max)
+        return self.__max
+
+    def summary(self, quantiles: Sequence[float] = DEFAULT_QUANTILES) -> QuantilesSummary:
+        return QuantilesSummary(
+            count=self.__count,
+            minimum=self.__min if self.__count else math.nan,
+            maximum=self.__max if self.__count else math.nan,
+            mean=self.__total / self.__count if self.__count else math.nan,
+            quantiles={f"p{q * 100:g}": self.quantile(q) for q in quantiles},
+        )
+
+
+class RateSketches:
+    """Quantile sketches of the derived per interval metrics of every port and flow, updated with every snapshot.
+
+    Summaries merge the sketches of any set of flows, ports and testers, at any time of the run.
+    """
+
+    __slots__ = ("metrics", "relative_accuracy", "max_buckets", "__sketches")
+
+    def __init__(
+        self,
+        metrics: Sequence[str] = DEFAULT_METRICS,
+        *,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_buckets: int = DEFAULT_MAX_BUCKETS,
+    ) -> None:
+        self.metrics = tuple(metrics)
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.__sketches: Dict[SketchKey, QuantileSketch] = {}
+
+    def __get_sketch(self, key: SketchKey) -> QuantileSketch:
+        if (sketch := self.__sketches.get(key)) is None:
+            sketch = self.__sketches[key] = QuantileSketch(self.relative_accuracy, self.max_buckets)
+        return sketch
+
+    def add(self, snapshot: StatisticsSnapshot) -> None:
+        """Add the derived metrics of a snapshot, can be subscribed to ``StatisticsCollector.on_snapshot``."""
+        if not snapshot.derived:
+            return None
+        for port in snapshot.derived.ports:
+            targets = [(None, {"rates": port.rates})]
+            targets.extend((flow.flow, {"rates": flow.rates, "ratios": flow.ratios}) for flow in port.flows)
+            for flow, groups in targets:
+                for metric in self.metrics:
+                    group, _, name = metric.partition(".")
+                    if (value := groups.get(group, {}).get(name)) is not None:
+                        self.__get_sketch((metric, port.port, flow)).add((value,))
+
+    def sketch(self, metric: str, port: Optional[str] = None, flow: Optional[int] = None, totals: bool = False) -> QuantileSketch:
+        """Merged sketch of a metric.
+
+        :param metric: name of the metric
+        :type metric: str
+        :param port: name of the port, defaults to all the ports
+        :type port: Optional[str], optional
+        :param flow: index of the flow, defaults to all the flows
+        :type flow: Optional[int], optional
+        :param totals: merge the port totals instead of the flows, defaults to False
+        :type totals: bool, optional
+        :return: a new sketch holding the merged values
+        :rtype: QuantileSketch
+        """
+        merged = QuantileSketch(self.relative_accuracy, self.max_buckets)
+        for (sketch_metric, sketch_port, sketch_flow), sketch in self.__sketches.items():
+            if sketch_metric != metric or (port is not None and sketch_port != port):
+                continue
+            if totals != (sketch_flow is None) or (flow is not None and sketch_flow != flow):
+                continue
+            merged.merge(sketch)
+        return merged
+
+    def summary(
+        self,
+        metric: str,
+        port: Optional[str] = None,
+        flow: Optional[int] = None,
+        totals: bool = False,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    ) -> QuantilesSummary:
+        """Count, minimum, maximum, mean and quantiles of a metric, merged like ``sketch``."""
+        return self.sketch(metric, port, flow, totals).summary(quantiles)
+
+    def clear(self) -> None:
+        self.__sketches.clear()
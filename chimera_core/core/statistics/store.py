@@ -0,0 +1,211 @@
+from typing import (
+    Dict,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+from .__dataset import (
+    FLOW_COUNTERS,
+    PORT_COUNTERS,
+    StatisticsSnapshot,
+)
+
+
+DEFAULT_CAPACITY = 36_000
+"""Samples kept per series, one hour at ten samples per second."""
+
+SeriesKey = Tuple[str, Optional[int]]
+"""Name of the port and index of the flow, ``None`` for the port totals."""
+
+
+class RingBuffer:
+    """Preallocated samples of the counters of one port or flow.
+
+    Timestamps are kept in a parallel array, the oldest samples are overwritten when the buffer is full.
+    """
+
+    __slots__ = ("counters", "__columns", "__timestamps", "__values", "__head", "__size")
+
+    def __init__(self, counters: Sequence[str], capacity: int) -> None:
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive.")
+        self.counters = tuple(counters)
+        self.__columns = {name: column for column, name in enumerate(self.counters)}
+        self.__timestamps = np.zeros(capacity, dtype=np.float64)
+        self.__values = np.zeros((capacity, len(self.counters)), dtype=np.int64)
+        self.__head = 0
+        """Position of the next sample"""
+        self.__size = 0
+
+    def __len__(self) -> int:
+        return self.__size
+
+    @property
+    def capacity(self) -> int:
+        return len(self.__timestamps)
+
+    @property
+    def nbytes(self) -> int:
+        return self.__timestamps.nbytes + self.__values.nbytes
+
+    def append(self, timestamp: float, counters: Dict[str, int]) -> None:
+        self.__timestamps[self.__head] = timestamp
+        self.__values[self.__head] = [counters.get(name, 0) for name in self.counters]
+        self.__head = (self.__head + 1) % self.capacity
+        self.__size = min(self.__size + 1, self.capacity)
+
+    def column(self, counter: str) -> int:
+        try:
+            return self.__columns[counter]
+        except KeyError:
+            raise KeyError(f"Unknown counter {counter!r}, expected one of {self.counters}") from None
+
+    def __segments(self) -> Tuple[slice, ...]:
+        """Slices of the buffer holding the samples, oldest first."""
+        if self.__size < self.capacity:
+            return (slice(0, self.__size),)
+        return (slice(self.__head, self.capacity), slice(0, self.__head))
+
+    def window(self, start: Optional[float] = None, end: Optional[float] = None, counter: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Samples taken within ``[start, end]``, oldest first.
+
+        :param start: unix time of the first sample, defaults to the oldest one
+        :type start: Optional[float], optional
+        :param end: unix time of the last sample, defaults to the newest one
+        :type end: Optional[float], optional
+        :param counter: name of the counter to return, defaults to all of them as columns
+        :type counter: Optional[str], optional
+        :return: timestamps and values
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        values = self.__values if counter is None else self.__values[:, self.column(counter)]
+        timestamps, selected = [], []
+        for segment in self.__segments():
+            segment_timestamps = self.__timestamps[segment]
+            begin = 0 if start is None else np.searchsorted(segment_timestamps, start, side="left")
+            stop = len(segment_timestamps) if end is None else np.searchsorted(segment_timestamps, end, side="right")
+            timestamps.append(segment_timestamps[begin:stop])
+            selected.append(values[segment][begin:stop])
+        return np.concatenate(timestamps), np.concatenate(selected)
+
+
+class StatisticsStore:
+    """Time series of the collected statistics, one ring buffer per port and per flow.
+
+    Memory is bounded by ``capacity`` samples per series, whatever the length of the test.
+    """
+
+    __slots__ = ("__capacity", "__series")
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY) -> None:
+        if capacity <= 0:
+            raise ValueError("Capacity must be positive.")
+        self.__capacity = capacity
+        self.__series: Dict[SeriesKey, RingBuffer] = {}
+
+    @property
+    def keys(self) -> Tuple[SeriesKey, ...]:
+        return tuple(self.__series)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(buffer.nbytes for buffer in self.__series.values())
+
+    def __get_buffer(self, key: SeriesKey) -> RingBuffer:
+        if (buffer := self.__series.get(key)) is None:
+            counters = PORT_COUNTERS if key[1] is None else FLOW_COUNTERS
+            buffer = self.__series[key] = RingBuffer(counters, self.__capacity)
+        return buffer
+
+    def add(self, snapshot: StatisticsSnapshot) -> None:
+        """Append the statistics of a collection round, can be subscribed to ``StatisticsCollector.on_snapshot``."""
+        for port in snapshot.ports:
+            self.__get_buffer((port.port, None)).append(port.sampled_at, port.counters)
+            for flow in port.flows:
+                self.__get_buffer((port.port, flow.flow)).append(port.sampled_at, flow.counters)
+
+    def series(self, port: str, flow: Optional[int] = None) -> RingBuffer:
+        try:
+            return self.__series[(port, flow)]
+        except KeyError:
+            raise KeyError(f"No statistics stored for port {port!r} flow {flow}") from None
+
+    def clear(self) -> None:
+        self.__series.clear()
+
+    def query(
+        self,
+        port: str,
+        counter: str,
+        flow: Optional[int] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Samples of a counter within ``[start, end]``.
+
+        :param port: name of the port
+        :type port: str
+        :param counter: name of the counter
+        :type counter: str
+        :param flow: index of the flow, defaults to the port totals
+        :type flow: Optional[int], optional
+        :param start: unix time of the first sample, defaults to the oldest one
+        :type start: Optional[float], optional
+        :param end: unix time of the last sample, defaults to the newest one
+        :type end: Optional[float], optional
+        :return: timestamps and values
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        return self.series(port, flow).window(start, end, counter)
+
+    def downsample(
+        self,
+        port: str,
+        counter: str,
+        period: float,
+        flow: Optional[int] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Last sample of a counter in every ``period`` seconds bucket, the counters are cumulative.
+
+        Buckets are aligned on multiples of ``period`` since the epoch, so consecutive queries share them.
+
+        :param period: length of the buckets in seconds
+        :type period: float
+        :return: timestamps and values of the last sample of every non-empty bucket
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        if period <= 0:
+            raise ValueError("Period must be positive.")
+        timestamps, values = self.query(port, counter, flow, start, end)
+        if not len(timestamps):
+            return timestamps, values
+        buckets = np.floor(timestamps / period)
+        last = np.flatnonzero(np.diff(buckets, append=np.inf))
+        return timestamps[last], values[last]
+
+    def rate(
+        self,
+        port: str,
+        counter: str,
+        flow: Optional[int] = None,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Per second rate of a counter between consecutive samples.
+
+        A decreasing counter means the statistics were cleared, the rate of that interval is counted from zero.
+
+        :return: timestamps of the end of every interval and the rates
+        :rtype: Tuple[np.ndarray, np.ndarray]
+        """
+        timestamps, values = self.query(port, counter, flow, start, end)
+        deltas = np.diff(values)
+        deltas = np.where(deltas < 0, values[1:], deltas)
+        elapsed = np.diff(timestamps)
+        rates = np.divide(deltas, elapsed, out=np.zeros(len(deltas)), where=elapsed > 0)
+        return timestamps[1:], rates
@@ -0,0 +1,153 @@
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+)
+
+from pydantic import BaseModel
+from xoa_driver.v2.misc import Token
+
+from .tokens import apply_by_connection
+
+
+CommandKey = Tuple[int, int, int, Tuple[int, ...]]
+"""Command code, module index, port index and indices of a set command, on its connection."""
+
+
+def command_key(token: Token) -> CommandKey:
+    header = token.request.header
+    return (header.cmd_code, header.module_index, header.port_index, tuple(token.request.index_values))
+
+
+def command_values(token: Token) -> bytes:
+    return token.request.values.to_bytes() if token.request.values is not None else b""
+
+
+class AppliedCommandsMetricsModel(BaseModel):
+    sent: int
+    skipped: int
+
+
+class _ConnectionCommands:
+    __slots__ = ("values", "scopes")
+
+    def __init__(self) -> None:
+        self.values: Dict[CommandKey, bytes] = {}
+        self.scopes: Dict[Hashable, Set[CommandKey]] = {}
+
+
+class AppliedCommands:
+    """Values last written by the set commands, keyed by the connection, the command and the resource it addresses.
+
+    The values of a connection are dropped when it is lost, the driver's connections can't be referenced weakly.
+    The entries of a resource have to be forgotten when its configuration changes by other means,
+    like a reset of the port, or the values written won't be sent again.
+    """
+
+    __slots__ = ("sent", "skipped", "__connections")
+
+    def __init__(self) -> None:
+        self.sent = 0
+        self.skipped = 0
+        self.__connections: Dict[Any, _ConnectionCommands] = {}
+
+    def __commands(self, connection: Any) -> _ConnectionCommands:
+        if (commands := self.__connections.get(connection)) is None:
+            commands = self.__connections[connection] = _ConnectionCommands()
+
+            async def forget_connection(*_: Any) -> None:
+                if self.__connections.get(connection) is commands:
+                    del self.__connections[connection]
+
+            connection.on_disconnected(forget_connection)
+        return commands
+
+    def changed(self, tokens: Iterable[Token]) -> List[Token]:
+        """The set commands writing other values than the last written ones."""
+        changed = []
+        for token in tokens:
+            commands = self.__connections.get(token.connection)
+            if commands is None or commands.values.get(command_key(token)) != command_values(token):
+                changed.append(token)
+        return changed
+
+    def store(self, tokens: Iterable[Token]) -> None:
+        """Record the values of set commands as written, also the ones equivalent to a configuration just read."""
+        for token in tokens:
+            self.__commands(token.connection).values[command_key(token)] = command_values(token)
+
+    def forget(self, tokens: Iterable[Token]) -> None:
+        for token in tokens:
+            if (commands := self.__connections.get(token.connection)) is not None:
+                commands.values.pop(command_key(token), None)
+
+    def replace_scope(self, scope: Hashable, tokens: Iterable[Token]) -> None:
+        """Forget the values of the commands of the scope that are not part of its new configuration.
+
+        Some commands override others, like the commands of the distributions of an impairment, only the last one sent
+        is in effect, so the values of the others are not in effect any more.
+        """
+        tokens = list(tokens)
+        if not tokens:
+            return None
+        commands = self.__commands(tokens[0].connection)
+        keys = {command_key(token) for token in tokens}
+        for key in commands.scopes.get(scope, set()) - keys:
+            commands.values.pop(key, None)
+        commands.scopes[scope] = keys
+
+    def forget_resource(self, token: Token) -> None:
+        """Forget the values written to the module or port addressed by a command, which doesn't have to be sent."""
+        if (commands := self.__connections.get(token.connection)) is None:
+            return None
+        _, module_index, port_index, _ = command_key(token)
+        for key in [key for key in commands.values if key[1] == module_index and key[2] == port_index]:
+            del commands.values[key]
+
+    def clear(self) -> None:
+        self.__connections.clear()
+
+    def to_model(self) -> AppliedCommandsMetricsModel:
+        return AppliedCommandsMetricsModel(sent=self.sent, skipped=self.skipped)
+
+
+applied_commands = AppliedCommands()
+"""Values written during the session, shared by all the configurators"""
+
+
+async def apply_changed(tokens: Iterable[Token], force: bool = False, scope: Optional[Hashable] = None) -> int:
+    """Send, as one burst per tester connection, only the set commands writing other values than the last written ones.
+
+    The values are recorded also when ``force`` sends all the commands, so a later call can skip them.
+    A failed burst forgets the values of all its commands, some of them may have been applied.
+
+    :param tokens: the set commands of the whole configuration
+    :type tokens: Iterable[Token]
+    :param force: send all the commands, defaults to False
+    :type force: bool, optional
+    :param scope: a group of commands overriding each other, like the driver object of an impairment, see ``AppliedCommands.replace_scope``, defaults to None
+    :type scope: Optional[Hashable], optional
+    :return: number of commands skipped
+    :rtype: int
+    """
+    tokens = list(tokens)
+    if scope is not None:
+        applied_commands.replace_scope(scope, tokens)
+    changed = tokens if force else applied_commands.changed(tokens)
+    skipped = len(tokens) - len(changed)
+    applied_commands.skipped += skipped
+    if not changed:
+        return skipped
+    try:
+        await apply_by_connection(changed)
+    except Exception:
+        applied_commands.forget(changed)
+        raise
+    applied_commands.sent += len(changed)
+    applied_commands.store(changed)
+    return skipped
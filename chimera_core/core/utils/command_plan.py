@@ -0,0 +1,133 @@
+import weakref
+from typing import (
+    Any,
+    Callable,
+    Iterable,
+    Iterator,
+    List,
+    Tuple,
+    Union,
+)
+
+from xoa_driver.v2.misc import Token
+
+
+CommandStep = Tuple[int, Tuple[Union[str, int], ...], Tuple[Any, ...], Tuple[Tuple[str, Any], ...]]
+"""Position of the root object, path of attributes and indices to the command method, positional and keyword arguments."""
+
+
+class _Recorder:
+    """Stands for a driver object, records the command methods called through it instead of building tokens."""
+
+    __slots__ = ("_root", "_path")
+
+    def __init__(self, root: int, path: Tuple[Union[str, int], ...] = ()) -> None:
+        self._root = root
+        self._path = path
+
+    def __getattr__(self, name: str) -> "_Recorder":
+        return _Recorder(self._root, self._path + (name,))
+
+    def __getitem__(self, index: int) -> "_Recorder":
+        return _Recorder(self._root, self._path + (index,))
+
+    def __call__(self, *args: Any, **kwargs: Any) -> CommandStep:
+        return (self._root, self._path, args, tuple(sorted(kwargs.items())))
+
+
+def _freeze(value: Any) -> Any:
+    """The value with its lists turned into tuples, to compare and hash arguments like the entries of a distribution."""
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+class CommandPlan:
+    """The ordered set commands of a configuration, independent of the resource they are sent to.
+
+    Plans are immutable and hashable, equal configurations compile to equal plans.
+    The plans bound by ``bind`` are kept with the plan for as long as their driver objects exist.
+    """
+
+    __slots__ = ("steps", "__key", "__hash", "__bound")
+
+    def __init__(self, steps: Iterable[CommandStep]) -> None:
+        self.steps: Tuple[CommandStep, ...] = tuple(steps)
+        self.__key = _freeze(self.steps)
+        self.__hash = hash(self.__key)
+        self.__bound: "weakref.WeakKeyDictionary[Any, Any]" = weakref.WeakKeyDictionary()
+
+    def __hash__(self) -> int:
+        return self.__hash
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, CommandPlan) and self.__key == other.__key
+
+    def __len__(self) -> int:
+        return len(self.steps)
+
+    def __iter__(self) -> Iterator[CommandStep]:
+        return iter(self.steps)
+
+    def bind(self, *roots: Any) -> "BoundCommandPlan":
+        """The plan bound to driver objects, bound once per driver objects.
+
+        :param roots: the driver objects standing in place of the ones the plan was compiled with
+        :type roots: Any
+        :return: the bound plan
+        :rtype: BoundCommandPlan
+        """
+        # One level per root, so no bound plan outlives any of its driver objects
+        bound = self.__bound
+        for root in roots[:-1]:
+            if (level := bound.get(root)) is None:
+                level = bound[root] = weakref.WeakKeyDictionary()
+            bound = level
+        if (plan := bound.get(roots[-1])) is None:
+            plan = bound[roots[-1]] = BoundCommandPlan(self, roots)
+        return plan
+
+
+class BoundCommandPlan:
+    """A plan with its commands built for driver objects, replaying it only wraps them in new tokens.
+
+    The requests are encoded once and shared by all the replays, the driver only stamps them with an identifier when sending.
+    """
+
+    __slots__ = ("plan", "__requests")
+
+    def __init__(self, plan: CommandPlan, roots: Tuple[Any, ...]) -> None:
+        self.plan = plan
+        self.__requests: List[Tuple[Any, Any]] = []
+        for root, path, args, kwargs in plan.steps:
+            command = roots[root]
+            for name in path:
+                command = command[name] if isinstance(name, int) else getattr(command, name)
+            token = command(*args, **dict(kwargs))
+            self.__requests.append((token.connection, token.request))
+
+    def tokens(self) -> List[Token]:
+        """New tokens of the commands, in the order of the plan."""
+        return [Token(connection, request) for connection, request in self.__requests]
+
+
+def compile_plan(apply: Callable[..., Iterable[Any]], roots: int = 1) -> CommandPlan:
+    """Compile the commands a configuration generates into a plan.
+
+    ``apply`` is called with stand-ins of its driver objects, it must only access attributes
+    and indices of them and call their command methods, the arguments have to be hashable once their lists are turned into tuples.
+
+    .. code-block:: python
+
+        plan = compile_plan(config._apply)
+        await apply_changed(plan.bind(flow.drop).tokens())
+
+    :param apply: the function generating the commands of the configuration, like ``_apply``
+    :type apply: Callable[..., Iterable[Any]]
+    :param roots: number of driver objects ``apply`` takes, defaults to 1
+    :type roots: int, optional
+    :raises TypeError: an argument of a command is not hashable
+    :return: the plan
+    :rtype: CommandPlan
+    """
+    return CommandPlan(apply(*(_Recorder(root) for root in range(roots))))
@@ -1,25 +1,45 @@
 import asyncio
 import collections
+import inspect
 from contextlib import suppress
 from typing import (
+    Awaitable,
     Dict,
     Generic,
     List,
     Callable,
     Any,
     Coroutine,
+    Optional,
+    Tuple,
     TypeVar,
+    Union,
 )
 import warnings
-CB = Callable[..., Coroutine[Any, None, None]]
+CB = Callable[..., Union[Coroutine[Any, None, None], None]]
 T = TypeVar("T")
 
 
+async def _await(awaitable: Awaitable) -> None:
+    await awaitable
+
+
 class SimpleObserver(Generic[T]):
-    __slots__ = ("__events", "__pass_event")
+    """Dispatch events to the subscribed callbacks.
+
+    By default every callback is scheduled as a separate task.
+    In ``ordered`` mode callbacks are executed one after another, in the order of emitting,
+    by a single long-lived worker, plain functions are called synchronously when nothing is pending.
+    """
 
-    def __init__(self, *, pass_event: bool = False) -> None:
+    __slots__ = ("__events", "__pass_event", "__ordered", "__queue", "__worker", "__pending")
+
+    def __init__(self, *, pass_event: bool = False, ordered: bool = False) -> None:
         self.__pass_event = pass_event
+        self.__ordered = ordered
+        self.__queue: Optional["asyncio.Queue[Tuple[CB, tuple, dict]]"] = None
+        self.__worker: Optional["asyncio.Task"] = None
+        self.__pending = 0
         self.reset()
 
     def __handle_exceptions(self, task: "asyncio.Task") -> None:
@@ -33,8 +53,56 @@ class SimpleObserver(Generic[T]):
     def subscribe(self, evt: T, func: CB) -> None:
         self.__events[evt].append(func)
 
+    async def __work(self, queue: "asyncio.Queue[Tuple[CB, tuple, dict]]") -> None:
+        while True:
+            action, args, kwargs = await queue.get()
+            try:
+                result = action(*args, **kwargs)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception as e:
+                warnings.warn(str(e))
+            finally:
+                self.__pending -= 1
+                queue.task_done()
+
+    def __dispatch_ordered(self, action: CB, args: tuple, kwargs: dict) -> None:
+        if not self.__pending and not asyncio.iscoroutinefunction(action):
+            try:
+                result = action(*args, **kwargs)
+            except Exception as e:
+                warnings.warn(str(e))
+                return None
+            if not inspect.isawaitable(result):
+                return None
+            # Like a partial of a coroutine function, only known to be asynchronous once called
+            action, args, kwargs = _await, (result,), {}
+        if not self.__queue or not self.__worker:
+            self.__queue = asyncio.Queue()
+            self.__worker = asyncio.create_task(self.__work(self.__queue), name="SimpleObserver[worker]")
+        self.__pending += 1
+        self.__queue.put_nowait((action, args, kwargs))
+
     def emit(self, evt: T, *args, **kwargs) -> None:
         kwargs_ = {**kwargs, "event": evt} if self.__pass_event else kwargs
         for action in self.__events[evt]:
-            task = asyncio.create_task(action(*args, **kwargs_))
+            if self.__ordered:
+                self.__dispatch_ordered(action, args, kwargs_)
+                continue
+            task = asyncio.create_task(action(*args, **kwargs_))  # type: ignore
             task.add_done_callback(self.__handle_exceptions)
+
+    async def join(self) -> None:
+        """Wait until all the emitted events of the ordered mode are handled."""
+        if self.__queue:
+            await self.__queue.join()
+
+    async def close(self) -> None:
+        """Stop the worker of the ordered mode, pending callbacks are dropped."""
+        if not self.__worker:
+            return None
+        self.__worker.cancel()
+        with suppress(asyncio.CancelledError):
+            await self.__worker
+        self.__worker = self.__queue = None
+        self.__pending = 0
@@ -0,0 +1,121 @@
+import asyncio
+import copy
+import time
+import weakref
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Generic,
+    MutableMapping,
+    Optional,
+    Sequence,
+    TypeVar,
+)
+
+from pydantic import BaseModel
+
+
+T = TypeVar("T")
+
+
+class ReadCacheMetricsModel(BaseModel):
+    hits: int
+    misses: int
+    invalidations: int
+
+
+class ReadCacheMetrics:
+    __slots__ = ("hits", "misses", "invalidations")
+
+    def __init__(self) -> None:
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def to_model(self) -> ReadCacheMetricsModel:
+        return ReadCacheMetricsModel(hits=self.hits, misses=self.misses, invalidations=self.invalidations)
+
+
+read_cache_metrics = ReadCacheMetrics()
+"""Counters of all the read caches of the session"""
+
+
+class ReadCache(Generic[T]):
+    """Last value read from a resource, returned while younger than the age the caller accepts.
+
+    Concurrent reads of an expired value share one read of the resource.
+    """
+
+    __slots__ = ("__value", "__read_at", "__pending", "__generation")
+
+    def __init__(self) -> None:
+        self.__value: Optional[T] = None
+        self.__read_at: Optional[float] = None
+        self.__pending: Optional["asyncio.Future[T]"] = None
+        self.__generation = 0
+        """Incremented by every invalidation, a read started before one is not cached"""
+
+    def invalidate(self, *_: Any) -> None:
+        self.__generation += 1
+        self.__read_at = None
+        self.__pending = None
+        read_cache_metrics.invalidations += 1
+
+    async def __read(self, load: Callable[[], Awaitable[T]]) -> T:
+        generation = self.__generation
+        value = await load()
+        if generation == self.__generation:
+            self.__value, self.__read_at = value, time.monotonic()
+        return value
+
+    async def get(self, load: Callable[[], Awaitable[T]], max_age: Optional[float]) -> T:
+        """The cached value when younger than ``max_age``, otherwise the value read by ``load``.
+
+        :param load: read the value from the resource
+        :type load: Callable[[], Awaitable[T]]
+        :param max_age: seconds the cached value may be old, None to always read
+        :type max_age: Optional[float]
+        :return: a copy of the value
+        :rtype: T
+        """
+        if max_age is None:
+            return await self.__read(load)
+        if self.__read_at is not None and time.monotonic() - self.__read_at <= max_age:
+            read_cache_metrics.hits += 1
+            return copy.deepcopy(self.__value)  # type: ignore[return-value]
+        read_cache_metrics.misses += 1
+        if self.__pending is None or self.__pending.done():
+            self.__pending = asyncio.ensure_future(self.__read(load))
+        return copy.deepcopy(await asyncio.shield(self.__pending))
+
+
+_caches: MutableMapping[Any, ReadCache] = weakref.WeakKeyDictionary()
+
+
+def get_read_cache(resource: Any, events: Sequence[str]) -> ReadCache:
+    """The read cache of a resource, invalidated by the change events of the driver the resource has among ``events``.
+
+    :param resource: the module or port
+    :type resource: Any
+    :param events: names of the ``on_<...>_change`` methods to subscribe to
+    :type events: Sequence[str]
+    :raises AttributeError: the resource has no such change event
+    :return: the read cache of the resource
+    :rtype: ReadCache
+    """
+    if (cache := _caches.get(resource)) is None:
+        subscribers = []
+        for event in events:
+            if (subscribe := getattr(resource, event, None)) is None:
+                raise AttributeError(f"{type(resource).__name__} has no change event {event}.")
+            subscribers.append(subscribe)
+        cache = _caches[resource] = ReadCache()
+
+        async def invalidate(*_: Any) -> None:
+            cache.invalidate()
+
+        # The driver offers no way to unsubscribe, the cache lives as long as the resource
+        for subscribe in subscribers:
+            subscribe(invalidate)
+    return cache
@@ -0,0 +1,62 @@
+import asyncio
+import collections
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+
+from xoa_driver import utils
+from xoa_driver.v2.misc import Token
+
+
+Timing = Tuple[float, float]
+"""Unix times when the commands of the connection were sent and when the response was received."""
+
+
+async def apply_by_connection_timed(tokens: Sequence[Token], return_exceptions: bool = False) -> Tuple[List[Any], List[Timing]]:
+    """Send the commands as one burst per tester connection, all connections concurrently, timing every response.
+
+    ``utils.apply`` sends every command through the connection of the first one,
+    so commands addressed to several testers have to be split before sending.
+
+    :param tokens: the commands to send
+    :type tokens: Sequence[Token]
+    :param return_exceptions: return the failed commands errors instead of raising, defaults to False
+    :type return_exceptions: bool, optional
+    :return: the responses and their timings in the order of the commands
+    :rtype: Tuple[List[Any], List[Timing]]
+    """
+    groups: Dict[int, List[int]] = collections.defaultdict(list)
+    for position, token in enumerate(tokens):
+        groups[id(token.connection)].append(position)
+
+    async def send(positions: List[int]) -> List[Tuple[Any, Timing]]:
+        results = []
+        sent_at = time.time()
+        async for response in utils.apply_iter(
+            *(tokens[position] for position in positions),
+            return_exceptions=return_exceptions,
+        ):
+            results.append((response, (sent_at, time.time())))
+        return results
+
+    results = await asyncio.gather(*(send(positions) for positions in groups.values()))
+    responses: List[Any] = [None] * len(tokens)
+    timings: List[Timing] = [(0.0, 0.0)] * len(tokens)
+    for positions, values in zip(groups.values(), results):
+        for position, (response, timing) in zip(positions, values):
+            responses[position] = response
+            timings[position] = timing
+    return responses, timings
+
+
+async def apply_by_connection(tokens: Sequence[Token], return_exceptions: bool = False) -> List[Any]:
+    """Send the commands as one burst per tester connection, all connections concurrently.
+
+    :param tokens: the commands to send
+    :type tokens: Sequence[Token]
+    :param return_exceptions: return the failed commands errors instead of raising, defaults to False
+    :type return_exceptions: bool, optional
+    :return: the responses in the order of the commands
+    :rtype: List[Any]
+    """
+    responses, _ = await apply_by_connection_timed(tokens, return_exceptions)
+    return responses
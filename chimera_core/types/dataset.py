@@ -4,7 +4,7 @@ from xoa_driver.v2.misc import Hex
 from chimera_core.core.resources.types import Credentials, EProductType
 from chimera_core.core.manager.flow.shadow_filter.__dataset import ProtocolSegement
 from chimera_core.core.messenger.misc import EMsgType, Message
-from chimera_core.core.const import (PIPE_RESOURCES, PIPE_STATISTICS)
+from chimera_core.core.const import (PIPE_RESOURCES, PIPE_STATISTICS, PIPE_MESSENGER)
 from chimera_core.core.manager.tester import TesterManager
 from chimera_core.core.manager.module import ModuleManager
 from chimera_core.core.manager.port import PortManager, CustomDistribution
@@ -14,6 +14,7 @@ __all__ = (
     "Hex",
     "PIPE_RESOURCES",
     "PIPE_STATISTICS",
+    "PIPE_MESSENGER",
     "Credentials",
     "ProtocolSegement",
     "EMsgType",
@@ -0,0 +1,135 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Callable, List, Optional
+
+from xoa_driver.enums import ReservedStatus
+from xoa_driver.v2.misc import Token
+
+from chimera_core.core.manager.__base import ReserveMixin
+
+
+class FakeConnection:
+    """Stands for a tester connection, records the requests of every burst and answers them at once."""
+
+    def __init__(self, error: Optional[Exception] = None) -> None:
+        self.error = error
+        """Error answered to every request, None to succeed"""
+        self.bursts: List[List[Any]] = []
+        self.__pending: List[Any] = []
+        self.__disconnected: List[Callable] = []
+
+    async def prepare_data(self, request: Any) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        if self.error is not None:
+            future.set_exception(self.error)
+        else:
+            future.set_result(request.response() if callable(getattr(request, "response", None)) else None)
+        self.__pending.append(request)
+        return b"", future
+
+    def send(self, data: bytes) -> None:
+        self.bursts.append(self.__pending)
+        self.__pending = []
+
+    def on_disconnected(self, callback: Callable) -> None:
+        self.__disconnected.append(callback)
+
+    async def disconnect(self) -> None:
+        await asyncio.gather(*(callback(None) for callback in self.__disconnected))
+
+
+class FakeRequest:
+    def __init__(self, response: Callable[[], Any]) -> None:
+        self.response = response
+
+
+class FakeReservation:
+    def __init__(self, resource: "FakeResource") -> None:
+        self.resource = resource
+
+    def get(self) -> Token:
+        return Token(self.resource.conn, FakeRequest(lambda: SimpleNamespace(status=self.resource.granted)))
+
+    async def set_reserve(self) -> None:
+        self.resource.calls.append("reserve")
+        if self.resource.silent:
+            self.resource.granted = ReservedStatus.RESERVED_BY_YOU.value
+        elif not self.resource.stuck:
+            self.resource.notify(ReservedStatus.RESERVED_BY_YOU)
+
+    async def set_release(self) -> None:
+        self.resource.calls.append("release")
+        self.resource.notify(ReservedStatus.RELEASED)
+
+    async def set_relinquish(self) -> None:
+        self.resource.calls.append("relinquish")
+        self.resource.notify(ReservedStatus.RELEASED)
+
+
+class FakeResource:
+    """Stands for a module or port of the driver, its reservation changes as the commands are sent."""
+
+    def __init__(
+        self,
+        conn: FakeConnection,
+        status: ReservedStatus = ReservedStatus.RELEASED,
+        stuck: bool = False,
+        silent: bool = False,
+        name: str = "fake",
+    ) -> None:
+        self.conn = conn
+        self.info = SimpleNamespace(reservation=status.value, host=name)
+        self.granted = status.value
+        """Reservation answered by the tester, the one of ``info`` is the one last notified"""
+        self.reservation = FakeReservation(self)
+        self.calls: List[str] = []
+        self.stuck = stuck
+        """Reserving is never acknowledged"""
+        self.silent = silent
+        """Reserving is granted without notifying the change"""
+        self.__callbacks: List[Callable] = []
+
+    def on_reservation_change(self, callback: Callable) -> None:
+        self.__callbacks.append(callback)
+
+    def notify(self, status: ReservedStatus) -> None:
+        self.info.reservation = self.granted = status.value
+        for callback in self.__callbacks:
+            asyncio.get_running_loop().create_task(callback(None))
+
+
+class FakeManager(ReserveMixin):
+    """Stands for the manager of a fake resource, resetting it only counts the resets."""
+
+    def __init__(self, resource: FakeResource) -> None:
+        self.resource_instance = resource  # type: ignore[assignment]
+        self.resets = 0
+
+    async def reset(self) -> None:
+        self.resets += 1
+
+
+class FakeFacade:
+    def __init__(self) -> None:
+        self.warnings: List[Any] = []
+        self.errors: List[Any] = []
+        self.progress: List[int] = []
+
+    def send_warning(self, warning: Any) -> None:
+        self.warnings.append(warning)
+
+    def send_error(self, error: Any) -> None:
+        self.errors.append(error)
+
+    def send_progress(self, progress: int) -> None:
+        self.progress.append(progress)
+
+
+class FakePipe:
+    """Stands for the messages pipe, every message sent is recorded by its facade."""
+
+    def __init__(self) -> None:
+        self.facade = FakeFacade()
+
+    def get_facade(self) -> FakeFacade:
+        return self.facade
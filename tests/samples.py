@@ -0,0 +1,30 @@
+from typing import Dict, Optional
+
+from chimera_core.core.statistics.__dataset import (
+    FLOW_COUNTERS,
+    PORT_COUNTERS,
+    FlowStatistics,
+    PortStatistics,
+    StatisticsSnapshot,
+)
+
+
+def flow_statistics(flow: int, **counters: int) -> FlowStatistics:
+    return FlowStatistics(flow=flow, counters={name: counters.get(name, 0) for name in FLOW_COUNTERS})
+
+
+def port_statistics(port: str, at: float, flows: Optional[Dict[int, Dict[str, int]]] = None, **counters: int) -> PortStatistics:
+    """Statistics of a port sampled at ``at``, the counters not given are zero."""
+    return PortStatistics(
+        port=port,
+        module_id=0,
+        port_id=0,
+        counters={name: counters.get(name, 0) for name in PORT_COUNTERS},
+        flows=[flow_statistics(flow, **values) for flow, values in (flows or {}).items()],
+        sent_at=at,
+        received_at=at,
+    )
+
+
+def statistics_snapshot(round: int, at: float, *ports: PortStatistics) -> StatisticsSnapshot:
+    return StatisticsSnapshot(round=round, timestamp=at, ports=list(ports))
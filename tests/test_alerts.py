@@ -0,0 +1,83 @@
+from typing import List
+
+import pytest
+
+from chimera_core.core.statistics.__dataset import Alert, DeviationRule, RateOfChangeRule, ThresholdRule
+from chimera_core.core.statistics.alerts import AlertEngine
+from chimera_core.core.statistics.derived import DerivedStatistics
+from tests.fakes import FakePipe
+from tests.samples import port_statistics, statistics_snapshot
+
+
+def evaluate(engine: AlertEngine, values: List[int], metric: str = "delayed") -> List[int]:
+    """Rounds, one per second, raising an alert for the port totals."""
+    alerted = []
+    for second, value in enumerate(values):
+        if engine.evaluate(statistics_snapshot(second, float(second), port_statistics("p", float(second), **{metric: value}))):
+            alerted.append(second)
+    return alerted
+
+
+def test_threshold_alerts_once_per_violation() -> None:
+    pipe = FakePipe()
+    engine = AlertEngine(pipe)  # type: ignore[arg-type]
+    engine.add_rule(ThresholdRule("high", "counters.delayed", above=10, totals=True))
+    assert evaluate(engine, [5, 11, 12, 5, 15]) == [1, 4]
+    assert [warning.alert.value for warning in pipe.facade.warnings] == [11, 15]
+
+
+def test_threshold_below() -> None:
+    engine = AlertEngine(FakePipe())  # type: ignore[arg-type]
+    engine.add_rule(ThresholdRule("low", "counters.delayed", below=10, totals=True))
+    assert evaluate(engine, [20, 5, 20]) == [1]
+
+
+def test_consecutive_rounds_before_alerting() -> None:
+    engine = AlertEngine(FakePipe())  # type: ignore[arg-type]
+    engine.add_rule(ThresholdRule("high", "counters.delayed", above=10, totals=True, rounds=3))
+    assert evaluate(engine, [11, 11, 5, 11, 11, 11, 11]) == [5]
+
+
+def test_cooldown_holds_back_a_new_alert() -> None:
+    engine = AlertEngine(FakePipe())  # type: ignore[arg-type]
+    engine.add_rule(ThresholdRule("high", "counters.delayed", above=10, totals=True, cooldown=3.0))
+    assert evaluate(engine, [11, 5, 11, 5, 11, 5, 11]) == [0, 4]
+
+
+def test_rate_of_change() -> None:
+    engine = AlertEngine(FakePipe())  # type: ignore[arg-type]
+    engine.add_rule(RateOfChangeRule("jump", "counters.delayed", max_increase=50, max_decrease=50, totals=True))
+    assert evaluate(engine, [0, 10, 100, 110, 20]) == [2, 4]
+
+
+def test_rules_select_the_flows_by_default() -> None:
+    engine = AlertEngine(FakePipe())  # type: ignore[arg-type]
+    engine.add_rule(ThresholdRule("high", "counters.delayed", above=10))
+    snapshot = statistics_snapshot(0, 0.0, port_statistics("p", 0.0, {1: {"delayed": 20}, 2: {"delayed": 5}}, delayed=20))
+    assert [(alert.port, alert.flow) for alert in engine.evaluate(snapshot)] == [("p", 1)]
+
+
+def test_deviation_from_the_configured_ratio() -> None:
+    engine, derived = AlertEngine(FakePipe()), DerivedStatistics()  # type: ignore[arg-type]
+    engine.add_rule(DeviationRule("drop", min_packets=1000))
+    derived.expect("p", 1, drop=10_000)
+    alerted = []
+    for second, dropped in enumerate((0, 100, 200, 500)):
+        snapshot = statistics_snapshot(second, float(second), port_statistics("p", float(second), {1: {"rx_packets": second * 10_000, "dropped_total": dropped}}))
+        derived.add(snapshot)
+        alerted += [alert.value for alert in engine.evaluate(snapshot)]
+    # 1% is expected, 3% of the last round is far more than three sigmas of 10000 packets
+    assert alerted == [pytest.approx(0.03)]
+
+
+def test_on_alert_and_rule_validation() -> None:
+    engine = AlertEngine(FakePipe())  # type: ignore[arg-type]
+    received: List[Alert] = []
+    engine.on_alert(received.append)
+    engine.add_rule(ThresholdRule("high", "counters.delayed", above=10, totals=True))
+    evaluate(engine, [11])
+    assert [alert.rule for alert in received] == ["high"]
+    with pytest.raises(KeyError):
+        engine.add_rule(DeviationRule("loss", impairment="loss"))
+    with pytest.raises(ValueError):
+        engine.add_rule(ThresholdRule("never", "counters.delayed", rounds=0))
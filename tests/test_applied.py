@@ -0,0 +1,75 @@
+import asyncio
+
+from xoa_driver.internals.commands.p_commands import P_COMMENT
+
+from chimera_core.core.utils.applied import applied_commands, apply_changed
+from tests.fakes import FakeConnection
+
+
+def setup_function() -> None:
+    applied_commands.clear()
+
+
+def test_skips_the_values_last_written() -> None:
+    conn = FakeConnection()
+
+    async def main() -> None:
+        assert await apply_changed([P_COMMENT(conn, 0, 0).set("a"), P_COMMENT(conn, 0, 1).set("b")]) == 0
+        assert await apply_changed([P_COMMENT(conn, 0, 0).set("a"), P_COMMENT(conn, 0, 1).set("c")]) == 1
+
+    asyncio.run(main())
+    assert [len(burst) for burst in conn.bursts] == [2, 1]
+    assert conn.bursts[1][0].header.port_index == 1
+
+
+def test_force_sends_everything() -> None:
+    conn = FakeConnection()
+
+    async def main() -> None:
+        await apply_changed([P_COMMENT(conn, 0, 0).set("a")])
+        assert await apply_changed([P_COMMENT(conn, 0, 0).set("a")], force=True) == 0
+
+    asyncio.run(main())
+    assert len(conn.bursts) == 2
+
+
+def test_forget_invalidates() -> None:
+    conn = FakeConnection()
+
+    async def main() -> None:
+        await apply_changed([P_COMMENT(conn, 0, 0).set("a"), P_COMMENT(conn, 0, 1).set("a")])
+        applied_commands.forget([P_COMMENT(conn, 0, 0).set("a")])
+        assert await apply_changed([P_COMMENT(conn, 0, 0).set("a"), P_COMMENT(conn, 0, 1).set("a")]) == 1
+        applied_commands.forget_resource(P_COMMENT(conn, 0, 1).set(""))
+        assert await apply_changed([P_COMMENT(conn, 0, 0).set("a"), P_COMMENT(conn, 0, 1).set("a")]) == 1
+
+    asyncio.run(main())
+    assert [[request.header.port_index for request in burst] for burst in conn.bursts] == [[0, 1], [0], [1]]
+
+
+def test_failed_burst_is_not_recorded() -> None:
+    conn = FakeConnection(error=RuntimeError("rejected"))
+
+    async def main() -> None:
+        try:
+            await apply_changed([P_COMMENT(conn, 0, 0).set("a")])
+        except RuntimeError:
+            pass
+        conn.error = None
+        assert await apply_changed([P_COMMENT(conn, 0, 0).set("a")]) == 0
+
+    asyncio.run(main())
+    assert len(conn.bursts) == 2
+
+
+def test_values_are_dropped_with_their_connection() -> None:
+    conn, other = FakeConnection(), FakeConnection()
+
+    async def main() -> None:
+        await apply_changed([P_COMMENT(conn, 0, 0).set("a"), P_COMMENT(other, 0, 0).set("a")])
+        await conn.disconnect()
+        assert await apply_changed([P_COMMENT(conn, 0, 0).set("a"), P_COMMENT(other, 0, 0).set("a")]) == 1
+
+    asyncio.run(main())
+    assert len(conn.bursts) == 2
+    assert len(other.bursts) == 1
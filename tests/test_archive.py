@@ -0,0 +1,48 @@
+import pytest
+
+from chimera_core.core.statistics.archive import ArchiveReader, ArchiveWriter
+from tests.samples import port_statistics, statistics_snapshot
+
+
+def write(writer: ArchiveWriter, seconds: range) -> None:
+    for second in seconds:
+        at = float(second)
+        writer.add(statistics_snapshot(second, at, port_statistics("port/a", at, {1: {"rx_packets": second * 10}}, delayed=second)))
+
+
+def test_round_trip(tmp_path) -> None:
+    with ArchiveWriter(tmp_path, chunk_records=4, index_stride=2) as writer:
+        write(writer, range(10))
+    reader = ArchiveReader(tmp_path)
+    assert set(reader.keys) == {("port/a", None), ("port/a", 1)}
+    totals = reader.view("port/a")
+    assert totals["timestamp"].tolist() == [float(second) for second in range(10)]
+    assert totals["delayed"].tolist() == list(range(10))
+    assert reader.view("port/a", 1)["rx_packets"].tolist() == [second * 10 for second in range(10)]
+    with pytest.raises(KeyError):
+        reader.view("port/b")
+
+
+def test_range_queries_with_the_sparse_index(tmp_path) -> None:
+    with ArchiveWriter(tmp_path, chunk_records=3, index_stride=2) as writer:
+        write(writer, range(11))
+    reader = ArchiveReader(tmp_path)
+    assert reader.range("port/a", start=3.0, end=7.0)["delayed"].tolist() == [3, 4, 5, 6, 7]
+    assert reader.range("port/a", start=2.5, end=2.9)["delayed"].tolist() == []
+    assert reader.range("port/a", start=9.0)["delayed"].tolist() == [9, 10]
+    assert reader.range("port/a", end=0.0)["delayed"].tolist() == [0]
+
+
+def test_reader_follows_a_writer_and_a_reopened_archive(tmp_path) -> None:
+    writer = ArchiveWriter(tmp_path, chunk_records=2)
+    write(writer, range(3))
+    writer.flush()
+    reader = ArchiveReader(tmp_path)
+    assert len(reader.view("port/a")) == 3
+    write(writer, range(3, 5))
+    writer.close()
+    assert len(reader.view("port/a")) == 5
+    with ArchiveWriter(tmp_path, chunk_records=2) as reopened:
+        write(reopened, range(5, 6))
+    reader.refresh()
+    assert reader.view("port/a")["delayed"].tolist() == list(range(6))
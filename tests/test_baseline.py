@@ -0,0 +1,56 @@
+import pytest
+
+from chimera_core.core.statistics.baseline import StatisticsBaselines
+from tests.samples import port_statistics, statistics_snapshot
+
+
+def add(baselines: StatisticsBaselines, at: float, delayed: int, flows=None) -> None:
+    baselines.add(statistics_snapshot(0, at, port_statistics("p", at, flows, delayed=delayed)))
+
+
+def delta(baselines: StatisticsBaselines, name: str, flow=None, counter: str = "delayed") -> int:
+    return next(item.counters[counter] for item in baselines.deltas(name).deltas if item.flow == flow)
+
+
+def test_deltas_since_a_checkpoint() -> None:
+    baselines = StatisticsBaselines()
+    add(baselines, 1.0, 100)
+    add(baselines, 2.0, 150)
+    assert baselines.checkpoint("start") == 2.0
+    add(baselines, 3.0, 180)
+    deltas = baselines.deltas("start")
+    assert (deltas.since, deltas.timestamp) == (2.0, 3.0)
+    assert delta(baselines, "start") == 30
+
+
+def test_cleared_counters_keep_counting() -> None:
+    baselines = StatisticsBaselines()
+    add(baselines, 1.0, 100)
+    baselines.checkpoint("start")
+    add(baselines, 2.0, 120)
+    # Cleared on the tester, then counted again from zero
+    add(baselines, 3.0, 15)
+    assert delta(baselines, "start") == 35
+
+
+def test_flows_first_seen_after_the_checkpoint() -> None:
+    baselines = StatisticsBaselines()
+    add(baselines, 1.0, 0)
+    baselines.checkpoint("start")
+    add(baselines, 2.0, 0, {1: {"rx_packets": 500}})
+    add(baselines, 3.0, 0, {1: {"rx_packets": 800}})
+    assert delta(baselines, "start", flow=1, counter="rx_packets") == 300
+
+
+def test_checkpoints_are_replaced_and_removed() -> None:
+    baselines = StatisticsBaselines()
+    add(baselines, 1.0, 10)
+    baselines.checkpoint("a")
+    add(baselines, 2.0, 20)
+    baselines.checkpoint("a")
+    add(baselines, 3.0, 25)
+    assert delta(baselines, "a") == 5
+    baselines.remove("a")
+    assert baselines.checkpoints == ()
+    with pytest.raises(KeyError):
+        baselines.deltas("a")
@@ -0,0 +1,42 @@
+import gc
+import weakref
+from typing import Any, List
+
+from xoa_driver.internals.commands.p_commands import P_COMMENT
+
+from chimera_core.core.utils.command_plan import compile_plan
+from tests.fakes import FakeConnection
+
+
+class FakeComment:
+    def __init__(self, conn: FakeConnection) -> None:
+        self.conn = conn
+
+    def set(self, comment: str, entries: Any = None) -> Any:
+        return P_COMMENT(self.conn, 0, 0).set(comment)
+
+
+class FakeRoot:
+    def __init__(self) -> None:
+        self.comment = FakeComment(FakeConnection())
+
+
+def apply(root: Any) -> List[Any]:
+    return [root.comment.set("a", entries=[1, [2, 3]])]
+
+
+def test_plans_with_list_arguments_are_hashable() -> None:
+    assert compile_plan(apply) == compile_plan(apply)
+    assert hash(compile_plan(apply)) == hash(compile_plan(apply))
+
+
+def test_bound_plans_are_reused_and_released_with_their_root() -> None:
+    plan = compile_plan(apply)
+    root = FakeRoot()
+    bound = plan.bind(root)
+    assert plan.bind(root) is bound
+    assert bound.tokens()[0].connection is root.comment.conn
+    released = weakref.ref(root)
+    del root, bound
+    gc.collect()
+    assert released() is None
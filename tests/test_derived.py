@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from chimera_core.core.statistics.derived import COUNTER_MODULO, DerivedStatistics, counter_deltas
+from tests.samples import port_statistics, statistics_snapshot
+
+
+def snapshot(round: int, at: float, rx_packets: int, dropped_total: int, rx_bytes: int = 0):
+    return statistics_snapshot(
+        round,
+        at,
+        port_statistics("p", at, {1: {"rx_packets": rx_packets, "rx_bytes": rx_bytes, "dropped_total": dropped_total}}, dropped_total=dropped_total),
+    )
+
+
+def test_counter_deltas() -> None:
+    previous = np.array([10, 500, COUNTER_MODULO - 5], dtype=np.uint64)
+    current = np.array([25, 20, 10], dtype=np.uint64)
+    # Increment, cleared counter counted from zero, wrapped counter
+    assert counter_deltas(previous, current).tolist() == [15, 20, 15]
+
+
+def test_first_sample_derives_nothing() -> None:
+    derived = DerivedStatistics()
+    first = snapshot(0, 1.0, 100, 0)
+    derived.add(first)
+    assert first.derived is None
+
+
+def test_rates_and_ratios() -> None:
+    derived = DerivedStatistics()
+    derived.expect("p", 1, drop=10_000)
+    derived.update(snapshot(0, 1.0, 1_000, 0, 0))
+    result = derived.update(snapshot(1, 3.0, 3_000, 20, 1_000))
+    assert result is not None and result.interval == 2.0
+    port = result.ports[0]
+    assert port.rates["dropped_total"] == 10.0
+    flow = port.flows[0]
+    assert flow.rates["rx_packets"] == 1_000.0
+    assert flow.rates["rx_bps"] == 4_000.0
+    assert flow.ratios["drop"] == pytest.approx(0.01)
+    assert flow.expected == {"drop": 0.01}
+
+
+def test_no_received_packets_gives_zero_ratios() -> None:
+    derived = DerivedStatistics()
+    derived.update(snapshot(0, 1.0, 100, 5))
+    result = derived.update(snapshot(1, 2.0, 100, 5))
+    assert result is not None
+    assert set(result.ports[0].flows[0].ratios.values()) == {0.0}
+
+
+def test_no_elapsed_time_derives_nothing() -> None:
+    derived = DerivedStatistics()
+    derived.update(snapshot(0, 1.0, 100, 0))
+    assert derived.update(snapshot(1, 1.0, 200, 0)) is None
+    # A port read at the same time in a later round has no interval either
+    result = derived.update(statistics_snapshot(2, 2.0, port_statistics("p", 1.0)))
+    assert result is not None and result.ports == []
+
+
+def test_counter_reset_is_counted_from_zero() -> None:
+    derived = DerivedStatistics()
+    derived.update(snapshot(0, 1.0, 10_000, 100))
+    result = derived.update(snapshot(1, 2.0, 400, 4))
+    assert result is not None
+    flow = result.ports[0].flows[0]
+    assert flow.rates["rx_packets"] == 400.0
+    assert flow.ratios["drop"] == pytest.approx(0.01)
+
+
+def test_unknown_expectations_are_rejected() -> None:
+    with pytest.raises(KeyError):
+        DerivedStatistics().expect("p", 1, loss=1)
@@ -0,0 +1,60 @@
+import pytest
+
+from chimera_core.core.manager.flow.distributions.__dataset import ConstantDelay, FixedRate, Gaussian, RandomBurst
+from chimera_core.core.statistics.effectiveness import EffectivenessAnalyzer, _duty_cycle, expected_ratio
+from tests.samples import port_statistics, statistics_snapshot
+
+
+def fixed_rate(probability: int) -> FixedRate:
+    distribution = FixedRate(probability=probability)
+    distribution.continuous()
+    return distribution
+
+
+def test_duty_cycle_of_the_schedule() -> None:
+    distribution = fixed_rate(10_000)
+    assert _duty_cycle(distribution) == 1.0
+    distribution.repeat_pattern(duration=25, period=100)
+    assert _duty_cycle(distribution) == 0.25
+    distribution.repeat_pattern(duration=200, period=100)
+    assert _duty_cycle(distribution) == 1.0
+    # Not scheduled yet, or without a schedule at all
+    assert _duty_cycle(FixedRate(probability=1)) == 1.0
+    assert _duty_cycle(ConstantDelay(delay=1)) == 1.0
+
+
+def test_expected_ratios() -> None:
+    distribution = fixed_rate(10_000)
+    distribution.repeat_pattern(duration=50, period=100)
+    assert expected_ratio(distribution).ratio == pytest.approx(0.005)
+    gaussian = Gaussian(mean=20, sd=1)
+    gaussian.continuous()
+    assert expected_ratio(gaussian).ratio == pytest.approx(0.05)
+    burst = RandomBurst(minimum=1, maximum=3, probability=100_000)
+    burst.continuous()
+    assert expected_ratio(burst).ratio == pytest.approx(0.2 / 1.2)
+    assert expected_ratio(ConstantDelay(delay=1)) is None
+
+
+def report(analyzer: EffectivenessAnalyzer, packets: int, dropped: int):
+    snapshot = statistics_snapshot(0, 1.0, port_statistics("p", 1.0, {1: {"rx_packets": packets, "dropped_programmed": dropped}}))
+    return analyzer.report(snapshot).flows[0]
+
+
+def test_report_passes_within_the_confidence_interval() -> None:
+    analyzer = EffectivenessAnalyzer()
+    analyzer.expect("p", 1, "drop", fixed_rate(10_000))
+    assert report(analyzer, 100_000, 1_020).passed is True
+    assert report(analyzer, 100_000, 2_000).passed is False
+    # Too few packets to decide
+    flow = report(analyzer, 100, 50)
+    assert flow.passed is None and flow.impairments[0].observed == 0.5
+
+
+def test_expectations_are_validated_and_forgotten() -> None:
+    analyzer = EffectivenessAnalyzer()
+    with pytest.raises(KeyError):
+        analyzer.expect("p", 1, "latency", fixed_rate(1))
+    analyzer.expect("p", 1, "drop", fixed_rate(10_000))
+    analyzer.forget("p")
+    assert analyzer.report(statistics_snapshot(0, 1.0, port_statistics("p", 1.0, {1: {}}))).flows == []
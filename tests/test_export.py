@@ -0,0 +1,62 @@
+import csv
+
+import pytest
+
+from chimera_core.core.statistics.export import COLUMNS, CSV, StatisticsExporter, export_store, resolve_format
+from chimera_core.core.statistics.store import StatisticsStore
+from tests.samples import port_statistics, statistics_snapshot
+
+
+def snapshots(count: int):
+    return [
+        statistics_snapshot(round, float(round), port_statistics("p", float(round), {1: {"rx_packets": round * 10}}, delayed=round))
+        for round in range(count)
+    ]
+
+
+def test_resolve_format() -> None:
+    assert resolve_format("stats.csv") == CSV
+    assert resolve_format("stats.bin", CSV) == CSV
+    with pytest.raises(ValueError):
+        resolve_format("stats.csv", "xlsx")
+
+
+def test_csv_rows_of_ports_and_flows(tmp_path) -> None:
+    with StatisticsExporter(tmp_path / "stats.csv", row_group_size=3) as exporter:
+        for snapshot in snapshots(3):
+            exporter.add(snapshot)
+    with open(exporter.path, newline="", encoding="utf-8") as file:
+        header, *rows = list(csv.reader(file))
+    assert tuple(header) == COLUMNS
+    assert len(rows) == 6
+    totals, flow = (dict(zip(header, row)) for row in rows[4:])
+    assert (totals["port"], totals["flow"], totals["rx_packets"], totals["delayed"]) == ("p", "", "", "2")
+    assert (flow["flow"], flow["rx_packets"], flow["delayed"]) == ("1", "20", "0")
+
+
+def test_nothing_written_without_rows(tmp_path) -> None:
+    StatisticsExporter(tmp_path / "stats.csv").close()
+    assert not (tmp_path / "stats.csv").exists()
+
+
+def test_parquet_export_of_a_store(tmp_path) -> None:
+    pq = pytest.importorskip("pyarrow.parquet")
+    store = StatisticsStore(capacity=8)
+    for snapshot in snapshots(5):
+        store.add(snapshot)
+    path = export_store(store, tmp_path / "stats.parquet", row_group_size=2)
+    assert path.suffix == ".parquet"
+    table = pq.read_table(str(path))
+    assert table.column_names == list(COLUMNS)
+    assert table.num_rows == 10
+    assert pq.ParquetFile(str(path)).num_row_groups == 6
+    flows = table.filter(table.column("flow").is_valid())
+    assert flows.column("rx_packets").to_pylist() == [0, 10, 20, 30, 40]
+    assert flows.column("tx_packets").to_pylist() == [0] * 5
+
+
+def test_parquet_without_pyarrow_falls_back_to_csv(tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr("chimera_core.core.statistics.export.pq", None)
+    exporter = StatisticsExporter(tmp_path / "stats.parquet")
+    assert exporter.format == CSV and exporter.path.suffix == ".csv"
+    assert resolve_format("stats.parquet") == CSV
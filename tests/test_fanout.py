@@ -0,0 +1,87 @@
+import asyncio
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+import pytest
+from xoa_driver.enums import ReservedStatus
+
+from chimera_core.core.manager.exception import FanOutError
+from chimera_core.core.manager.fanout import PortFanOut
+from tests.fakes import FakeConnection, FakeManager, FakePipe, FakeResource
+
+
+class FakePort(FakeManager):
+    """Stands for a port manager, its configuration is a string, a snapshot is a copy of it."""
+
+    def __init__(self, name: str, fail_restore: bool = False) -> None:
+        super().__init__(FakeResource(FakeConnection(), name=name))
+        self.name = name
+        self.config = "baseline"
+        self.fail_restore = fail_restore
+        self.restored: List[str] = []
+
+    async def snapshot(self) -> str:
+        return self.config
+
+    async def restore(self, snapshot: str, only_changed: bool = False) -> None:
+        if self.fail_restore:
+            raise OSError(f"{self.name} restore failed")
+        self.config = snapshot
+        self.restored.append(snapshot)
+
+
+class FakeTester:
+    def __init__(self, host: str, ports: Dict[Tuple[int, int], FakePort]) -> None:
+        self.resource_instance = SimpleNamespace(info=SimpleNamespace(host=host))
+        self.ports = ports
+
+    async def use_port(self, module_id: int, port_id: int, reserve: bool = True) -> FakePort:
+        return self.ports[(module_id, port_id)]
+
+
+def fan_out(fail_restore: Optional[str] = None) -> Tuple[PortFanOut, List[FakePort], FakePipe]:
+    ports = [FakePort(f"p{index}", fail_restore=f"p{index}" == fail_restore) for index in range(4)]
+    tester = FakeTester("t", {(0, index): port for index, port in enumerate(ports)})
+    pipe = FakePipe()
+    return PortFanOut([(tester, 0, index) for index in range(4)], max_per_tester=2, pipe=pipe), ports, pipe
+
+
+async def configure(port: FakePort) -> None:
+    if port.name == "p2":
+        raise ValueError("p2 rejected the configuration")
+    port.config = "changed"
+
+
+def test_one_failure_restores_the_others() -> None:
+    fan, ports, pipe = fan_out()
+    with pytest.raises(FanOutError) as info:
+        asyncio.run(fan.apply(configure, all_or_nothing=True))
+    error = info.value
+    assert error.failed == ["t 0/2"]
+    assert error.not_restored == []
+    assert error.msg == "Failed: [t 0/2]. All the targets rolled back."
+    assert [port.config for port in ports] == ["baseline"] * 4
+    assert all(result.rolled_back for result in error.results)
+    assert isinstance(error.results[2].error, ValueError)
+    assert pipe.facade.progress == [25, 50, 75, 100]
+    assert all(port.resource_instance.info.reservation == ReservedStatus.RELEASED.value for port in ports)
+    assert all(port.resource_instance.calls == ["reserve", "release"] for port in ports)
+
+
+def test_failed_rollback_is_named() -> None:
+    fan, ports, _ = fan_out(fail_restore="p1")
+    with pytest.raises(FanOutError) as info:
+        asyncio.run(fan.apply(configure, all_or_nothing=True))
+    error = info.value
+    assert error.failed == ["t 0/2"]
+    assert error.not_restored == ["t 0/1"]
+    assert "the configuration is left changed: [t 0/1]" in error.msg
+    assert [port.config for port in ports] == ["baseline", "changed", "baseline", "baseline"]
+
+
+def test_without_all_or_nothing_the_errors_are_returned() -> None:
+    fan, ports, _ = fan_out()
+    results = asyncio.run(fan.apply(configure, all_or_nothing=False))
+    assert [result.ok for result in results] == [True, True, False, True]
+    assert [port.config for port in ports] == ["changed", "changed", "baseline", "changed"]
+    assert not any(port.restored for port in ports)
@@ -0,0 +1,100 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from chimera_core.controller import MainController
+from chimera_core.core import const
+from chimera_core.core.messenger import journal
+from chimera_core.core.messenger.handler import OutMessagesHandler
+from chimera_core.core.messenger.journal import JournalReader, MessagesJournal
+from chimera_core.core.messenger.misc import EMsgType, Message
+
+
+def background_tasks() -> List[str]:
+    return sorted(task.get_name() for task in asyncio.all_tasks() if task is not asyncio.current_task())
+
+
+def test_metrics_reported_until_stopped() -> None:
+    async def main() -> None:
+        handler = OutMessagesHandler()
+        handler.get_pipe("data").transmit("hello")
+        handler.start_metrics_reporting(0.01)
+        async for msg in handler.changes(const.PIPE_MESSENGER):
+            assert msg.type == EMsgType.STATISTICS
+            assert [pipe.name for pipe in msg.payload.pipes] == ["data", const.PIPE_MESSENGER]
+            break
+        await handler.stop_metrics_reporting()
+        assert "OutMessagesHandler[metrics]" not in background_tasks()
+        await handler.stop_metrics_reporting()
+
+    asyncio.run(main())
+
+
+def test_controller_close_stops_the_background_tasks(tmp_path) -> None:
+    async def main() -> None:
+        controller = await MainController(
+            storage_path=str(tmp_path / "store"),
+            metrics_interval=0.01,
+            journal_path=str(tmp_path / "journal"),
+        )
+        assert {"OutMessagesHandler[metrics]", "MessagesJournal[flusher]"} <= set(background_tasks())
+        await asyncio.sleep(0.03)
+        await controller.close()
+        assert not {"OutMessagesHandler[metrics]", "MessagesJournal[consumer]", "MessagesJournal[flusher]"} & set(background_tasks())
+        await controller.close()
+
+    asyncio.run(main())
+
+
+def test_failed_batch_is_kept_for_the_next_flush(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    write = journal._SegmentWriter.write
+    failures: List[int] = []
+
+    def failing_write(self, messages: List[Message]) -> None:
+        if not failures:
+            failures.append(len(messages))
+            raise OSError("disk full")
+        write(self, messages)
+
+    monkeypatch.setattr(journal._SegmentWriter, "write", failing_write)
+
+    async def main() -> None:
+        handler = OutMessagesHandler()
+        messages = MessagesJournal(handler, str(tmp_path), "data", flush_interval=0.01)
+        await messages.start()
+        # lets the consumer subscribe to the pipe
+        await asyncio.sleep(0.01)
+        pipe = handler.get_pipe("data")
+        for value in range(3):
+            pipe.transmit(value)
+        while not failures:
+            await asyncio.sleep(0.01)
+        pipe.transmit(3)
+        await asyncio.sleep(0.03)
+        await messages.stop()
+
+    asyncio.run(main())
+    assert failures == [3]
+    assert [msg.payload for msg in JournalReader(str(tmp_path)).read()] == [0, 1, 2, 3]
+
+
+def test_stop_raises_when_the_remaining_messages_cant_be_written(tmp_path, monkeypatch: pytest.MonkeyPatch) -> None:
+    def failing_write(self, messages: List[Message]) -> None:
+        raise OSError("disk full")
+
+    monkeypatch.setattr(journal._SegmentWriter, "write", failing_write)
+
+    async def main() -> None:
+        handler = OutMessagesHandler()
+        messages = MessagesJournal(handler, str(tmp_path), "data", flush_interval=60)
+        await messages.start()
+        # lets the consumer subscribe to the pipe
+        await asyncio.sleep(0.01)
+        handler.get_pipe("data").transmit("lost")
+        await asyncio.sleep(0.01)
+        with pytest.raises(OSError, match="disk full"):
+            await messages.stop()
+
+    asyncio.run(main())
+    assert list(JournalReader(str(tmp_path)).read()) == []
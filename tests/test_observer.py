@@ -0,0 +1,126 @@
+import asyncio
+import functools
+from typing import List
+
+import pytest
+
+from chimera_core.core.utils.observer import SimpleObserver
+
+
+def test_sync_callback_runs_before_emit_returns() -> None:
+    calls: List[int] = []
+
+    async def main() -> None:
+        observer: SimpleObserver[str] = SimpleObserver(ordered=True)
+        observer.subscribe("evt", calls.append)
+        observer.emit("evt", 1)
+        assert calls == [1]
+        await observer.close()
+
+    asyncio.run(main())
+
+
+def test_callbacks_run_in_emit_order() -> None:
+    calls: List[str] = []
+
+    async def slow(value: int) -> None:
+        await asyncio.sleep(0.01 if value == 1 else 0)
+        calls.append(f"slow{value}")
+
+    async def main() -> None:
+        observer: SimpleObserver[str] = SimpleObserver(ordered=True)
+        observer.subscribe("evt", slow)
+        observer.subscribe("evt", lambda value: calls.append(f"sync{value}"))
+        observer.emit("evt", 1)
+        observer.emit("evt", 2)
+        # queued behind the pending coroutines instead of running inline
+        assert calls == []
+        await observer.join()
+        assert calls == ["slow1", "sync1", "slow2", "sync2"]
+        observer.emit("evt", 3)
+        await observer.join()
+        assert calls[-2:] == ["slow3", "sync3"]
+        await observer.close()
+
+    asyncio.run(main())
+
+
+def test_awaitable_returned_by_a_plain_function_is_awaited() -> None:
+    calls: List[int] = []
+
+    async def append(value: int) -> None:
+        await asyncio.sleep(0)
+        calls.append(value)
+
+    async def main() -> None:
+        observer: SimpleObserver[str] = SimpleObserver(ordered=True)
+        observer.subscribe("evt", functools.partial(append, 1))
+        observer.subscribe("evt", lambda: calls.append(2))
+        observer.emit("evt")
+        await observer.join()
+        assert calls == [1, 2]
+        await observer.close()
+
+    asyncio.run(main())
+
+
+def test_failing_callback_warns_and_the_worker_goes_on() -> None:
+    calls: List[int] = []
+
+    async def fail(value: int) -> None:
+        raise ValueError(f"failed {value}")
+
+    async def main() -> None:
+        observer: SimpleObserver[str] = SimpleObserver(ordered=True)
+        observer.subscribe("evt", fail)
+        observer.subscribe("evt", calls.append)
+        with pytest.warns(UserWarning, match="failed 1"):
+            observer.emit("evt", 1)
+            await observer.join()
+        assert calls == [1]
+        await observer.close()
+
+    asyncio.run(main())
+
+
+def test_close_drops_the_pending_callbacks() -> None:
+    calls: List[int] = []
+
+    async def block(value: int) -> None:
+        calls.append(value)
+        await asyncio.sleep(60)
+
+    async def main() -> None:
+        observer: SimpleObserver[str] = SimpleObserver(ordered=True)
+        observer.subscribe("evt", block)
+        observer.emit("evt", 1)
+        observer.emit("evt", 2)
+        await asyncio.sleep(0)
+        await asyncio.wait_for(observer.close(), 1)
+        assert calls == [1]
+        await observer.join()
+        # a closed observer starts a new worker on the next event
+        observer.reset()
+        observer.subscribe("evt", calls.append)
+        observer.emit("evt", 3)
+        assert calls == [1, 3]
+        await observer.close()
+
+    asyncio.run(main())
+
+
+def test_unordered_callbacks_are_tasks() -> None:
+    calls: List[str] = []
+
+    async def append(value: str, event: str) -> None:
+        calls.append(f"{event}:{value}")
+
+    async def main() -> None:
+        observer: SimpleObserver[str] = SimpleObserver(pass_event=True)
+        observer.subscribe("evt", append)
+        observer.emit("evt", "a")
+        assert calls == []
+        await asyncio.sleep(0)
+        assert calls == ["evt:a"]
+
+    asyncio.run(main())
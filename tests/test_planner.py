@@ -0,0 +1,157 @@
+import asyncio
+from typing import List, Tuple
+
+import pytest
+from xoa_driver.enums import ReservedStatus
+
+from chimera_core.core.manager import planner
+from chimera_core.core.manager.exception import (
+    ReservationTimeoutError,
+    ResourcesReservedByOthersError,
+)
+from chimera_core.core.manager.planner import ReservationPlanner
+from chimera_core.core.manager.reservation import get_watcher, reservation_cache
+from tests.fakes import FakeConnection, FakePipe, FakeReservation, FakeResource
+
+
+class LoggedReservation(FakeReservation):
+    """Records the commands of all the resources of a tree in the order they are sent."""
+
+    def __init__(self, resource: FakeResource, log: List[Tuple[str, str]]) -> None:
+        super().__init__(resource)
+        self.log = log
+
+    async def set_reserve(self) -> None:
+        self.log.append((self.resource.info.host, "reserve"))
+        await super().set_reserve()
+
+    async def set_release(self) -> None:
+        self.log.append((self.resource.info.host, "release"))
+        await super().set_release()
+
+    async def set_relinquish(self) -> None:
+        self.log.append((self.resource.info.host, "relinquish"))
+        await super().set_relinquish()
+
+
+class FakeTester(FakeResource):
+    modules: List["FakeModule"]
+
+
+class FakeModule(FakeResource):
+    ports: List[FakeResource]
+
+
+@pytest.fixture(autouse=True)
+def fake_tree(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(planner, "L23Tester", FakeTester)
+    monkeypatch.setattr(planner, "ModuleChimera", FakeModule)
+
+
+def tree(status: ReservedStatus, **statuses: ReservedStatus) -> Tuple[FakeTester, List[Tuple[str, str]]]:
+    """A tester with two modules of two ports, ``statuses`` overrides the status of the resources by name."""
+    conn, log = FakeConnection(), []
+
+    def resource(cls, name):
+        item = cls(conn, statuses.get(name, status), name=name)
+        item.reservation = LoggedReservation(item, log)
+        return item
+
+    tester = resource(FakeTester, "t")
+    tester.modules = []
+    for module_id in range(2):
+        module = resource(FakeModule, f"m{module_id}")
+        module.ports = [resource(FakeResource, f"p{module_id}{port_id}") for port_id in range(2)]
+        tester.modules.append(module)
+    return tester, log
+
+
+def test_reserve_frees_the_tree_top_down_then_reserves() -> None:
+    tester, log = tree(ReservedStatus.RELEASED, m1=ReservedStatus.RESERVED_BY_OTHER, p00=ReservedStatus.RESERVED_BY_OTHER)
+    pipe = FakePipe()
+
+    async def main() -> None:
+        await ReservationPlanner(pipe, timeout=1).reserve(tester)
+
+    asyncio.run(main())
+    assert log == [("m1", "relinquish"), ("p00", "relinquish"), ("t", "reserve")]
+    assert tester.info.reservation == ReservedStatus.RESERVED_BY_YOU.value
+    assert pipe.facade.progress == [33, 66, 100]
+
+
+def test_release_sends_the_ports_first() -> None:
+    tester, log = tree(ReservedStatus.RESERVED_BY_YOU, p01=ReservedStatus.RELEASED)
+
+    async def main() -> None:
+        await ReservationPlanner(timeout=1).release(tester, should_release_sub_resources=True)
+
+    asyncio.run(main())
+    assert [name for name, _ in log[:3]] == ["p00", "p10", "p11"]
+    assert [name for name, _ in log[3:]] == ["m0", "m1", "t"]
+    assert {command for _, command in log} == {"release"}
+
+
+def test_no_command_when_cached_status_is_requested() -> None:
+    tester, log = tree(ReservedStatus.RESERVED_BY_YOU, p11=ReservedStatus.RESERVED_BY_OTHER)
+    hits, misses = reservation_cache.hits, reservation_cache.misses
+
+    async def main() -> None:
+        planner = ReservationPlanner(timeout=1)
+        await planner.reserve(tester.modules[0])
+        await planner.release(tester.modules[1].ports[1])
+        await planner.free(tester, should_free_sub_resources=True)
+
+    asyncio.run(main())
+    assert log == []
+    assert tester.conn.bursts == []
+    assert (reservation_cache.hits - hits, reservation_cache.misses - misses) == (3, 0)
+
+
+def test_statuses_read_again_on_a_miss() -> None:
+    tester, log = tree(ReservedStatus.RELEASED)
+    misses = reservation_cache.misses
+
+    async def main() -> None:
+        await ReservationPlanner(timeout=1).reserve(tester.modules[0])
+
+    asyncio.run(main())
+    assert log == [("m0", "reserve")]
+    assert len(tester.conn.bursts) == 1 and len(tester.conn.bursts[0]) == 3
+    assert reservation_cache.misses - misses == 1
+
+
+def test_reserved_by_others_without_relinquish() -> None:
+    tester, log = tree(ReservedStatus.RELEASED, t=ReservedStatus.RESERVED_BY_OTHER)
+
+    async def main() -> None:
+        await ReservationPlanner(timeout=1).reserve(tester, relinquish_others=False)
+
+    with pytest.raises(ResourcesReservedByOthersError):
+        asyncio.run(main())
+    assert log == []
+
+
+def test_wait_for_times_out() -> None:
+    resource = FakeResource(FakeConnection(), stuck=True)
+
+    async def main() -> None:
+        watcher = get_watcher(resource)
+        await resource.reservation.set_reserve()
+        with pytest.raises(ReservationTimeoutError, match="reserved_by_you within 0.05s"):
+            await watcher.wait_for(ReservedStatus.RESERVED_BY_YOU, 0.05)
+        resource.notify(ReservedStatus.RESERVED_BY_YOU)
+        assert await watcher.wait_for(ReservedStatus.RESERVED_BY_YOU, 1) < 1
+        assert watcher.version == 1
+
+    asyncio.run(main())
+
+
+def test_planner_times_out_when_never_granted() -> None:
+    resource = FakeResource(FakeConnection(), stuck=True)
+
+    async def main() -> None:
+        await ReservationPlanner(timeout=0.05).reserve(resource)
+
+    with pytest.raises(ReservationTimeoutError):
+        asyncio.run(main())
+    assert resource.calls == ["reserve"]
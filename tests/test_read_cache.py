@@ -0,0 +1,45 @@
+import asyncio
+from typing import Any, Callable, List
+
+import pytest
+from xoa_driver.v2.modules import ModuleChimera
+from xoa_driver.v2.ports import PortChimera
+
+from chimera_core.core.manager.module import MODULE_CHANGE_EVENTS
+from chimera_core.core.manager.port import PORT_CHANGE_EVENTS
+from chimera_core.core.utils.read_cache import get_read_cache
+
+
+class FakeModule:
+    def __init__(self) -> None:
+        self.callbacks: List[Callable] = []
+
+    def on_latency_mode_change(self, callback: Callable) -> None:
+        self.callbacks.append(callback)
+
+
+def test_change_events_exist() -> None:
+    assert all(hasattr(ModuleChimera, event) for event in MODULE_CHANGE_EVENTS)
+    assert all(hasattr(PortChimera, event) for event in PORT_CHANGE_EVENTS)
+
+
+def test_unknown_event_raises() -> None:
+    with pytest.raises(AttributeError):
+        get_read_cache(FakeModule(), ("on_latency_mode_change", "on_comment_change"))
+
+
+def test_change_event_invalidates() -> None:
+    module, reads = FakeModule(), []
+
+    async def read() -> Any:
+        reads.append(None)
+        return len(reads)
+
+    async def main() -> None:
+        cache = get_read_cache(module, ("on_latency_mode_change",))
+        assert await cache.get(read, 60) == 1
+        assert await cache.get(read, 60) == 1
+        await asyncio.gather(*(callback(None) for callback in module.callbacks))
+        assert await cache.get(read, 60) == 2
+
+    asyncio.run(main())
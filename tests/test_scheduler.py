@@ -0,0 +1,88 @@
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from chimera_core.core.statistics.collector import FLOW_COMMANDS_COUNT, PORT_COMMANDS_COUNT
+from chimera_core.core.statistics.scheduler import AdaptiveScheduler
+from tests.samples import port_statistics, statistics_snapshot
+
+
+def watched(name: str, flows: int = 0, tester: int = 1) -> Any:
+    return SimpleNamespace(name=name, tester=tester, flows=tuple((index, None) for index in range(1, flows + 1)))
+
+
+def read(scheduler: AdaptiveScheduler, at: float, **delayed: int) -> None:
+    scheduler.update(statistics_snapshot(0, at, *(port_statistics(name, at, delayed=value) for name, value in delayed.items())))
+
+
+def test_unchanged_counters_back_off_up_to_the_max_interval() -> None:
+    scheduler = AdaptiveScheduler(min_interval=1.0, max_interval=4.0)
+    port = [watched("a")]
+    polled = []
+    for second in range(16):
+        if scheduler.select(port, float(second)):
+            polled.append(second)
+            read(scheduler, float(second), a=0)
+    # First read, then 1, 2, 4 and 4 seconds apart
+    assert polled == [0, 1, 3, 7, 11, 15]
+
+
+def test_changed_counters_are_polled_at_the_min_interval() -> None:
+    scheduler = AdaptiveScheduler(min_interval=1.0, max_interval=4.0)
+    port = [watched("a")]
+    for second in range(4):
+        assert scheduler.select(port, float(second)) == {"a": ()}
+        read(scheduler, float(second), a=second)
+
+
+def test_active_items_are_polled_fast_until_set_inactive() -> None:
+    scheduler = AdaptiveScheduler(min_interval=1.0, max_interval=8.0)
+    port = [watched("a")]
+    for second in range(3):
+        read(scheduler, float(second), a=0)
+    scheduler.set_active("a")
+    assert scheduler.select(port, 3.0) == {"a": ()}
+    read(scheduler, 3.0, a=0)
+    assert scheduler.select(port, 4.0) == {"a": ()}
+    scheduler.set_active("a", active=False)
+    read(scheduler, 4.0, a=0)
+    read(scheduler, 5.0, a=0)
+    assert scheduler.select(port, 6.0) == {}
+
+
+def test_the_latest_items_are_polled_first_within_the_budget() -> None:
+    scheduler = AdaptiveScheduler(min_interval=1.0, max_interval=1.0, budget=PORT_COMMANDS_COUNT + FLOW_COMMANDS_COUNT)
+    ports = [watched("a"), watched("b"), watched("c")]
+    # Two ports fit in the budget
+    assert list(scheduler.select(ports, 10.0)) == ["a", "b"]
+    read(scheduler, 10.0, a=0, b=0)
+    # The credits are refilled after one second, port c has been waiting the longest
+    assert list(scheduler.select(ports, 11.0)) == ["c", "a"]
+
+
+def test_testers_have_their_own_budget() -> None:
+    scheduler = AdaptiveScheduler(min_interval=1.0, budget=PORT_COMMANDS_COUNT + FLOW_COMMANDS_COUNT)
+    ports = [watched("a", flows=1, tester=1), watched("b", flows=1, tester=2)]
+    assert scheduler.select(ports, 0.0) == {"a": (1,), "b": (1,)}
+
+
+def test_forget_drops_the_schedules_of_a_port() -> None:
+    scheduler = AdaptiveScheduler(min_interval=1.0, max_interval=8.0)
+    port = [watched("a")]
+    for second in range(3):
+        read(scheduler, float(second), a=0)
+    scheduler.set_active("a")
+    scheduler.forget("a")
+    assert scheduler.select(port, 2.5) == {"a": ()}
+    read(scheduler, 2.5, a=0)
+    read(scheduler, 3.5, a=0)
+    # Not active any more, the interval backs off again
+    assert scheduler.select(port, 4.0) == {}
+
+
+def test_invalid_settings_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        AdaptiveScheduler(min_interval=2.0, max_interval=1.0)
+    with pytest.raises(ValueError):
+        AdaptiveScheduler(budget=1)
@@ -0,0 +1,92 @@
+import math
+
+import numpy as np
+import pytest
+
+from chimera_core.core.statistics.derived import DerivedStatistics
+from chimera_core.core.statistics.sketch import QuantileSketch, RateSketches
+from tests.samples import port_statistics, statistics_snapshot
+
+
+QUANTILES = (0.0, 0.1, 0.5, 0.9, 0.99, 0.999, 1.0)
+
+
+def values(seed: int, size: int = 10_000) -> np.ndarray:
+    return np.random.default_rng(seed).lognormal(mean=3, sigma=2, size=size)
+
+
+def assert_within_accuracy(sketch: QuantileSketch, data: np.ndarray) -> None:
+    for q in QUANTILES:
+        exact = np.quantile(data, q, method="lower")
+        assert abs(sketch.quantile(q) - exact) <= sketch.relative_accuracy * exact, q
+
+
+def test_quantiles_within_the_relative_accuracy() -> None:
+    data = values(1)
+    sketch = QuantileSketch(relative_accuracy=0.01)
+    sketch.add(data)
+    assert sketch.count == len(data)
+    assert_within_accuracy(sketch, data)
+
+
+def test_zeros_and_invalid_values() -> None:
+    sketch = QuantileSketch()
+    sketch.add([0, 0, 0, 5, math.nan])
+    assert sketch.count == 4
+    assert sketch.quantile(0.5) == 0.0
+    assert sketch.quantile(1.0) == 5.0
+    with pytest.raises(ValueError):
+        sketch.add([-1])
+    with pytest.raises(ValueError):
+        sketch.quantile(1.5)
+
+
+def test_merged_sketches_are_as_accurate_as_one() -> None:
+    first, second = values(2), values(3)
+    left, right = QuantileSketch(), QuantileSketch()
+    left.add(first)
+    right.add(second)
+    left.merge(QuantileSketch.from_model(right.to_model()))
+    assert left.count == len(first) + len(second)
+    assert_within_accuracy(left, np.concatenate((first, second)))
+    with pytest.raises(ValueError):
+        left.merge(QuantileSketch(relative_accuracy=0.05))
+
+
+def test_collapsed_buckets_keep_the_high_quantiles() -> None:
+    data = values(4)
+    sketch = QuantileSketch(max_buckets=256)
+    sketch.add(data)
+    assert len(sketch.to_model().buckets) == 256
+    assert sketch.quantile(0.0) > data.min()
+    for q in (0.99, 0.999, 1.0):
+        exact = np.quantile(data, q, method="lower")
+        assert abs(sketch.quantile(q) - exact) <= sketch.relative_accuracy * exact
+
+
+def test_empty_sketch() -> None:
+    sketch = QuantileSketch()
+    assert math.isnan(sketch.quantile(0.5))
+    summary = sketch.summary()
+    assert summary.count == 0 and math.isnan(summary.mean)
+    model = sketch.to_model()
+    assert (model.minimum, model.maximum) == (0.0, 0.0)
+    sketch.merge(QuantileSketch())
+    assert sketch.count == 0
+
+
+def test_rate_sketches_of_the_derived_metrics() -> None:
+    derived, sketches = DerivedStatistics(), RateSketches()
+    for second in range(11):
+        snapshot = statistics_snapshot(
+            second,
+            float(second),
+            port_statistics("p", float(second), {1: {"rx_packets": second * 1000, "dropped_total": second * 10}}, dropped_total=second * 10),
+        )
+        derived.add(snapshot)
+        sketches.add(snapshot)
+    summary = sketches.summary("ratios.drop", port="p")
+    assert summary.count == 10
+    assert summary.quantiles["p50"] == pytest.approx(0.01, rel=0.01)
+    assert sketches.summary("rates.dropped_total", totals=True).maximum == 10.0
+    assert sketches.summary("rates.dropped_total", port="q").count == 0
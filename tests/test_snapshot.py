@@ -0,0 +1,136 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from chimera_core.core.manager.__dataset import CustomDistribution, PortConfig
+from chimera_core.core.manager.exception import InvalidSnapshotError
+from chimera_core.core.manager.flow.__dataset import FlowConfig
+from chimera_core.core.manager.flow.distributions.__dataset import Custom, FixedBurst, Gaussian
+from chimera_core.core.manager.flow.impairments.__dataset import (
+    BatchReadDistributionConfigFromServer,
+    ImpairmentConfigCorruption,
+    ImpairmentConfigGeneral,
+    ImpairmentConfigMisordering,
+    ImpairmentConfigPolicer,
+    ImpairmentConfigShaper,
+)
+from chimera_core.core.manager.flow.shadow_filter.__dataset import (
+    ProtocolSegement,
+    ShadowFilterConfigBasic,
+    ShadowFilterConfigExtended,
+)
+from chimera_core.core.manager.port import PortManager
+from chimera_core.core.manager.snapshot import FlowSnapshot, PortSnapshot
+from chimera_core.types import enums
+from tests.fakes import FakeConnection
+
+
+def impairment(cls=ImpairmentConfigGeneral, **kwargs):
+    return cls(
+        read_distribution_config_from_server=BatchReadDistributionConfigFromServer(fixed_burst=True),
+        allow_set_distribution_class_name=("FixedBurst", "Custom", "Gaussian"),
+        **kwargs,
+    )
+
+
+def port_snapshot() -> PortSnapshot:
+    drop = impairment()
+    fixed_burst = FixedBurst(burst_size=5)
+    fixed_burst.set_schedule(1, 2)
+    drop.set_distribution(fixed_burst)
+    drop.enable = enums.OnOff.ON
+    corruption = impairment(ImpairmentConfigCorruption, corruption_type=enums.CorruptionType.UDP)
+    custom = Custom(cust_id=3)
+    custom.set_schedule(1, 0)
+    corruption.set_distribution(custom)
+    latency = impairment()
+    gaussian = Gaussian(mean=1, sd=2)
+    gaussian.set_schedule(1, 0)
+    latency.set_distribution(gaussian)
+    basic = ShadowFilterConfigBasic()
+    basic.layer_3.use_ipv4()
+    extended = ShadowFilterConfigExtended(protocol_segments=(ProtocolSegement(enums.ProtocolOption.ETHERNET, "FF", "00"),))
+    flows = [
+        FlowSnapshot(
+            FlowConfig(f"flow {index}"),
+            drop,
+            impairment(ImpairmentConfigMisordering, depth=2),
+            latency,
+            impairment(),
+            corruption,
+            ImpairmentConfigPolicer(cir=5),
+            ImpairmentConfigShaper(buffer_size=3),
+            filter=shadow_filter,
+            filter_enable=enums.OnOff.ON,
+        )
+        for index, shadow_filter in enumerate((None, basic, extended))
+    ]
+    distributions = {3: CustomDistribution(3, enums.LatencyTypeCustomDist(0), enums.OnOff.ON, enums.OnOff.OFF, 2, [1, 2])}
+    return PortSnapshot(PortConfig(comment="port"), distributions, flows)
+
+
+def test_json_round_trip() -> None:
+    snapshot = port_snapshot()
+    restored = PortSnapshot.from_json(snapshot.to_json())
+    assert restored == snapshot
+    assert type(restored.flows[2].filter.protocol_segments) is tuple
+    assert restored.flows[0].drop._current_distribution.schedule == snapshot.flows[0].drop._current_distribution.schedule
+
+
+def test_rejects_other_versions() -> None:
+    data = port_snapshot().to_dict()
+    data["version"] += 1
+    with pytest.raises(InvalidSnapshotError):
+        PortSnapshot.from_dict(data)
+
+
+def test_rejects_classes_outside_the_configuration() -> None:
+    with pytest.raises(InvalidSnapshotError):
+        PortSnapshot.from_dict({"version": 1, "snapshot": {"__type__": "dataclass", "class": "os:path", "fields": {}}})
+
+
+class FakeCustomDistributions(dict):
+    def __init__(self, indices) -> None:
+        super().__init__((index, None) for index in indices)
+        self.removed = []
+
+    async def server_sync(self) -> None:
+        pass
+
+    async def remove(self, index: int) -> None:
+        self.removed.append(index)
+        del self[index]
+
+
+class FakeCustomDistributionsManager:
+    def __init__(self) -> None:
+        self.written = []
+
+    async def set_all(self, distributions, only_changed: bool = False) -> int:
+        self.written.append(([cd.custom_distribution_index for cd in distributions], only_changed))
+        return 0
+
+
+def restore_custom_distributions(existing, restored):
+    conn = FakeConnection()
+    port = SimpleNamespace(_conn=conn, kind=SimpleNamespace(module_id=0, port_id=1), custom_distributions=FakeCustomDistributions(existing))
+    manager = PortManager.__new__(PortManager)
+    manager.resource_instance = port
+    manager.custom_distributions = FakeCustomDistributionsManager()
+    distributions = {index: CustomDistribution(index, enums.LatencyTypeCustomDist(0), enums.OnOff.ON, enums.OnOff.OFF, 2, [1, 2]) for index in restored}
+    asyncio.run(manager._PortManager__restore_custom_distributions(distributions, True))
+    return conn, port.custom_distributions, manager.custom_distributions
+
+
+def test_restore_keeps_matching_custom_distributions() -> None:
+    conn, hli, manager = restore_custom_distributions((1, 3), (1, 3))
+    assert conn.bursts == [] and hli.removed == []
+    assert manager.written == [([1, 3], True)]
+
+
+def test_restore_deletes_and_creates_custom_distributions() -> None:
+    conn, hli, manager = restore_custom_distributions((1, 2), (3, 1))
+    assert hli.removed == [2]
+    assert [[request.class_name for request in burst] for burst in conn.bursts] == [["PEC_INDICES"]]
+    assert manager.written == [([3, 1], False)]
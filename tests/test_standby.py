@@ -0,0 +1,80 @@
+import asyncio
+from typing import Any, Tuple
+
+import pytest
+
+from chimera_core.core.manager.exception import StandbyPoolClosedError
+from chimera_core.core.manager.standby import StandbyPortPool
+from tests.fakes import FakeConnection, FakeManager, FakeResource
+
+
+def pool_of(count: int) -> Tuple[StandbyPortPool, Any]:
+    conn = FakeConnection()
+    ports = [FakeManager(FakeResource(conn, name=f"port {index}")) for index in range(count)]
+    return StandbyPortPool(ports), ports  # type: ignore[arg-type]
+
+
+def test_leases_and_returns_ports() -> None:
+    async def main() -> None:
+        pool, ports = pool_of(1)
+        await pool.start()
+        lease = await pool.acquire()
+        assert pool.available == 0 and pool.leased == 1
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.acquire(timeout=0.01)
+        lease.release()
+        assert (await pool.acquire(timeout=1)).port is ports[0]
+        assert ports[0].resets == 2
+        await pool.close()
+
+    asyncio.run(main())
+
+
+def test_close_wakes_waiting_acquires() -> None:
+    async def main() -> None:
+        pool, _ = pool_of(1)
+        await pool.start()
+        await pool.acquire()
+        waiting = asyncio.ensure_future(pool.acquire())
+        await asyncio.sleep(0)
+        await pool.close()
+        with pytest.raises(StandbyPoolClosedError):
+            await waiting
+
+    asyncio.run(main())
+
+
+def test_port_taken_while_closing_is_not_lost() -> None:
+    async def main() -> None:
+        pool, ports = pool_of(1)
+        await pool.start()
+        lease = await pool.acquire()
+        waiting = asyncio.ensure_future(pool.acquire())
+        await asyncio.sleep(0)
+        # The port reaches the waiting acquire in the same iteration the pool is closed
+        pool._StandbyPortPool__ready.put_nowait(lease.port)  # type: ignore[attr-defined]
+        closing = asyncio.ensure_future(pool.close())
+        with pytest.raises(StandbyPoolClosedError):
+            await waiting
+        await closing
+        assert pool.available == 1
+
+    asyncio.run(main())
+
+
+def test_port_taken_while_cancelled_is_not_lost() -> None:
+    async def main() -> None:
+        pool, _ = pool_of(1)
+        await pool.start()
+        lease = await pool.acquire()
+        waiting = asyncio.ensure_future(pool.acquire())
+        await asyncio.sleep(0)
+        pool._StandbyPortPool__ready.put_nowait(lease.port)  # type: ignore[attr-defined]
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        assert pool.available == 1
+        assert (await pool.acquire(timeout=1)).port is lease.port
+        await pool.close()
+
+    asyncio.run(main())
@@ -0,0 +1,71 @@
+import numpy as np
+import pytest
+
+from chimera_core.core.statistics.store import RingBuffer, StatisticsStore
+from tests.samples import port_statistics, statistics_snapshot
+
+
+def test_append_keeps_the_samples_in_order() -> None:
+    buffer = RingBuffer(("a", "b"), 4)
+    buffer.append(1.0, {"a": 1, "b": 10})
+    buffer.append(2.0, {"a": 2})
+    timestamps, values = buffer.window()
+    assert len(buffer) == 2
+    assert timestamps.tolist() == [1.0, 2.0]
+    assert values.tolist() == [[1, 10], [2, 0]]
+
+
+def test_wraparound_overwrites_the_oldest_samples() -> None:
+    buffer = RingBuffer(("a",), 3)
+    for second in range(5):
+        buffer.append(float(second), {"a": second * 10})
+    timestamps, values = buffer.window(counter="a")
+    assert len(buffer) == buffer.capacity == 3
+    assert timestamps.tolist() == [2.0, 3.0, 4.0]
+    assert values.tolist() == [20, 30, 40]
+
+
+def test_window_bounds_are_inclusive_across_the_wrap() -> None:
+    buffer = RingBuffer(("a",), 4)
+    for second in range(6):
+        buffer.append(float(second), {"a": second})
+    assert buffer.window(3.0, 4.0, "a")[1].tolist() == [3, 4]
+    assert buffer.window(start=4.5, counter="a")[1].tolist() == [5]
+    assert buffer.window(end=1.0, counter="a")[1].tolist() == []
+
+
+def test_unknown_counter_and_capacity_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        RingBuffer(("a",), 0)
+    with pytest.raises(KeyError):
+        RingBuffer(("a",), 1).window(counter="b")
+
+
+def test_store_keeps_a_series_per_port_and_flow() -> None:
+    store = StatisticsStore(capacity=8)
+    for round in range(3):
+        store.add(statistics_snapshot(round, float(round), port_statistics("p", float(round), {1: {"rx_packets": round * 100}}, delayed=round)))
+    assert set(store.keys) == {("p", None), ("p", 1)}
+    assert store.query("p", "delayed")[1].tolist() == [0, 1, 2]
+    assert store.query("p", "rx_packets", flow=1, start=1.0)[1].tolist() == [100, 200]
+    with pytest.raises(KeyError):
+        store.series("p", 2)
+
+
+def test_downsample_keeps_the_last_sample_of_every_bucket() -> None:
+    store = StatisticsStore(capacity=16)
+    for tenth in range(0, 25, 5):
+        at = tenth / 10
+        store.add(statistics_snapshot(tenth, at, port_statistics("p", at, delayed=tenth)))
+    timestamps, values = store.downsample("p", "delayed", 1.0)
+    assert timestamps.tolist() == [0.5, 1.5, 2.0]
+    assert values.tolist() == [5, 15, 20]
+
+
+def test_rate_counts_a_cleared_counter_from_zero() -> None:
+    store = StatisticsStore(capacity=8)
+    for round, (at, value) in enumerate(((0.0, 0), (1.0, 100), (2.0, 300), (3.0, 50), (3.0, 60))):
+        store.add(statistics_snapshot(round, at, port_statistics("p", at, delayed=value)))
+    timestamps, rates = store.rate("p", "delayed")
+    assert timestamps.tolist() == [1.0, 2.0, 3.0, 3.0]
+    assert np.allclose(rates, [100.0, 200.0, 50.0, 0.0])
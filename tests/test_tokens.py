@@ -0,0 +1,39 @@
+import asyncio
+
+import pytest
+from xoa_driver.internals.commands.p_commands import P_COMMENT
+from xoa_driver.v2.misc import Token
+
+from chimera_core.core.utils.tokens import apply_by_connection, apply_by_connection_timed
+from tests.fakes import FakeConnection, FakeRequest
+
+
+def test_one_burst_per_connection() -> None:
+    first, second = FakeConnection(), FakeConnection()
+    tokens = [
+        P_COMMENT(first, 0, 0).set("a"),
+        P_COMMENT(second, 0, 0).set("b"),
+        P_COMMENT(first, 0, 1).set("c"),
+        P_COMMENT(second, 0, 1).set("d"),
+        P_COMMENT(first, 0, 2).set("e"),
+    ]
+    responses = asyncio.run(apply_by_connection(tokens))
+    assert len(responses) == len(tokens)
+    assert [[request.header.port_index for request in burst] for burst in first.bursts] == [[0, 1, 2]]
+    assert [[request.header.port_index for request in burst] for burst in second.bursts] == [[0, 1]]
+
+
+def test_responses_in_the_order_of_the_commands() -> None:
+    first, second = FakeConnection(), FakeConnection()
+    tokens = [Token(conn, FakeRequest(lambda position=position: position)) for position, conn in enumerate((first, second, first, second))]
+    responses, timings = asyncio.run(apply_by_connection_timed(tokens))
+    assert responses == [0, 1, 2, 3]
+    assert all(sent_at <= received_at for sent_at, received_at in timings)
+
+
+def test_errors_are_raised_or_returned() -> None:
+    failing = FakeConnection(error=RuntimeError("rejected"))
+    with pytest.raises(RuntimeError):
+        asyncio.run(apply_by_connection([P_COMMENT(failing, 0, 0).set("a")]))
+    responses = asyncio.run(apply_by_connection([P_COMMENT(failing, 0, 0).set("a")], return_exceptions=True))
+    assert isinstance(responses[0], RuntimeError)
@@ -0,0 +1,51 @@
+import asyncio
+
+import pytest
+from xoa_driver.enums import ReservedStatus
+
+from chimera_core.core.manager.exception import ReservationTimeoutError, ResourcesReservedByOthersError
+from chimera_core.core.manager.transaction import ReservationTransaction
+from tests.fakes import FakeConnection, FakeManager, FakeResource
+
+
+def test_reserved_by_others_fails_without_reserving() -> None:
+    conn = FakeConnection()
+    free, taken = FakeResource(conn), FakeResource(conn, ReservedStatus.RESERVED_BY_OTHER)
+
+    async def main() -> None:
+        with pytest.raises(ResourcesReservedByOthersError):
+            await ReservationTransaction(FakeManager(free), FakeManager(taken)).acquire()
+
+    asyncio.run(main())
+    assert free.calls == []
+    assert taken.calls == []
+
+
+def test_failure_rolls_back_the_reserved_resources() -> None:
+    conn = FakeConnection()
+    free, late = FakeResource(conn), FakeResource(conn, silent=True)
+    transaction = ReservationTransaction(FakeManager(free), FakeManager(late), timeout=0.05)
+
+    async def main() -> None:
+        with pytest.raises(ReservationTimeoutError):
+            await transaction.acquire()
+
+    asyncio.run(main())
+    assert free.calls == ["reserve", "release"]
+    # Granted although the change was not seen in time, so rolled back too
+    assert late.calls == ["reserve", "release"]
+    assert free.granted == late.granted == ReservedStatus.RELEASED.value
+    assert transaction.taken == ()
+
+
+def test_resources_reserved_by_you_are_left_reserved() -> None:
+    conn = FakeConnection()
+    mine, stuck = FakeResource(conn, ReservedStatus.RESERVED_BY_YOU), FakeResource(conn, stuck=True)
+
+    async def main() -> None:
+        with pytest.raises(ReservationTimeoutError):
+            await ReservationTransaction(FakeManager(mine), FakeManager(stuck), timeout=0.05).acquire()
+
+    asyncio.run(main())
+    assert mine.calls == []
+    assert mine.info.reservation == ReservedStatus.RESERVED_BY_YOU.value